@@ -0,0 +1,10 @@
+"""Shroom Hunter: catch falling mushrooms, then survive the endless run.
+
+Importing the package or any of its modules has no side effects: nothing is
+initialised, opened or loaded until ``mushroom_game.main.main()`` runs. Play
+with ``python -m mushroom_game`` (or ``python mushroom_game/game.py``).
+"""
+import os
+
+# Keep imports quiet; pygame otherwise prints a banner when first imported
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
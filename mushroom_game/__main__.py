@@ -0,0 +1,6 @@
+import sys
+
+from .main import main
+
+main()
+sys.exit()
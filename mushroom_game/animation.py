@@ -0,0 +1,197 @@
+"""Frame animations for the runner, monsters and mushrooms, plus pre-rendered effect loops.
+
+Every clip is a list of surfaces sliced once, at load time, from an atlas:
+either a sprite sheet shipped next to the static image (``<name>_<clip>.png``,
+square frames in a row) or an atlas built here from the static image with a
+few squash, lean and tint variations. Drawing a frame is a list lookup by
+index, so animation costs no surface allocation or transform per frame.
+
+The shield pulse is an effect loop built the same way: every distinct
+frame is rendered once and the per-tick frame comes from a precomputed
+index table. Glows are lights (see ``lighting``).
+"""
+import math
+
+import pygame
+
+from .sim import FPS
+
+# The runner sprite is drawn into frames this much larger on every side, so squash and lean fit
+PAD = 8
+SHIELD_TICKS = 216    # 500/FPS degrees per tick comes back to a whole turn every 216 ticks
+
+
+class Clip:
+    """Frames of one animation and the rate they advance at."""
+
+    def __init__(self, frames, fps=12, loop=True):
+        self.frames = frames
+        self.step = FPS // fps if fps else 0
+        self.loop = loop
+
+    def frame(self, ticks):
+        if not self.step:
+            return self.frames[0]
+        index = ticks // self.step
+        if self.loop:
+            return self.frames[index % len(self.frames)]
+        return self.frames[min(index, len(self.frames) - 1)]
+
+
+class AnimationState:
+    """Which clip an entity is playing and the tick it started on."""
+
+    def __init__(self, clip=None):
+        self.clip = clip
+        self.started = 0
+
+    def play(self, name, tick):
+        """Switch to ``name`` (restarting it) unless it is already playing."""
+        if name != self.clip:
+            self.clip = name
+            self.started = tick
+
+    def ticks(self, tick):
+        return tick - self.started
+
+
+def slice_atlas(atlas, frame_size):
+    """Split a row-of-frames atlas into subsurfaces, one per frame."""
+    fw, fh = frame_size
+    return [atlas.subsurface((x, 0, fw, fh)) for x in range(0, atlas.get_width() - fw + 1, fw)]
+
+
+def build_atlas(frames, convert):
+    """Pack equally sized frames into one atlas surface and slice it back into frames."""
+    fw, fh = frames[0].get_size()
+    atlas = pygame.Surface((fw * len(frames), fh), pygame.SRCALPHA)
+    for i, frame in enumerate(frames):
+        atlas.blit(frame, (i * fw, 0))
+    return slice_atlas(convert(atlas, alpha=True), (fw, fh))
+
+
+def load_sheet(source, name, frame_size, convert):
+    """Frames from ``<name>.png`` in ``source`` (square frames in a row), scaled to ``frame_size``; None if absent."""
+    resource = source.find(name, (".png",))
+    if resource is None:
+        return None
+    try:
+        sheet = pygame.image.load(resource.file(), resource.name)
+    except pygame.error:
+        return None
+    count = max(1, sheet.get_width() // sheet.get_height())
+    sheet = pygame.transform.smoothscale(convert(sheet, alpha=True), (frame_size[0] * count, frame_size[1]))
+    return slice_atlas(sheet, frame_size)
+
+
+def _pose(img, scale=(1.0, 1.0), angle=0, tint=None):
+    """``img`` squashed/leaned/tinted, bottom-centred on a padded transparent frame."""
+    w, h = img.get_size()
+    frame = pygame.Surface((w + 2 * PAD, h + 2 * PAD), pygame.SRCALPHA)
+    sprite = pygame.transform.smoothscale(img, (round(w * scale[0]), round(h * scale[1])))
+    if angle:
+        sprite = pygame.transform.rotate(sprite, angle)
+    if tint:
+        sprite = sprite.copy()
+        sprite.fill(tint, special_flags=pygame.BLEND_RGB_MULT)
+    rect = sprite.get_rect(midbottom=(PAD + w // 2, PAD + h))
+    frame.blit(sprite, rect)
+    return frame
+
+
+def runner_poses(img):
+    """Generated run/jump/dash/hit frames for the runner sprite."""
+    bob = [(1.0, 1.0), (1.04, 0.94), (1.0, 1.0), (0.96, 1.05)]
+    return {
+        "run": [_pose(img, scale) for scale in bob],
+        # Rising, apex, falling; picked by vertical speed
+        "jump": [_pose(img, (0.92, 1.1)), _pose(img), _pose(img, (1.05, 0.95))],
+        "dash": [_pose(img, (0.9, 1.12), angle) for angle in (6, 12, 16, 12)],
+        "hit": [_pose(img, tint=(255, 110, 110)), _pose(img)],
+    }
+
+
+def mushroom_sway(img, frames=8, degrees=4):
+    """A gentle side-to-side sway loop for a falling mushroom (same size as ``img``)."""
+    w, h = img.get_size()
+    poses = []
+    for i in range(frames):
+        angle = degrees * math.sin(2 * math.pi * i / frames)
+        rotated = pygame.transform.rotozoom(img, angle, 1.0)
+        frame = pygame.Surface((w, h), pygame.SRCALPHA)
+        frame.blit(rotated, rotated.get_rect(center=(w // 2, h // 2)))
+        poses.append(frame)
+    return poses
+
+
+def shield_radius(tick):
+    """Outer shield ring radius at ``tick``: the pulse rotates 500/FPS degrees per tick."""
+    degrees = (tick * 500 % (360 * FPS)) / FPS  # Reduced exactly, so the table repeats exactly
+    pulse = 1 + 0.3 * abs(math.cos(math.radians(degrees)))
+    return int(40 * pulse)
+
+
+class ShieldLoop:
+    """Pre-rendered shield rings: one sprite per distinct radius, indexed by tick."""
+
+    def __init__(self, convert):
+        self.radii = [shield_radius(t) for t in range(SHIELD_TICKS)]
+        self.sprites = {}
+        for radius in set(self.radii):
+            size = 2 * radius + 2
+            ring = pygame.Surface((size, size), pygame.SRCALPHA)
+            center = (size // 2, size // 2)
+            pygame.draw.circle(ring, (120, 180, 255), center, radius, 3)
+            pygame.draw.circle(ring, (200, 220, 255), center, radius - 10, 1)
+            self.sprites[radius] = convert(ring, alpha=True)
+
+    def draw(self, surf, center, tick):
+        sprite = self.sprites[self.radii[tick % SHIELD_TICKS]]
+        half = sprite.get_width() // 2
+        surf.blit(sprite, (center[0] - half, center[1] - half))
+
+
+class Animations:
+    """Every clip and effect loop for one ``Assets`` set, built once."""
+
+    def __init__(self, assets, source, convert):
+        self.runner = {}
+        if assets.mushroom_player_img:
+            poses = runner_poses(assets.mushroom_player_img)
+            size = poses["run"][0].get_size()
+            for name, frames in poses.items():
+                sheet = load_sheet(source, f"mushroom_legs_{name}", size, convert)
+                self.runner[name] = sheet or build_atlas(frames, convert)
+        self.monster = None
+        if assets.monster_img:
+            img = assets.monster_img
+            frames = load_sheet(source, "monster_walk", img.get_size(), convert)
+            if frames is None:
+                w, h = img.get_size()
+                squash = [(1.0, 1.0), (1.05, 0.93), (1.0, 1.0), (0.95, 1.04)]
+                frames = build_atlas([_pose(img, scale).subsurface((PAD, PAD, w, h)) for scale in squash], convert)
+            self.monster = Clip(frames, fps=8)
+        self.mushroom = Clip(build_atlas(mushroom_sway(assets.mushroom_img), convert), fps=8) if assets.mushroom_img else None
+        gold = assets.mushroom_gold_img
+        self.mushroom_gold = Clip(build_atlas(mushroom_sway(gold), convert), fps=8) if gold and gold is not assets.mushroom_img else self.mushroom
+        self.shield = ShieldLoop(convert)
+        rates = {"run": 12, "jump": 0, "dash": 15, "hit": 10}
+        self.clips = {name: Clip(frames, rates[name]) for name, frames in self.runner.items()}
+        self.states = {}
+
+    def runner_frame(self, key, tick, on_ground, vy, dash_cd, dash_max, hit):
+        """This tick's runner frame for entity ``key``, or None without a runner sprite."""
+        if not self.clips:
+            return None
+        state = self.states.setdefault(key, AnimationState("run"))
+        if hit:
+            state.play("hit", tick)
+        elif dash_cd > dash_max - len(self.runner["dash"]) * self.clips["dash"].step:
+            state.play("dash", tick)
+        elif not on_ground:
+            state.play("jump", tick)
+            frames = self.runner["jump"]
+            return frames[0 if vy < -2 else 2 if vy > 2 else 1]
+        else:
+            state.play("run", tick)
+        return self.clips[state.clip].frame(state.ticks(tick))
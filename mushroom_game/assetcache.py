@@ -0,0 +1,119 @@
+"""On-disk cache of decoded, scaled images, shared between game instances.
+
+Decoding a full-screen JPG/PNG and scaling it costs tens of milliseconds and
+a private copy of every pixel in each process. The cache stores the final
+pixels of each ``load_image`` result as a raw file keyed by the source
+file's hash (a content pack member's CRC and size), the target size and the
+alpha mode. Every instance maps those files with ``mmap`` and wraps them
+with ``pygame.image.frombuffer``, so the pixels are read straight from the
+shared page cache and never decoded again.
+
+Files are written to a temporary name and renamed into place, so instances
+warming the same cache concurrently never see a partial entry. The kiosk
+launcher (``python -m mushroom_game.kiosk``) fills the cache before it
+starts the instances.
+"""
+import hashlib
+import mmap
+import os
+import struct
+import weakref
+
+import pygame
+
+HEADER = struct.Struct("<4sIII")  # magic, width, height, flags
+MAGIC = b"SHR1"
+FLAG_ALPHA = 1
+
+
+def pixel_order():
+    """Byte order of 32-bit pixels in the display format ("BGRA" when no display exists)."""
+    display = pygame.display.get_surface()
+    if display is not None and display.get_bitsize() == 32 and display.get_masks()[0] == 0xFF:
+        return "RGBA"
+    return "BGRA"
+
+
+def file_digest(path):
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()[:16]
+
+
+class AssetCache:
+    """Maps scaled images from ``directory``, building missing entries on demand."""
+
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._maps = []  # Keep mappings alive as long as their surfaces might be
+        self._digests = {}
+        self.mapped = weakref.WeakSet()  # Surfaces whose pixels live in a mapping
+        self.hits = 0
+        self.misses = 0
+
+    def entry_path(self, source, size, alpha, digest=None):
+        if digest is None:
+            digest = self._digests.get(source)
+        if digest is None:
+            digest = self._digests[source] = file_digest(source)
+        name = os.path.splitext(os.path.basename(source))[0]
+        mode = {None: "auto", True: "alpha", False: "opaque"}[alpha]
+        return os.path.join(self.directory, f"{name}-{digest}-{size[0]}x{size[1]}-{mode}-{pixel_order()}.raw")
+
+    def load(self, source, size, build, alpha=None, digest=None):
+        """Return the cached surface for ``source`` at ``size``.
+
+        ``build()`` produces the surface on a miss; its pixels are stored
+        and the mapped copy is returned, so hits and misses look the same.
+        ``digest`` keys content that isn't a loose file (a pack member);
+        loose files are hashed once per cache.
+        """
+        path = self.entry_path(source, size, alpha, digest)
+        surf = self._map(path)
+        if surf is not None:
+            self.hits += 1
+            return surf
+        self.misses += 1
+        surf = build()
+        if surf is None:
+            return None
+        self._store(path, surf)
+        return self._map(path) or surf
+
+    def _store(self, path, surf):
+        has_alpha = bool(surf.get_flags() & pygame.SRCALPHA)
+        header = HEADER.pack(MAGIC, surf.get_width(), surf.get_height(), FLAG_ALPHA if has_alpha else 0)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp, "wb") as f:
+                f.write(header)
+                f.write(pygame.image.tobytes(surf, pixel_order()))
+            os.replace(tmp, path)
+        except OSError:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+
+    def _map(self, path):
+        try:
+            with open(path, "rb") as f:
+                # Copy-on-write: pages stay shared unless something draws on the surface
+                mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+        except (OSError, ValueError):
+            return None
+        # A truncated or foreign file is a miss, so the entry is rebuilt over it
+        magic = width = height = flags = 0
+        if len(mapping) >= HEADER.size:
+            magic, width, height, flags = HEADER.unpack_from(mapping)
+        if magic != MAGIC or len(mapping) != HEADER.size + width * height * 4:
+            mapping.close()
+            return None
+        surf = pygame.image.frombuffer(memoryview(mapping)[HEADER.size:], (width, height), pixel_order())
+        if not flags & FLAG_ALPHA:
+            # Opaque images drop per-pixel alpha so blits stay straight copies
+            surf.set_alpha(None)
+        self._maps.append(mapping)
+        self.mapped.add(surf)
+        return surf
@@ -0,0 +1,181 @@
+"""Asset loading and the surface-format policy.
+
+Nothing is loaded at import time: ``Assets`` is built once the display
+(or GPU renderer) exists, because format conversion needs it.
+"""
+import os
+import warnings
+from functools import partial
+
+import pygame
+
+from .packs import AssetSource
+from .sim import BASKET_SIZE, MUSHROOM_SIZE, PLAYER_SIZE, STORM_MUSHROOM_SIZE
+from .userdata import data_path, make_parent
+
+
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+ASSET_DIR = os.path.join(PACKAGE_DIR, "assets")
+HIGH_SCORE_FILE = data_path("highscore.txt")
+# Where older versions kept it; read until the first save to the new place
+OLD_HIGH_SCORE_FILE = os.path.join(PACKAGE_DIR, "highscore.txt")
+DEBUG_SURFACES = os.environ.get("SHROOM_DEBUG") == "1"  # Warn on blits of non-display-format surfaces
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg")
+OPAQUE_EXTENSIONS = (".jpg", ".jpeg")
+
+# Loose files only; main layers SHROOM_PACKS over it
+BASE_SOURCE = AssetSource(ASSET_DIR)
+
+MONSTER_SIZE = (56, 56)
+HEART_SIZE = (28, 28)
+SOUND_VOLUME = 0.7
+
+
+def has_transparency(img):
+    """True if any pixel of a per-pixel-alpha surface is not fully opaque."""
+    if not img.get_flags() & pygame.SRCALPHA:
+        return False
+    w, h = img.get_size()
+    return pygame.mask.from_surface(img, 254).count() < w * h
+
+
+def display_convert(surf, alpha=False):
+    """``convert``/``convert_alpha`` when a display surface exists; the GPU renderer has none."""
+    if pygame.display.get_surface() is None:
+        return surf
+    return surf.convert_alpha() if alpha else surf.convert()
+
+
+def to_display_format(img, alpha=None):
+    """Convert to the display pixel format, keeping per-pixel alpha only where it's used.
+
+    Opaque images blit as straight copies after ``convert()``; blending every
+    pixel of a full-screen JPG through ``convert_alpha()`` costs a lot more.
+    """
+    if alpha is None:
+        alpha = has_transparency(img)
+    return display_convert(img, alpha)
+
+
+def decode_image(resource, size, alpha=None):
+    return pygame.transform.scale(to_display_format(pygame.image.load(resource.file(), resource.name), alpha), size)
+
+
+def load_image(name, size, alpha=None, cache=None, source=None):
+    """Load an asset scaled to ``size``; with an ``AssetCache`` the pixels are mapped, not decoded.
+
+    ``source`` is where to look (content packs over ``assets/``); the default is ``assets/`` alone.
+    """
+    resource = (source or BASE_SOURCE).find(name, IMAGE_EXTENSIONS)
+    if resource:
+        try:
+            if alpha is None and resource.name.lower().endswith(OPAQUE_EXTENSIONS):
+                alpha = False
+            if cache is not None:
+                img = cache.load(resource.key, size, lambda: decode_image(resource, size, alpha), alpha, resource.digest)
+            else:
+                img = decode_image(resource, size, alpha)
+            warn_if_unconverted(img, name)
+            return img
+        except:
+            return None
+    return None
+
+
+_format_warned = set()
+
+
+def warn_if_unconverted(surf, label):
+    """Debug builds only: warn once per surface that doesn't match the display format."""
+    if not DEBUG_SURFACES or surf is None or id(surf) in _format_warned:
+        return
+    display = pygame.display.get_surface()
+    if display is None:
+        return
+    same_format = surf.get_bitsize() == display.get_bitsize() and surf.get_masks()[:3] == display.get_masks()[:3]
+    if not same_format:
+        _format_warned.add(id(surf))
+        warnings.warn(f"Surface '{label}' is not in display format; blits will be converted per frame")
+
+
+def blit_background(surf, img, pos=(0, 0), label="background"):
+    warn_if_unconverted(img, label)
+    surf.blit(img, pos)
+
+
+def load_sound(name, source=None):
+    resource = (source or BASE_SOURCE).find(f"sounds/new_sfx/{name}", (".wav",))
+    if resource is None:
+        return None
+    try:
+        return pygame.mixer.Sound(resource.file())
+    except:
+        return None
+
+
+def load_highscore(path=None):
+    if path is None:
+        path = HIGH_SCORE_FILE if os.path.exists(HIGH_SCORE_FILE) else OLD_HIGH_SCORE_FILE
+    try:
+        with open(path, "r") as f:
+            return int(f.read().strip())
+    except:
+        return 0
+
+def save_highscore(score, path=None):
+    path = path or HIGH_SCORE_FILE
+    try:
+        make_parent(path)
+        with open(path, "w") as f:
+            f.write(str(score))
+    except:
+        pass
+
+
+class Assets:
+    """Images and sounds scaled for one screen size.
+
+    Missing files load as None; callers fall back to plain shapes, as the
+    game always has. Pass an ``AssetCache`` to map pre-scaled pixels shared
+    with other instances instead of decoding every file, and an
+    ``AssetSource`` to load from content packs layered over ``assets/``.
+    """
+
+    def __init__(self, width, height, cache=None, source=None):
+        self.size = (width, height)
+        self.cache = cache
+        self.source = source = source or BASE_SOURCE
+        load = partial(load_image, cache=cache, source=source)
+        self.menu_bg = load("menu_bg", (width, height))
+        self.level1_bg = load("level1_bg", (width, height))
+        self.level2_bg = load("level2_bg", (width, height))
+        self.basket_img = load("basket", BASKET_SIZE)
+        self.mushroom_img = load("mushroom", MUSHROOM_SIZE)
+        # Ensure we always have a valid image; if gold asset is missing, use the normal mushroom image
+        self.mushroom_gold_img = load("mushroom_gold", MUSHROOM_SIZE) or self.mushroom_img
+        self.mushroom_player_img = load("mushroom_legs", PLAYER_SIZE)
+        self.monster_img = load("monster", MONSTER_SIZE)
+        self.heart_img = load("heart", HEART_SIZE)
+        self.heart_icon_small = pygame.transform.smoothscale(self.heart_img, (24, 24)) if self.heart_img else None
+        self.heart_icon_status = pygame.transform.smoothscale(self.heart_img, (26, 26)) if self.heart_img else None
+        self.storm_mushroom_img = load("mushroom", STORM_MUSHROOM_SIZE)
+        self.storm_gold_img = load("mushroom_gold", STORM_MUSHROOM_SIZE) or self.storm_mushroom_img
+        # Sliced clips and effect loops, built from the images above
+        from .animation import Animations
+        self.animations = Animations(self, source, display_convert)
+
+        self.sounds = {
+            "collect": load_sound("collect", source),
+            "miss": load_sound("miss", source),
+            "hit": load_sound("hit", source),
+            "jump": load_sound("wing", source),
+            "dash": load_sound("swoosh", source),
+        }
+        for snd in self.sounds.values():
+            if snd:
+                snd.set_volume(SOUND_VOLUME)
+
+    def play(self, name):
+        snd = self.sounds.get(name)
+        if snd:
+            snd.play()
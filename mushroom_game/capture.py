@@ -0,0 +1,226 @@
+"""Headless playback of scripted input, rendering every frame off-screen.
+
+Drives a ``Session`` from an input script under the SDL dummy video driver
+and draws each frame with the same scene and HUD functions as the game, as
+fast as the machine allows. Frames go to numbered PNGs, to stdout as raw
+RGB for ffmpeg, or are compared against a directory of golden PNGs::
+
+    python -m mushroom_game.capture run.txt --frames 900 --out goldens/
+    python -m mushroom_game.capture run.txt --frames 900 --compare goldens/
+    python -m mushroom_game.capture run.txt --raw | \\
+        ffmpeg -f rawvideo -pix_fmt rgb24 -s 1280x720 -r 60 -i - trailer.mp4
+
+A script has one line per frame that has input: ``<frame> <command>...``.
+Commands are the flow commands of ``main.apply_command`` (start, storm,
+ghost, multi2-4, menu, pause) or held inputs switched on and off with
+``+left``/``-left`` (left, right, jump, dash, and jump2-4/dash2-4 for the
+other local players); ``quit`` ends the run early. ``size W H`` and
+``seed N`` lines pin the window size and RNG seed. Play with
+``SHROOM_RECORD=run.txt`` to record one.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+from .sim import PLAYER_INPUTS
+
+HELD_INPUTS = ("left", "right") + tuple(name for pair in PLAYER_INPUTS for name in pair)
+DEFAULT_SIZE = (1280, 720)
+MIN_SIZE = (800, 450)
+
+
+def parse_script(text):
+    """Return ``(meta, commands)``: header values and ``{frame: [command, ...]}``."""
+    meta = {}
+    commands = {}
+    for lineno, line in enumerate(text.splitlines(), 1):
+        line = line.split("#", 1)[0].strip()
+        if not line:
+            continue
+        head, *rest = line.split()
+        if head == "size" and len(rest) == 2:
+            meta["size"] = (int(rest[0]), int(rest[1]))
+        elif head == "seed" and len(rest) == 1:
+            meta["seed"] = int(rest[0])
+        elif head.isdigit() and rest:
+            commands.setdefault(int(head), []).extend(rest)
+        else:
+            raise ValueError(f"script line {lineno}: cannot parse {line!r}")
+    return meta, commands
+
+
+def parse_inline(spec):
+    """Parse the ``--script`` shorthand ``"3:start,40:+right,90:-right"``."""
+    lines = []
+    for item in filter(None, spec.split(",")):
+        frame, command = item.split(":")
+        lines.append(f"{frame} {command}")
+    return parse_script("\n".join(lines))
+
+
+class InputRecorder:
+    """Writes the player's input as a script that ``capture`` can replay.
+
+    ``frame()`` is called once per loop iteration with the held inputs (or
+    None while paused); flow commands applied during that iteration are
+    logged with ``command()`` first.
+    """
+
+    def __init__(self, path, size, seed):
+        self.path = path
+        self.lines = [f"size {size[0]} {size[1]}", f"seed {seed}"]
+        self.index = 0
+        self.held = dict.fromkeys(HELD_INPUTS, False)
+        self.pending = []
+
+    def command(self, name):
+        self.pending.append(name)
+
+    def frame(self, held=None):
+        changes = self.pending
+        self.pending = []
+        if held is not None:
+            for name in HELD_INPUTS:
+                pressed = bool(held.get(name))
+                if pressed != self.held[name]:
+                    self.held[name] = pressed
+                    changes.append(("+" if pressed else "-") + name)
+        if changes:
+            self.lines.append(f"{self.index} {' '.join(changes)}")
+        self.index += 1
+
+    def save(self):
+        with open(self.path, "w") as f:
+            f.write("\n".join(self.lines) + "\n")
+
+
+def play(commands, frames, size=DEFAULT_SIZE, seed=0, balance=None, ghost=None):
+    """Yield ``(frame, surface)`` for each frame of the scripted run.
+
+    The surface is reused between frames; copy it to keep one. Both the
+    simulation RNG and the module ``random`` used by particles are seeded,
+    so the same script always renders the same pixels.
+    """
+    import pygame
+
+    from .assets import Assets
+    from .main import apply_command, draw_frame, draw_paused
+    from .renderer import OffscreenRenderer
+    from .sim import GAMEOVER, WIN, Session, step_inputs, storm_available
+
+    # A tiny hidden display gives surfaces a pixel format to convert to
+    pygame.display.set_mode((1, 1))
+    renderer = OffscreenRenderer(size)
+    screen = renderer.surface
+    assets = Assets(*size)
+    session = Session(*size, balance=balance, seed=seed)
+    session.best_ghost = ghost
+    storm_enabled = storm_available()
+    random.seed(seed)
+    held = dict.fromkeys(HELD_INPUTS, False)
+
+    for index in range(frames):
+        for command in commands.get(index, ()):
+            if command[:1] in "+-" and command[1:] in held:
+                held[command[1:]] = command[0] == "+"
+            elif command == "quit":
+                return
+            else:
+                apply_command(session, command, storm_enabled)
+
+        if session.paused and session.state not in (GAMEOVER, WIN):
+            draw_paused(screen, renderer)
+        else:
+            session.step(**step_inputs(held, session.squad))
+            session.sfx.clear()
+            draw_frame(screen, renderer, session, assets, storm_enabled)
+        yield index, screen
+
+
+def frame_path(directory, index):
+    return os.path.join(directory, f"frame_{index:06d}.png")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m mushroom_game.capture", description=__doc__.split("\n\n")[0])
+    parser.add_argument("script", nargs="?", help="input script file (see module docs)")
+    parser.add_argument("--script", dest="inline", help='inline script, e.g. "3:start,40:+right,90:-right"')
+    parser.add_argument("--frames", type=int, default=600, help="frames to simulate (default 600)")
+    parser.add_argument("--size", help="frame size WxH (default from the script, else 1280x720)")
+    parser.add_argument("--seed", type=int, help="RNG seed (default from the script, else 0)")
+    parser.add_argument("--config", help="balance config file (defaults are used otherwise)")
+    parser.add_argument("--ghost", help="ghost recording offered to the \"ghost\" command")
+    parser.add_argument("--every", type=int, default=1, help="only output every Nth frame")
+    output = parser.add_mutually_exclusive_group(required=True)
+    output.add_argument("--out", help="write numbered PNGs into this directory")
+    output.add_argument("--raw", action="store_true", help="write raw RGB24 frames to stdout")
+    output.add_argument("--compare", help="compare frames against golden PNGs in this directory")
+    args = parser.parse_args(argv)
+
+    if args.script:
+        with open(args.script) as f:
+            meta, commands = parse_script(f.read())
+    elif args.inline:
+        meta, commands = parse_inline(args.inline)
+    else:
+        meta, commands = {}, {}
+    size = tuple(int(v) for v in args.size.lower().split("x")) if args.size else meta.get("size", DEFAULT_SIZE)
+    seed = args.seed if args.seed is not None else meta.get("seed", 0)
+    if size[0] < MIN_SIZE[0] or size[1] < MIN_SIZE[1]:
+        parser.error(f"size must be at least {MIN_SIZE[0]}x{MIN_SIZE[1]}, like the game window")
+
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    import pygame
+
+    from .config import load_config
+    from .ghost import load_ghost
+
+    pygame.init()
+    balance = load_config(args.config) if args.config else None
+    if args.out:
+        os.makedirs(args.out, exist_ok=True)
+    stdout = sys.stdout.buffer
+
+    simulated = written = 0
+    mismatched = []
+    started = time.perf_counter()
+    ghost = load_ghost(args.ghost) if args.ghost else None
+    for index, surface in play(commands, args.frames, size, seed, balance, ghost):
+        simulated += 1
+        if index % args.every:
+            continue
+        written += 1
+        if args.out:
+            pygame.image.save(surface, frame_path(args.out, index))
+        elif args.raw:
+            stdout.write(pygame.image.tobytes(surface, "RGB"))
+        else:
+            path = frame_path(args.compare, index)
+            if not os.path.exists(path):
+                mismatched.append((index, "missing golden"))
+                continue
+            golden = pygame.image.load(path)
+            if golden.get_size() != surface.get_size():
+                mismatched.append((index, f"size {golden.get_size()} != {surface.get_size()}"))
+            elif pygame.image.tobytes(golden, "RGB") != pygame.image.tobytes(surface, "RGB"):
+                mismatched.append((index, "pixels differ"))
+    elapsed = time.perf_counter() - started
+    if args.raw:
+        stdout.flush()
+    pygame.quit()
+
+    fps = simulated / elapsed if elapsed else 0
+    print(f"{written} frames at {size[0]}x{size[1]}, {fps:.0f} sim fps", file=sys.stderr)
+    if mismatched:
+        for index, reason in mismatched[:10]:
+            print(f"frame {index}: {reason}", file=sys.stderr)
+        print(f"{len(mismatched)} of {written} frames differ from {args.compare}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,260 @@
+"""Typed balance configuration loaded from TOML or JSON, with hot reload.
+
+``BalanceConfig`` holds every tuning knob with its default. A config file
+only needs the keys it overrides, e.g. ``balance.toml``::
+
+    level1_goal = 10
+    runner_acceleration = 0.02
+    monster_gap_bands = [[0.5, 300, 500], [1.0, 900, 1400]]
+    runner_speed_curve = [[0, 4], [3000, 7], [12000, 12]]
+
+``ConfigWatcher`` polls the file from a background thread and hands a new
+config to the game loop when it changes, so balance can be tuned while the
+game is running.
+"""
+import json
+import os
+import threading
+import warnings
+from dataclasses import dataclass, fields, replace
+
+from .difficulty import difficulty_for
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    try:
+        import tomli as tomllib
+    except ImportError:
+        tomllib = None
+
+
+# A band is (upper probability bound, min, max): the first band whose bound
+# exceeds a uniform roll picks the range the gap is drawn from.
+Bands = tuple
+
+
+class Curve(tuple):
+    """Points ``(x, y, ...)`` with increasing x, interpolated linearly and held flat past the ends.
+
+    Level 1 curves are indexed by score, Level 2 curves by distance run. A
+    point may carry several values (e.g. one weight per monster type). An
+    empty curve keeps the ramp derived from the older scalar settings.
+    """
+
+
+# Values per point for curves that carry more than one
+CURVE_WIDTHS = {"monster_mix_curve": 3, "powerup_odds_curve": 2}
+# Curves that may be empty, falling back to the ramps of the older scalar settings
+RAMP_CURVES = ("level1_fall_speed_curve", "runner_speed_curve")
+
+
+@dataclass(frozen=True)
+class BalanceConfig:
+    level1_goal: int = 5                 # Testing: lowered from 25
+    lives_start: int = 3                 # Much more forgiving
+    gravity: float = 0.5
+    player_jump_speed: float = -12       # Stronger jump
+    dash_cooldown_frames: int = 900      # 15-second cooldown at 60 FPS
+    shield_duration_frames: int = 600    # Increased from 420
+    shield_hit_cost_ratio: float = 0.25  # Shield reduces by ~25% per hit
+    collect_flash_duration: int = 8
+    hit_flash_duration: int = 16
+    mushroom_fall_speed: float = 3.5     # Faster base falling speed
+    level1_max_concurrent: int = 2       # Max mushrooms falling at once
+    level1_min_x_gap: int = 220          # Minimum horizontal separation between active mushrooms
+    runner_speed: float = 4              # Base scrolling speed
+    runner_acceleration: float = 0.01    # Speed increase over time
+    max_runner_speed: float = 12         # Maximum speed cap
+    monster_max_concurrent: int = 3      # Cap active monsters for fairness
+    distance_score_unit: int = 100       # Distance units per 1 score point
+    storm_max_concurrent: int = 320
+    storm_min_x_gap: int = 28            # Gap between mushrooms still inside the spawn row
+    storm_spawns_per_frame: int = 3
+    storm_duration_frames: int = 3600
+    # Particle budget (see particles.ParticleBudget): the global cap and each category's quota
+    particle_cap: int = 400
+    particle_quota_ambient: int = 48
+    particle_quota_aura: int = 40
+    particle_quota_movement: int = 120
+    particle_quota_feedback: int = 320
+    # micro gaps (bursts), normal gaps, long gaps (breathing room)
+    level1_spawn_delay_bands: Bands = ((0.40, 8, 18), (0.85, 20, 45), (1.0, 60, 100))
+    monster_gap_bands: Bands = ((0.40, 300, 500), (0.85, 700, 1100), (1.0, 1200, 1800))
+    # rare micro gaps, normal long gaps, very long gaps
+    powerup_gap_bands: Bands = ((0.20, 3500, 4500), (0.85, 6000, 8500), (1.0, 10000, 15000))
+    # Difficulty curves (see difficulty.py); the speed curves default to the ramps above
+    level1_fall_speed_curve: Curve = ()            # score -> mushroom fall speed
+    level1_spawn_delay_scale_curve: Curve = ((0, 1.0),)  # score -> spawn delay band multiplier
+    runner_speed_curve: Curve = ()                 # distance -> scrolling speed
+    monster_gap_scale_curve: Curve = ((0, 1.0),)   # distance -> monster gap band multiplier
+    powerup_gap_scale_curve: Curve = ((0, 1.0),)   # distance -> powerup gap band multiplier
+    monster_mix_curve: Curve = ((0, 1, 1, 1),)     # distance -> weights of fast, medium, big monsters
+    powerup_odds_curve: Curve = ((0, 0.70, 0.85),)  # distance -> roll bounds for a heart (if hurt), a shield
+
+    @property
+    def shield_hit_cost_frames(self):
+        return int(self.shield_duration_frames * self.shield_hit_cost_ratio)
+
+
+def _coerce(name, expected, value):
+    if expected is Curve:
+        width = CURVE_WIDTHS.get(name, 1)
+        if not isinstance(value, (list, tuple)):
+            raise ValueError(f"{name}: expected a list of [x, {', '.join(['y'] * width)}] points")
+        points = []
+        for point in value:
+            if not isinstance(point, (list, tuple)) or len(point) != width + 1:
+                raise ValueError(f"{name}: point {point!r} must have x and {width} value(s)")
+            if any(isinstance(v, bool) or not isinstance(v, (int, float)) for v in point):
+                raise ValueError(f"{name}: point {point!r} must be numbers")
+            if points and point[0] <= points[-1][0]:
+                raise ValueError(f"{name}: x must increase, {point[0]!r} follows {points[-1][0]!r}")
+            if point[0] < 0:
+                raise ValueError(f"{name}: x must not be negative")
+            if name.endswith("_scale_curve") and point[1] < 0:
+                raise ValueError(f"{name}: scale {point[1]!r} must not be negative")
+            if name == "monster_mix_curve" and (min(point[1:]) < 0 or sum(point[1:]) <= 0):
+                raise ValueError(f"{name}: weights {list(point[1:])!r} must not be negative and not all zero")
+            points.append(tuple(float(v) for v in point))
+        if not points and name not in RAMP_CURVES:
+            raise ValueError(f"{name}: expected at least one point")
+        return tuple(points)
+    if expected is Bands:
+        if not isinstance(value, (list, tuple)) or not value:
+            raise ValueError(f"{name}: expected a non-empty list of [probability, min, max]")
+        bands = []
+        last = 0.0
+        for band in value:
+            if not isinstance(band, (list, tuple)) or len(band) != 3:
+                raise ValueError(f"{name}: band {band!r} must be [probability, min, max]")
+            if any(isinstance(v, bool) or not isinstance(v, (int, float)) for v in band):
+                raise ValueError(f"{name}: band {band!r} must be numbers")
+            bound, lo, hi = float(band[0]), int(band[1]), int(band[2])
+            if not last < bound <= 1.0 or lo > hi:
+                raise ValueError(f"{name}: band {band!r} is out of order")
+            bands.append((bound, lo, hi))
+            last = bound
+        if last != 1.0:
+            raise ValueError(f"{name}: the last band must end at probability 1.0")
+        return tuple(bands)
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise ValueError(f"{name}: expected a number, got {value!r}")
+    if expected is int:
+        if value != int(value):
+            raise ValueError(f"{name}: expected an integer, got {value!r}")
+        if name.startswith("particle_") and value < (1 if name == "particle_cap" else 0):
+            raise ValueError(f"{name}: {value!r} is too small")
+        return int(value)
+    return float(value)
+
+
+def parse_settings(data, name):
+    """The table in ``data``, the bytes of a TOML or JSON (by ``name``'s extension) config file."""
+    if name.endswith(".json"):
+        return json.loads(bytes(data))
+    if tomllib is None:
+        raise ValueError(f"{name}: TOML support needs Python 3.11+ or the tomli package")
+    return tomllib.loads(bytes(data).decode("utf-8"))
+
+
+def apply_settings(raw, base, source):
+    """``base`` with the settings of the parsed table ``raw`` applied; ``source`` names it in messages."""
+    if not isinstance(raw, dict):
+        raise ValueError(f"{source}: expected a table of settings")
+    types = {f.name: f.type for f in fields(BalanceConfig)}
+    overrides = {}
+    for key, value in raw.items():
+        if key not in types:
+            warnings.warn(f"{source}: unknown setting '{key}' ignored")
+            continue
+        overrides[key] = _coerce(key, types[key], value)
+    config = replace(base, **overrides)
+    # Build the difficulty tables now, so a config they can't be built from is
+    # rejected here rather than when a session switches to it mid-game
+    try:
+        difficulty_for(config)
+    except (ArithmeticError, IndexError, TypeError) as exc:
+        raise ValueError(f"{source}: difficulty curves unusable: {exc!r}") from exc
+    return config
+
+
+def _parse(path):
+    with open(path, "rb") as f:
+        return parse_settings(f.read(), path)
+
+
+_parse_cache = {}
+
+
+def _signature(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def load_config(path, base=None):
+    """Load ``path`` over ``base`` (the defaults if omitted).
+
+    A missing file yields the base config. Parsed values are cached by file
+    signature and base, so repeated loads and watcher polls of an unchanged
+    file skip parsing entirely. The cache is per process and doesn't speed up
+    the first load, but that parse takes a fraction of a millisecond.
+    """
+    base = base or BalanceConfig()
+    sig = _signature(path)
+    if sig is None:
+        return base
+    cached = _parse_cache.get(path)
+    if cached and cached[0] == sig and cached[1] == base:
+        return cached[2]
+    config = apply_settings(_parse(path), base, path)
+    _parse_cache[path] = (sig, base, config)
+    return config
+
+
+class ConfigWatcher:
+    """Polls a config file on a daemon thread and queues reloaded configs.
+
+    The game loop calls ``poll()`` once per frame; it never blocks and only
+    returns a config when the file changed and parsed cleanly. Broken edits
+    are reported and the previous config stays active.
+    """
+
+    def __init__(self, path, interval=0.5, base=None):
+        self.path = path
+        self.interval = interval
+        self.base = base
+        self._latest = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._signature = _signature(path)
+        self._thread = threading.Thread(target=self._run, name="config-watcher", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            sig = _signature(self.path)
+            if sig == self._signature:
+                continue
+            self._signature = sig
+            try:
+                config = load_config(self.path, self.base)
+            except (OSError, ValueError) as exc:
+                warnings.warn(f"Config reload failed, keeping previous values: {exc}")
+                continue
+            with self._lock:
+                self._latest = config
+
+    def poll(self):
+        with self._lock:
+            config, self._latest = self._latest, None
+        return config
@@ -0,0 +1,255 @@
+"""Difficulty curves, precomputed into tables the simulation indexes every frame.
+
+``Difficulty`` turns the curves in a ``BalanceConfig`` into lookup tables
+once: Level 1 by score (fall speed, spawn delay bands), Level 2 by distance
+in steps of ``DISTANCE_STEP`` (scroll speed, monster and powerup gap bands,
+monster mix and powerup odds). A lookup is a clamped list index, so the hot
+loop never evaluates a curve; past the end of a table the last entry holds.
+
+Designers author curves as ``[[x, y], ...]`` points in the balance file (see
+``config.Curve``). The speed curves default to the older ramps, derived from
+``mushroom_fall_speed`` and ``runner_speed``/``runner_acceleration``/
+``max_runner_speed``, so existing balance files behave as before.
+
+    python -m mushroom_game.difficulty [--config balance.toml] [--level 2]
+
+prints the tables at checkpoints and plays batches of scripted runs through
+``env.VectorEnv`` to report how hard each stretch of the curve really is.
+"""
+import math
+from bisect import bisect_right
+from functools import lru_cache
+from itertools import accumulate
+
+DISTANCE_STEP = 16  # Distance units per Level 2 table entry
+FALL_BONUS_RATE, FALL_BONUS_MAX = 0.12, 10  # Older Level 1 ramp: fall speed grows with score, capped
+
+
+def interpolate(points, x):
+    """Values of the piecewise-linear ``points`` at ``x``, as a tuple."""
+    i = bisect_right([p[0] for p in points], x)
+    if i == 0:
+        return tuple(points[0][1:])
+    if i == len(points):
+        return tuple(points[-1][1:])
+    (x0, *a), (x1, *b) = points[i - 1], points[i]
+    t = (x - x0) / (x1 - x0)
+    return tuple(u + (v - u) * t for u, v in zip(a, b))
+
+
+def sample(points, step):
+    """One entry per ``step`` of x up to the last point (at least one entry)."""
+    return [interpolate(points, i * step) for i in range(int(points[-1][0] // step) + 1)]
+
+
+def scale_bands(bands, scale):
+    return tuple((bound, round(lo * scale), round(hi * scale)) for bound, lo, hi in bands)
+
+
+class Table:
+    """Values indexed from 0, with the last one held for every larger index."""
+
+    __slots__ = ("values", "last")
+
+    def __init__(self, values):
+        self.values = values
+        self.last = len(values) - 1
+
+    def at(self, index):
+        return self.values[index if index < self.last else self.last]
+
+    def __len__(self):
+        return len(self.values)
+
+
+def ramp_speeds(start, acceleration, top):
+    """Older Level 2 ramp as speed by distance: ``acceleration`` per frame from ``start`` up to ``top``."""
+    if acceleration <= 0 or top <= start:
+        return [min(start, top)]
+    # After n frames the speed is start + a*n and the distance run is n*start + a*n*(n+1)/2
+    frames = (top - start) / acceleration
+    full = frames * start + acceleration * frames * (frames + 1) / 2
+    half = start + acceleration / 2
+    speeds = []
+    for i in range(int(full // DISTANCE_STEP) + 2):
+        n = (math.sqrt(half * half + 2 * acceleration * i * DISTANCE_STEP) - half) / acceleration
+        speeds.append(min(top, start + acceleration * n))
+    return speeds
+
+
+class Difficulty:
+    """Every difficulty table for one ``BalanceConfig``."""
+
+    def __init__(self, balance):
+        b = balance
+        if b.level1_fall_speed_curve:
+            fall = [v for v, in sample(b.level1_fall_speed_curve, 1)]
+        else:
+            steps = math.ceil(FALL_BONUS_MAX / FALL_BONUS_RATE) + 1
+            fall = [b.mushroom_fall_speed + min(s * FALL_BONUS_RATE, FALL_BONUS_MAX) for s in range(steps)]
+        self.fall_speeds = Table(fall)
+        self.spawn_delay_bands = self._bands(b.level1_spawn_delay_bands, b.level1_spawn_delay_scale_curve, 1)
+
+        if b.runner_speed_curve:
+            speeds = [v for v, in sample(b.runner_speed_curve, DISTANCE_STEP)]
+        else:
+            speeds = ramp_speeds(b.runner_speed, b.runner_acceleration, b.max_runner_speed)
+        self.speeds = Table(speeds)
+        self.monster_gap_bands = self._bands(b.monster_gap_bands, b.monster_gap_scale_curve, DISTANCE_STEP)
+        self.powerup_gap_bands = self._bands(b.powerup_gap_bands, b.powerup_gap_scale_curve, DISTANCE_STEP)
+        mix = []
+        for weights in sample(b.monster_mix_curve, DISTANCE_STEP):
+            total = sum(max(0.0, w) for w in weights) or 1.0
+            # Cumulative weights, ready for random.choices(cum_weights=...)
+            mix.append(tuple(accumulate(max(0.0, w) / total for w in weights)))
+        self.monster_mixes = Table(mix)
+        self.powerup_odds = Table(sample(b.powerup_odds_curve, DISTANCE_STEP))
+
+    @staticmethod
+    def _bands(bands, scale_curve, step):
+        """Gap bands scaled by ``scale_curve``; equal scales share one bands tuple."""
+        shared = {}
+        values = []
+        for scale, in sample(scale_curve, step):
+            if scale not in shared:
+                shared[scale] = bands if scale == 1 else scale_bands(bands, scale)
+            values.append(shared[scale])
+        return Table(values)
+
+    # -- lookups: Level 1 by score, Level 2 by distance run -----------------
+
+    def fall_speed(self, score):
+        return self.fall_speeds.at(score)
+
+    def spawn_delays(self, score):
+        return self.spawn_delay_bands.at(score)
+
+    def runner_speed(self, distance):
+        return self.speeds.at(int(distance) // DISTANCE_STEP)
+
+    def monster_gaps(self, distance):
+        return self.monster_gap_bands.at(int(distance) // DISTANCE_STEP)
+
+    def powerup_gaps(self, distance):
+        return self.powerup_gap_bands.at(int(distance) // DISTANCE_STEP)
+
+    def monster_mix(self, distance):
+        """Cumulative weights of the fast, medium and big monster types."""
+        return self.monster_mixes.at(int(distance) // DISTANCE_STEP)
+
+    def powerup_chances(self, distance):
+        """``(heart bound, shield bound)`` on one uniform roll."""
+        return self.powerup_odds.at(int(distance) // DISTANCE_STEP)
+
+
+@lru_cache(maxsize=8)
+def difficulty_for(balance):
+    """The tables for ``balance``, built once per config and shared by every session."""
+    return Difficulty(balance)
+
+
+def checkpoints(level, balance, every):
+    """Rows of the tables at every ``every`` score points (Level 1) or distance units (Level 2)."""
+    d = difficulty_for(balance)
+    if level == 1:
+        end = max(len(d.fall_speeds), len(d.spawn_delay_bands), balance.level1_goal + 1)
+        for score in range(0, end, every):
+            yield score, {"fall speed": d.fall_speed(score), "spawn delay": mean_gap(d.spawn_delays(score))}
+        return
+    end = max(len(d.speeds), len(d.monster_gap_bands), len(d.powerup_gap_bands), len(d.monster_mixes), len(d.powerup_odds))
+    for distance in range(0, end * DISTANCE_STEP + every, every):
+        fast, medium, _ = d.monster_mix(distance)
+        heart, shield = d.powerup_chances(distance)
+        yield distance, {
+            "speed": d.runner_speed(distance),
+            "monster gap": mean_gap(d.monster_gaps(distance)),
+            "powerup gap": mean_gap(d.powerup_gaps(distance)),
+            "fast/med/big %": f"{fast * 100:.0f}/{(medium - fast) * 100:.0f}/{(1 - medium) * 100:.0f}",
+            "heart/shield %": f"{heart * 100:.0f}/{(shield - heart if heart < shield else 0) * 100:.0f}",
+        }
+
+
+def mean_gap(bands):
+    """Expected gap drawn by ``sim.pick_gap`` from ``bands``."""
+    last, total = 0.0, 0.0
+    for bound, lo, hi in bands:
+        total += (bound - last) * (lo + hi) / 2
+        last = bound
+    return total
+
+
+def verify(level, balance, episodes, envs=16, every=None, seed=0):
+    """Play ``episodes`` scripted runs and measure each stretch of the curve.
+
+    Returns ``(start, reached, lives lost per run reaching it)`` rows for
+    stretches of ``every`` score points or distance units: how many runs got
+    that far and how punishing the stretch was for them.
+    """
+    import numpy as np
+
+    from .env import VectorEnv, scripted_actions
+    from .sim import LEVEL1, LEVEL2
+
+    every = every or (5 if level == 1 else 1000)
+    key = "score" if level == 1 else "distance"
+    games = VectorEnv(envs, level=LEVEL1 if level == 1 else LEVEL2, balance=balance)
+    rng = np.random.default_rng(seed)
+    states, _ = games.reset(seed=seed)
+    lives = [balance.lives_start] * envs
+    furthest = [0] * envs
+    reached, lost = {}, {}
+    finished = 0
+    while finished < episodes:
+        states, _, _, _, infos = games.step(scripted_actions(games.envs[0].level, states, rng))
+        for i, info in enumerate(infos):
+            stretch = int(info[key]) // every
+            furthest[i] = max(furthest[i], stretch)
+            if info["lives"] < lives[i]:
+                lost[stretch] = lost.get(stretch, 0) + lives[i] - info["lives"]
+            lives[i] = info["lives"]
+            if "episode" in info:
+                for s in range(furthest[i] + 1):
+                    reached[s] = reached.get(s, 0) + 1
+                lives[i], furthest[i] = balance.lives_start, 0
+                finished += 1
+    games.close()
+    return [(s * every, reached[s], lost.get(s, 0) / reached[s]) for s in sorted(reached)]
+
+
+def main(argv=None):
+    import argparse
+
+    from .config import BalanceConfig, load_config
+
+    parser = argparse.ArgumentParser(prog="python -m mushroom_game.difficulty", description=__doc__.split("\n\n")[0])
+    parser.add_argument("--config", help="balance config file (defaults are used otherwise)")
+    parser.add_argument("--level", type=int, choices=(1, 2), default=2)
+    parser.add_argument("--every", type=int, help="stretch length in score points or distance (default 5 / 1000)")
+    parser.add_argument("--episodes", type=int, default=200, help="scripted runs to verify with (0 skips)")
+    parser.add_argument("--envs", type=int, default=16, help="runs played in lockstep")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    balance = load_config(args.config) if args.config else BalanceConfig()
+    every = args.every or (5 if args.level == 1 else 1000)
+
+    rows = list(checkpoints(args.level, balance, every))
+    names = list(rows[0][1])
+    print(f"{'score' if args.level == 1 else 'distance':>8}  " + "  ".join(f"{name:>15}" for name in names))
+    for x, values in rows:
+        cells = (f"{v:>15}" if isinstance(v, str) else f"{v:15.2f}" for v in values.values())
+        print(f"{x:8d}  " + "  ".join(cells))
+    if not args.episodes:
+        return 0
+
+    stretches = verify(args.level, balance, args.episodes, args.envs, every, args.seed)
+    print(f"\n{stretches[0][1]} scripted runs:")
+    print(f"{'from':>8}  {'runs reaching':>13}  {'lives lost/run':>14}")
+    for start, reached, lost in stretches:
+        print(f"{start:8d}  {reached:13d}  {lost:14.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    import sys
+
+    sys.exit(main())
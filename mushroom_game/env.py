@@ -0,0 +1,490 @@
+"""Level 1 and Level 2 as Gym-style environments for training and stress-test bots.
+
+``ShroomEnv`` wraps one ``Session`` with the Gymnasium API: ``reset(seed)``
+returns ``(observation, info)`` and ``step(action)`` returns ``(observation,
+reward, terminated, truncated, info)``. The observation is a flat float32
+vector of the player state and the nearest entities, in fixed slots (see
+``LEVEL1_FIELDS``/``LEVEL2_FIELDS`` and the per-entity field names), with
+positions relative to the basket or runner and scaled by the screen size.
+Pass ``pixels=(w, h)`` to also get the rendered frame, downscaled; the
+observation is then ``{"state": vector, "pixels": uint8 array (h, w, 3)}``.
+
+Nothing is drawn unless pixels are requested; without them particle effects
+are muted as well, so a step is only the simulation. ``VectorEnv`` steps several
+games in lockstep in one process and ``SubprocessVectorEnv`` spreads them over
+worker processes; both reset finished games automatically.
+
+``snapshot()`` saves the game at any point and ``reset(options={"snapshot":
+blob})`` starts the next episode from there (see ``savestate``), which is
+much cheaper than playing back up to a hard stretch.
+
+Actions are discrete: Level 1 is stay/left/right, Level 2 is none/jump/dash.
+The reward is the score gained minus ``life_penalty`` per life lost. A Level 1
+episode ends when the goal is reached (``info["won"]``) or the lives run out.
+
+    python -m mushroom_game.env --level 2 --envs 32 --workers 4 --steps 1000000
+
+runs a scripted policy and reports throughput and how far its runs got.
+"""
+import os
+import random
+
+import numpy as np
+
+from . import savestate
+from .sim import FPS, LEVEL1, LEVEL2, Session
+
+try:
+    from gymnasium import spaces
+except ImportError:
+    spaces = None
+
+DEFAULT_SIZE = (1280, 720)
+MAX_EPISODE_STEPS = FPS * 60 * 10  # Ten minutes of play
+POWERUP_SLOTS = 2  # Hearts and shields observed, each
+
+LEVEL1_ACTIONS = ({}, {"left": True}, {"right": True})
+LEVEL2_ACTIONS = ({}, {"jump": True}, {"dash": True})
+LEVEL1_FIELDS = ("basket_x", "lives", "score", "fall_speed")
+MUSHROOM_FIELDS = ("present", "dx", "y", "gold")
+LEVEL2_FIELDS = ("height", "player_vy", "on_ground", "dash_cd", "shield_timer", "lives", "runner_speed")
+MONSTER_FIELDS = ("present", "dx", "dy", "width", "height", "vx")
+POWERUP_FIELDS = ("present", "dx", "dy")
+
+
+def observation_size(level, balance):
+    if level == LEVEL1:
+        return len(LEVEL1_FIELDS) + balance.level1_max_concurrent * len(MUSHROOM_FIELDS)
+    return (
+        len(LEVEL2_FIELDS)
+        + balance.monster_max_concurrent * len(MONSTER_FIELDS)
+        + 2 * POWERUP_SLOTS * len(POWERUP_FIELDS)
+    )
+
+
+def ahead(rects, player, slots):
+    """The first ``slots`` rects not yet behind ``player``, nearest first."""
+    return sorted((r for r in rects if r.right >= player.left), key=lambda r: r.x)[:slots]
+
+
+_frame_targets = {}
+
+
+def frame_target(size):
+    """One off-screen renderer and asset set per frame size, shared by every env in the process."""
+    target = _frame_targets.get(size)
+    if target is None:
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        import pygame
+
+        from .assets import Assets
+        from .renderer import OffscreenRenderer
+
+        pygame.font.init()
+        if pygame.display.get_surface() is None:
+            # A tiny hidden display gives surfaces a pixel format to convert to
+            pygame.display.init()
+            pygame.display.set_mode((1, 1))
+        target = _frame_targets[size] = (OffscreenRenderer(size), Assets(*size))
+    return target
+
+
+class ShroomEnv:
+    """One game of ``level`` (``sim.LEVEL1`` or ``sim.LEVEL2``) behind the Gym step API."""
+
+    def __init__(self, level=LEVEL2, size=DEFAULT_SIZE, balance=None, pixels=None,
+                 frame_skip=1, max_steps=MAX_EPISODE_STEPS, life_penalty=1.0):
+        if level not in (LEVEL1, LEVEL2):
+            raise ValueError(f"level must be {LEVEL1!r} or {LEVEL2!r}, not {level!r}")
+        self.level = level
+        self.size = tuple(size)
+        self.pixels = tuple(pixels) if pixels else None
+        self.frame_skip = frame_skip
+        self.max_steps = max_steps
+        self.life_penalty = life_penalty
+        self.actions = LEVEL1_ACTIONS if level == LEVEL1 else LEVEL2_ACTIONS
+        self.session = Session(*self.size, balance=balance, effects=self.pixels is not None)
+        self.balance = self.session.balance
+        self.observation_size = observation_size(level, self.balance)
+        self.seeds = random.Random()
+        self.steps = 0
+        self.episode_reward = 0.0
+        if spaces is not None:
+            self.action_space = spaces.Discrete(len(self.actions))
+            state = spaces.Box(-np.inf, np.inf, (self.observation_size,), np.float32)
+            if self.pixels:
+                frame = spaces.Box(0, 255, (self.pixels[1], self.pixels[0], 3), np.uint8)
+                state = spaces.Dict({"state": state, "pixels": frame})
+            self.observation_space = state
+
+    def reset(self, seed=None, options=None):
+        """Start a new episode; without a seed, the next one is drawn from the last seed given.
+
+        ``options={"snapshot": blob}`` resumes the game saved by ``snapshot()``
+        instead, random state included, so it plays on exactly as it did;
+        passing a seed as well reseeds it so episodes branch from that point.
+        """
+        snapshot = (options or {}).get("snapshot")
+        if snapshot is not None:
+            savestate.restore(self.session, snapshot)
+            if seed is not None:
+                self.seeds.seed(seed)
+                self.session.rng.seed(seed)
+        else:
+            if seed is not None:
+                self.seeds.seed(seed)
+            else:
+                seed = self.seeds.getrandbits(31)
+            self.session = Session(*self.size, balance=self.balance, seed=seed, effects=self.pixels is not None)
+            self.session.start_level1()
+            if self.level == LEVEL2:
+                self.session.start_level2()
+        self.steps = 0
+        self.episode_reward = 0.0
+        return self.observation(), self.info()
+
+    def step(self, action):
+        session = self.session
+        inputs = self.actions[int(action)]
+        score, lives = session.score, session.lives
+        for _ in range(self.frame_skip):
+            session.step(**inputs)
+            if session.state != self.level:
+                break
+        session.sfx.clear()
+        self.steps += 1
+        reward = float(session.score - score) - self.life_penalty * max(0, lives - session.lives)
+        self.episode_reward += reward
+        terminated = session.state != self.level
+        truncated = not terminated and self.steps >= self.max_steps
+        info = self.info()
+        if terminated or truncated:
+            info["episode"] = {
+                "reward": self.episode_reward,
+                "steps": self.steps,
+                "score": session.score,
+                "distance": session.runner_distance,
+                "stats": dict(session.stats),
+            }
+            if self.level == LEVEL1:
+                info["episode"]["won"] = info["won"]
+        return self.observation(), reward, terminated, truncated, info
+
+    def snapshot(self):
+        """The game as it is now, for ``reset(options={"snapshot": ...})``."""
+        return savestate.dump(self.session)
+
+    def info(self):
+        session = self.session
+        info = {"score": session.score, "lives": session.lives}
+        if self.level == LEVEL1:
+            info["won"] = session.state == LEVEL2
+        else:
+            info["distance"] = session.runner_distance
+        return info
+
+    def observation(self):
+        state = self.observe()
+        if self.pixels is None:
+            return state
+        return {"state": state, "pixels": self.render(self.pixels)}
+
+    def observe(self, out=None):
+        """Write the state vector into ``out`` (a new float32 array if None) and return it."""
+        if out is None:
+            out = np.zeros(self.observation_size, np.float32)
+        else:
+            out[:] = 0
+        if self.level == LEVEL1:
+            self._observe_level1(out)
+        else:
+            self._observe_level2(out)
+        return out
+
+    def _observe_level1(self, out):
+        s, b = self.session, self.balance
+        w, h = s.width, s.height
+        out[:4] = (
+            s.basket.centerx / w,
+            s.lives / b.lives_start,
+            s.score / max(1, b.level1_goal),
+            s.difficulty.fall_speed(s.score) / 20,
+        )
+        falling = sorted(s.mushrooms, key=lambda m: -m["rect"].y)[:b.level1_max_concurrent]
+        slots = out[len(LEVEL1_FIELDS):].reshape(-1, len(MUSHROOM_FIELDS))
+        for row, m in zip(slots, falling):
+            rect = m["rect"]
+            row[:] = (1, (rect.centerx - s.basket.centerx) / w, rect.bottom / h, m["kind"] == "gold")
+
+    def _observe_level2(self, out):
+        s, b = self.session, self.balance
+        w, h = s.width, s.height
+        player = s.player
+        out[:7] = (
+            (s.ground_y - player.bottom) / h,
+            s.player_vy / 20,
+            s.on_ground,
+            s.dash_cd / b.dash_cooldown_frames,
+            s.shield_timer / b.shield_duration_frames,
+            s.lives / b.lives_start,
+            s.runner_speed / b.max_runner_speed,
+        )
+        start = len(LEVEL2_FIELDS)
+        end = start + b.monster_max_concurrent * len(MONSTER_FIELDS)
+        monsters = sorted((m for m in s.monsters if m["rect"].right >= player.left), key=lambda m: m["rect"].x)
+        for row, m in zip(out[start:end].reshape(-1, len(MONSTER_FIELDS)), monsters):
+            rect = m["rect"]
+            row[:] = (
+                1,
+                (rect.left - player.right) / w,
+                (rect.centery - player.centery) / h,
+                rect.width / w,
+                rect.height / h,
+                m["vx"] / b.max_runner_speed,
+            )
+        for rects in (s.hearts, s.shields):
+            start, end = end, end + POWERUP_SLOTS * len(POWERUP_FIELDS)
+            for row, rect in zip(out[start:end].reshape(-1, len(POWERUP_FIELDS)), ahead(rects, player, POWERUP_SLOTS)):
+                row[:] = (1, (rect.left - player.right) / w, (rect.centery - player.centery) / h)
+
+    def render(self, size=None):
+        """The frame as the player sees it, as a uint8 (height, width, 3) array, optionally scaled."""
+        import pygame
+
+        from .main import draw_frame
+
+        renderer, assets = frame_target(self.size)
+        draw_frame(renderer.surface, renderer, self.session, assets)
+        frame = renderer.surface
+        if size is not None and tuple(size) != self.size:
+            frame = pygame.transform.smoothscale(frame, size)
+        return pygame.surfarray.array3d(frame).transpose(1, 0, 2)
+
+    def close(self):
+        pass
+
+
+class VectorEnv:
+    """``count`` games stepped in lockstep in this process, reset automatically when one ends.
+
+    Observations are stacked along a first axis of length ``count``. When a
+    game ends, its info carries ``final_observation`` and ``episode`` and the
+    returned observation is already the first of its next episode.
+    """
+
+    def __init__(self, count, **env_kwargs):
+        self.envs = [ShroomEnv(**env_kwargs) for _ in range(count)]
+        self.count = count
+        first = self.envs[0]
+        self.observation_size = first.observation_size
+        self.pixels = first.pixels
+        if spaces is not None:
+            self.single_action_space = first.action_space
+            self.single_observation_space = first.observation_space
+
+    def _stack(self, observations):
+        if self.pixels is None:
+            return np.stack(observations)
+        return {key: np.stack([obs[key] for obs in observations]) for key in ("state", "pixels")}
+
+    def reset(self, seed=None, options=None):
+        """Reset every game; game ``i`` is seeded with ``seed + i``."""
+        results = [env.reset(None if seed is None else seed + i, options) for i, env in enumerate(self.envs)]
+        return self._stack([obs for obs, _ in results]), [info for _, info in results]
+
+    def step(self, actions):
+        rewards = np.zeros(self.count, np.float32)
+        terminated = np.zeros(self.count, bool)
+        truncated = np.zeros(self.count, bool)
+        observations, infos = [], []
+        for i, (env, action) in enumerate(zip(self.envs, actions)):
+            obs, rewards[i], terminated[i], truncated[i], info = env.step(action)
+            if terminated[i] or truncated[i]:
+                info["final_observation"] = obs
+                obs, _ = env.reset()
+            observations.append(obs)
+            infos.append(info)
+        return self._stack(observations), rewards, terminated, truncated, infos
+
+    def close(self):
+        for env in self.envs:
+            env.close()
+
+
+def _worker(conn, count, env_kwargs):
+    """Serve one ``VectorEnv`` over ``conn`` until told to close."""
+    envs = VectorEnv(count, **env_kwargs)
+    try:
+        while True:
+            command, arg = conn.recv()
+            if command == "step":
+                conn.send(envs.step(arg))
+            elif command == "reset":
+                conn.send(envs.reset(*arg))
+            else:
+                break
+    except (EOFError, KeyboardInterrupt):
+        pass
+    finally:
+        envs.close()
+        conn.close()
+
+
+class SubprocessVectorEnv:
+    """``count`` games split over ``workers`` processes, each stepping its share in lockstep.
+
+    Same interface as ``VectorEnv``. Each worker steps a whole slice of games
+    per message, so pipe traffic is two messages per worker per step.
+    """
+
+    def __init__(self, count, workers=None, **env_kwargs):
+        import multiprocessing
+
+        workers = max(1, min(count, workers or os.cpu_count() or 1))
+        shares = [count // workers + (i < count % workers) for i in range(workers)]
+        self.count = count
+        self.bounds = np.cumsum([0] + shares)
+        self.conns = []
+        self.processes = []
+        for share in shares:
+            parent, child = multiprocessing.Pipe()
+            process = multiprocessing.Process(target=_worker, args=(child, share, env_kwargs), daemon=True)
+            process.start()
+            child.close()
+            self.conns.append(parent)
+            self.processes.append(process)
+        probe = ShroomEnv(**env_kwargs)
+        self.observation_size = probe.observation_size
+        self.pixels = probe.pixels
+        if spaces is not None:
+            self.single_action_space = probe.action_space
+            self.single_observation_space = probe.observation_space
+
+    def _gather(self):
+        results = [conn.recv() for conn in self.conns]
+        return [list(part) for part in zip(*results)]
+
+    def _concat(self, parts):
+        if self.pixels is None:
+            return np.concatenate(parts)
+        return {key: np.concatenate([part[key] for part in parts]) for key in ("state", "pixels")}
+
+    def reset(self, seed=None, options=None):
+        for conn, start in zip(self.conns, self.bounds):
+            conn.send(("reset", (None if seed is None else seed + int(start), options)))
+        observations, infos = self._gather()
+        return self._concat(observations), [info for part in infos for info in part]
+
+    def step(self, actions):
+        actions = np.asarray(actions)
+        for conn, start, end in zip(self.conns, self.bounds, self.bounds[1:]):
+            conn.send(("step", actions[start:end]))
+        observations, rewards, terminated, truncated, infos = self._gather()
+        return (
+            self._concat(observations),
+            np.concatenate(rewards),
+            np.concatenate(terminated),
+            np.concatenate(truncated),
+            [info for part in infos for info in part],
+        )
+
+    def close(self):
+        for conn in self.conns:
+            try:
+                conn.send(("close", None))
+            except (BrokenPipeError, OSError):
+                pass
+            conn.close()
+        for process in self.processes:
+            process.join(timeout=5)
+
+
+def scripted_actions(level, states, rng):
+    """A simple bot over a batch of state vectors: chase the lowest mushroom, or jump monsters.
+
+    Level 2 jumps when the nearest monster is close ahead and dashes over
+    big ones; a small random share of actions keeps the runs varied.
+    """
+    count = len(states)
+    if level == LEVEL1:
+        dx = states[:, len(LEVEL1_FIELDS) + 1]
+        actions = np.where(dx < -0.02, 1, np.where(dx > 0.02, 2, 0))
+    else:
+        first = states[:, len(LEVEL2_FIELDS):len(LEVEL2_FIELDS) + len(MONSTER_FIELDS)]
+        present, dx, _, _, height, _ = first.T
+        speed = states[:, LEVEL2_FIELDS.index("runner_speed")]
+        close = (present > 0) & (dx < 0.04 + 0.06 * speed) & (dx > -0.05)
+        big = height > 0.09
+        actions = np.where(close, np.where(big & (states[:, LEVEL2_FIELDS.index("dash_cd")] == 0), 2, 1), 0)
+    noise = rng.random(count) < 0.05
+    actions[noise] = rng.integers(0, 3, int(noise.sum()))
+    return actions
+
+
+def main(argv=None):
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(prog="python -m mushroom_game.env", description=__doc__.split("\n\n")[0])
+    parser.add_argument("--level", type=int, choices=(1, 2), default=2, help="1 = basket catch, 2 = runner (default)")
+    parser.add_argument("--envs", type=int, default=16, help="games stepped in lockstep (default 16)")
+    parser.add_argument("--workers", type=int, default=0, help="worker processes (default 0: step in this process)")
+    parser.add_argument("--steps", type=int, default=100_000, help="total env steps across all games (default 100000)")
+    parser.add_argument("--policy", choices=("scripted", "random"), default="scripted")
+    parser.add_argument("--frame-skip", type=int, default=1, help="frames each action is held for")
+    parser.add_argument("--pixels", help="also render WxH pixel observations, e.g. 84x84")
+    parser.add_argument("--config", help="balance config file (defaults are used otherwise)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    from .config import load_config
+
+    level = LEVEL1 if args.level == 1 else LEVEL2
+    kwargs = {
+        "level": level,
+        "balance": load_config(args.config) if args.config else None,
+        "frame_skip": args.frame_skip,
+        "pixels": tuple(int(n) for n in args.pixels.lower().split("x")) if args.pixels else None,
+    }
+    if args.workers:
+        envs = SubprocessVectorEnv(args.envs, args.workers, **kwargs)
+    else:
+        envs = VectorEnv(args.envs, **kwargs)
+    rng = np.random.default_rng(args.seed)
+    obs, _ = envs.reset(seed=args.seed)
+    episodes = []
+    started = time.perf_counter()
+    for _ in range(max(1, args.steps // args.envs)):
+        states = obs["state"] if isinstance(obs, dict) else obs
+        if args.policy == "random":
+            actions = rng.integers(0, 3, args.envs)
+        else:
+            actions = scripted_actions(level, states, rng)
+        obs, _, _, _, infos = envs.step(actions)
+        episodes.extend(info["episode"] for info in infos if "episode" in info)
+    elapsed = time.perf_counter() - started
+    envs.close()
+
+    steps = max(1, args.steps // args.envs) * args.envs
+    print(f"{steps} steps in {elapsed:.1f}s: {steps / elapsed:,.0f} steps/s, {steps / elapsed * 3600 / 1e6:.1f}M steps/hour")
+    if not episodes:
+        print("no episode finished")
+        return 0
+    scores = np.array([e["score"] for e in episodes])
+    lengths = np.array([e["steps"] for e in episodes])
+    print(f"{len(episodes)} episodes: score mean {scores.mean():.1f}, median {np.median(scores):.0f}, "
+          f"p90 {np.percentile(scores, 90):.0f}, max {scores.max()}; length mean {lengths.mean() / FPS * args.frame_skip:.1f}s")
+    if level == LEVEL1:
+        print(f"goal reached in {sum(e['won'] for e in episodes)} of {len(episodes)} episodes")
+    totals = {}
+    for e in episodes:
+        for key, value in e["stats"].items():
+            totals[key] = totals.get(key, 0) + value
+    print("per episode: " + ", ".join(f"{key} {value / len(episodes):.2f}" for key, value in sorted(totals.items())))
+    return 0
+
+
+if __name__ == "__main__":
+    import sys
+
+    sys.exit(main())
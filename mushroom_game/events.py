@@ -0,0 +1,110 @@
+"""Typed gameplay events and the bus that hands them from the simulation to its consumers.
+
+Gameplay code says what happened (``MushroomCaught``, ``PlayerHit``,
+``ShieldAbsorb``...) with ``EventBus.emit`` and carries on with its
+collision loop. After the step, ``EventBus.dispatch`` delivers the frame's
+events in order to the handlers subscribed to each type: the session's
+sounds, run stats, screen flashes and particle bursts (see ``Session``).
+Handlers are looked up by exact type, and an event no one subscribed to is
+never queued, so a headless session that subscribes no effects pays only
+for building the event.
+
+Events from local multiplayer have no position (``x``/``y`` are None) and
+may stand for several players at once (``count``); squad viewports show
+their own feedback.
+"""
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True, slots=True)
+class MushroomCaught:
+    x: int
+    y: int
+
+
+@dataclass(frozen=True, slots=True)
+class StormCaught:
+    rows: object  # (x, y, kind) rows of the storm mushrooms caught this step
+
+
+@dataclass(frozen=True, slots=True)
+class MushroomMissed:
+    x: float
+    y: int
+
+
+@dataclass(frozen=True, slots=True)
+class Jumped:
+    count: int = 1
+
+
+@dataclass(frozen=True, slots=True)
+class Dashed:
+    x: int = None
+    y: int = None
+    count: int = 1
+
+
+@dataclass(frozen=True, slots=True)
+class Landed:
+    x: int
+    y: int
+    speed: float
+
+
+@dataclass(frozen=True, slots=True)
+class PlayerHit:
+    x: int = None
+    y: int = None
+    count: int = 1
+
+
+@dataclass(frozen=True, slots=True)
+class ShieldAbsorb:
+    x: int = None
+    y: int = None
+    count: int = 1
+
+
+@dataclass(frozen=True, slots=True)
+class HeartPickup:
+    x: int = None
+    y: int = None
+
+
+@dataclass(frozen=True, slots=True)
+class ShieldPickup:
+    x: int = None
+    y: int = None
+
+
+@dataclass(frozen=True, slots=True)
+class RunLost:
+    """The runner (or the whole squad) is out of lives."""
+
+
+class EventBus:
+    """Events queued during a step and the handlers they go to once it is done."""
+
+    def __init__(self):
+        self.handlers = {}
+        self.queue = []
+
+    def subscribe(self, kind, handler):
+        """Call ``handler(event)`` for every dispatched event of type ``kind``, after earlier subscribers."""
+        self.handlers.setdefault(kind, []).append(handler)
+
+    def emit(self, event):
+        if type(event) in self.handlers:
+            self.queue.append(event)
+
+    def dispatch(self):
+        """Deliver the queued events, oldest first; events emitted by handlers go out in the same pass."""
+        queue = self.queue
+        i = 0
+        while i < len(queue):
+            event = queue[i]
+            for handler in self.handlers[type(event)]:
+                handler(event)
+            i += 1
+        queue.clear()
@@ -0,0 +1,155 @@
+"""Compact recorded Level 2 runs, replayed as a ghost runner.
+
+The runner only moves vertically, so a run is fully described by the
+player's height above the ground and the jump/dash inputs of each frame.
+Every frame is stored as one varint holding the zigzag-encoded height delta
+shifted left by two, with the event bits in the low bits. While running or
+standing on the ground the delta is zero, so most frames take one byte and
+a 10-minute run (36,000 frames) stays well under 40 KB before zlib.
+
+Every ``KEYFRAME_INTERVAL`` frames the absolute height and the byte offset
+are kept in a keyframe table, so ``seek()`` to any frame decodes at most one
+interval. Sequential playback decodes one varint per frame.
+"""
+import struct
+import zlib
+from array import array
+
+from .userdata import data_path, make_parent
+
+GHOST_FILE = data_path("best_run.ghost")
+MAGIC = b"SHG1"
+HEADER = struct.Struct("<IHii")  # frames, keyframe interval, score, distance
+KEYFRAME_INTERVAL = 64
+EVENT_JUMP = 1
+EVENT_DASH = 2
+CONTINUATION_BYTES = bytes(range(0x80, 0x100))  # Varint bytes that another byte follows
+
+
+def _zigzag(n):
+    return (n << 1) ^ (n >> 31)
+
+
+def _unzigzag(n):
+    return (n >> 1) ^ -(n & 1)
+
+
+class GhostRecorder:
+    """Appends one frame per Level 2 step."""
+
+    def __init__(self):
+        self.data = bytearray()
+        self.offsets = array("I")
+        self.heights = array("i")
+        self.frames = 0
+        self._last = 0
+
+    def record(self, height, events=0):
+        if self.frames % KEYFRAME_INTERVAL == 0:
+            self.offsets.append(len(self.data))
+            self.heights.append(height)
+            self._last = height
+        value = (_zigzag(height - self._last) << 2) | events
+        while value >= 0x80:
+            self.data.append((value & 0x7F) | 0x80)
+            value >>= 7
+        self.data.append(value)
+        self._last = height
+        self.frames += 1
+
+    def to_bytes(self, score=0, distance=0):
+        body = (
+            HEADER.pack(self.frames, KEYFRAME_INTERVAL, score, int(distance))
+            + self.offsets.tobytes()
+            + self.heights.tobytes()
+            + bytes(self.data)
+        )
+        return MAGIC + zlib.compress(body, 9)
+
+
+class GhostTrack:
+    """A decoded recording with a playback cursor."""
+
+    def __init__(self, blob):
+        if blob[:4] != MAGIC:
+            raise ValueError("not a ghost recording")
+        body = zlib.decompress(blob[4:])
+        self.frames, self.interval, self.score, self.distance = HEADER.unpack_from(body)
+        if self.interval == 0:
+            raise ValueError("ghost recording has no keyframe interval")
+        keyframes = -(-self.frames // self.interval)
+        pos = HEADER.size
+        if len(body) < pos + 8 * keyframes:
+            raise ValueError("ghost recording is shorter than its header says")
+        self.offsets = array("I", body[pos:pos + 4 * keyframes])
+        pos += 4 * keyframes
+        self.heights = array("i", body[pos:pos + 4 * keyframes])
+        self.data = body[pos + 4 * keyframes:]
+        self._check()
+        self.seek(0)
+
+    def _check(self):
+        """Raise ValueError unless playback and seeks stay inside the data.
+
+        Each keyframe's stretch must hold exactly its frames' varints (one
+        byte without the continuation bit ends each), so ``next()`` never
+        reads past the end however the file was damaged.
+        """
+        bounds = [*self.offsets, len(self.data)]
+        if bounds[0] != 0 or self.data[-1:] >= b"\x80":
+            raise ValueError("ghost recording data is cut short")
+        for key in range(len(self.offsets)):
+            start, end = bounds[key], bounds[key + 1]
+            frames = min(self.interval, self.frames - key * self.interval)
+            if end < start or len(self.data[start:end].translate(None, CONTINUATION_BYTES)) != frames:
+                raise ValueError(f"ghost recording keyframe {key} doesn't match its frames")
+
+    def seek(self, frame):
+        """Position the cursor so the next ``next()`` returns ``frame``."""
+        frame = max(0, min(frame, self.frames))
+        key = min(frame // self.interval, len(self.offsets) - 1) if self.offsets else 0
+        self.frame = key * self.interval
+        self._pos = self.offsets[key] if self.offsets else 0
+        self._height = 0
+        while self.frame < frame:
+            self.next()
+
+    def next(self):
+        """Return ``(height, events)`` for the current frame and advance, or None past the end."""
+        if self.frame >= self.frames:
+            return None
+        if self.frame % self.interval == 0:
+            self._height = self.heights[self.frame // self.interval]
+        data, pos = self.data, self._pos
+        value = shift = 0
+        while True:
+            byte = data[pos]
+            pos += 1
+            value |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                break
+            shift += 7
+        self._pos = pos
+        self._height += _unzigzag(value >> 2)
+        self.frame += 1
+        return self._height, value & 3
+
+
+def load_ghost(path=GHOST_FILE):
+    try:
+        with open(path, "rb") as f:
+            return GhostTrack(f.read())
+    except (OSError, ValueError, zlib.error, struct.error):
+        return None
+
+
+def save_ghost(recorder, score, distance, path=GHOST_FILE):
+    """Write the recording; returns its track, or None if it couldn't be saved."""
+    blob = recorder.to_bytes(score, distance)
+    try:
+        make_parent(path)
+        with open(path, "wb") as f:
+            f.write(blob)
+    except OSError:
+        return None
+    return GhostTrack(blob)
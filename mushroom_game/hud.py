@@ -0,0 +1,441 @@
+"""HUD widgets and the per-scene HUD layouts."""
+from functools import lru_cache
+
+import pygame
+
+from .layout import Box, compute_layout, hud_scale
+from .render import (
+    draw_button,
+    draw_glass_panel,
+    draw_text,
+    draw_text_shadow,
+    draw_vertical_gradient,
+    get_bolt_icon,
+    get_font,
+    get_glow_sprite,
+    get_icon_sprite,
+)
+from .sim import FPS, LEVEL2, WIN
+
+
+UI_COLORS = {
+    "panel": (34, 52, 96),
+    "panel_alt": (60, 36, 72),
+    "accent": (130, 190, 255),
+    "accent_alt": (255, 180, 120),
+    "danger": (255, 120, 150),
+    "success": (130, 220, 190),
+    "bg_top": (14, 20, 34),
+    "bg_bottom": (4, 8, 18),
+}
+
+
+def draw_health_bar(surf, x, y, w, h, value, max_value, color=(255,60,60)):
+    pygame.draw.rect(surf, (20, 28, 44), (x, y, w, h), border_radius=6)
+    fill_ratio = (value / max_value) if max_value > 0 else 0
+    fill_w = int(max(0.0, min(1.0, fill_ratio)) * w)
+    if fill_w > 0:
+        fill = pygame.Surface((fill_w, h), pygame.SRCALPHA)
+        draw_vertical_gradient(fill, (255, 150, 170, 230), (200, 70, 110, 230))
+        surf.blit(fill, (x, y))
+        highlight_h = max(2, h // 2)
+        if fill_w > 4:
+            pygame.draw.rect(surf, (255, 255, 255, 40), (x + 2, y + 2, fill_w - 4, highlight_h), border_radius=4)
+    pygame.draw.rect(surf, (255, 200, 220), (x, y, w, h), 2, border_radius=6)
+
+
+def draw_shield_bar(surf, x, y, w, h, value, max_value):
+    pygame.draw.rect(surf, (18, 26, 40), (x, y, w, h), border_radius=6)
+    fill_ratio = (value / max_value) if max_value > 0 else 0
+    fill_w = int(max(0.0, min(1.0, fill_ratio)) * w)
+    if fill_w > 0:
+        fill = pygame.Surface((fill_w, h), pygame.SRCALPHA)
+        draw_vertical_gradient(fill, (140, 210, 255, 230), (60, 140, 230, 230))
+        surf.blit(fill, (x, y))
+        highlight_h = max(2, h // 2)
+        if fill_w > 4:
+            pygame.draw.rect(surf, (255, 255, 255, 40), (x + 2, y + 2, fill_w - 4, highlight_h), border_radius=4)
+    pygame.draw.rect(surf, (150, 210, 255), (x, y, w, h), 2, border_radius=6)
+
+
+def draw_dash_bar(surf, x, y, w, h, value, max_value, label_size=16):
+    pygame.draw.rect(surf, (18, 26, 40), (x, y, w, h), border_radius=6)
+    if max_value > 0:
+        fill_ratio = max(0.0, min(1.0, value / max_value))
+    else:
+        fill_ratio = 0.0
+    fill_w = int(fill_ratio * w)
+    if value > 0 and fill_w > 0:
+        base = pygame.Surface((fill_w, h), pygame.SRCALPHA)
+        draw_vertical_gradient(base, (120, 160, 255, 220), (40, 80, 210, 220))
+        surf.blit(base, (x, y))
+        highlight_h = max(2, h // 2)
+        if fill_w > 4:
+            pygame.draw.rect(surf, (255, 255, 255, 40), (x + 2, y + 2, fill_w - 4, highlight_h), border_radius=4)
+    elif value <= 0:
+        ready_surface = pygame.Surface((w, h), pygame.SRCALPHA)
+        draw_vertical_gradient(ready_surface, (110, 220, 160, 220), (70, 180, 130, 220))
+        surf.blit(ready_surface, (x, y))
+        highlight_h = max(2, h // 2)
+        pygame.draw.rect(surf, (255, 255, 255, 40), (x + 2, y + 2, w - 4, highlight_h), border_radius=4)
+    pygame.draw.rect(surf, (170, 200, 255), (x, y, w, h), 2, border_radius=6)
+    if value <= 0:
+        font = get_font(label_size)
+        txt = font.render("READY", True, (230, 255, 240))
+        surf.blit(txt, txt.get_rect(center=(x + w//2, y + h//2)))
+
+
+def draw_status_panel(surf, rect, lives, lives_max, shield_timer, shield_max, dash_cd, dash_max, heart_icon, layout):
+    px = layout.px
+    panel_rect = pygame.Rect(rect)
+    draw_glass_panel(surf, panel_rect, base_color=UI_COLORS["panel"], border_color=UI_COLORS["accent"], radius=px(26))
+
+    label_font = layout.font(16)
+    value_font = layout.font(20)
+    icon_size = px(26)
+    icon_x = panel_rect.x + px(24)
+    label_x = panel_rect.x + px(66)
+    bar_x = panel_rect.x + px(66)
+    bar_w = panel_rect.width - px(110)
+    bar_h = px(16)
+    row_y = panel_rect.y + px(32)
+
+    if heart_icon:
+        surf.blit(scaled_icon(heart_icon, icon_size), (icon_x, row_y - px(10)))
+    surf.blit(label_font.render("HEALTH", True, (255, 210, 220)), (label_x, row_y - px(10)))
+    value_text = value_font.render(f"{lives}/{lives_max}", True, (255, 245, 250))
+    surf.blit(value_text, (panel_rect.right - value_text.get_width() - px(24), row_y - px(10)))
+    draw_health_bar(surf, bar_x, row_y + px(12), bar_w, bar_h, lives, lives_max)
+
+    row_y += px(60)
+    shield_center = (icon_x + px(12), row_y)
+    pygame.draw.circle(surf, (140, 200, 255), shield_center, px(12), px(2))
+    surf.blit(label_font.render("SHIELD", True, (210, 230, 255)), (label_x, row_y - px(10)))
+    shield_seconds = max(0, shield_timer // FPS)
+    shield_text = value_font.render(f"{shield_seconds}s", True, (210, 235, 255))
+    surf.blit(shield_text, (panel_rect.right - shield_text.get_width() - px(24), row_y - px(10)))
+    draw_shield_bar(surf, bar_x, row_y + px(12), bar_w, bar_h, shield_timer, shield_max)
+
+    row_y += px(60)
+    surf.blit(get_bolt_icon(icon_size), (icon_x, row_y - px(12)))
+    dash_label = "DASH READY" if dash_cd <= 0 else "DASH"
+    dash_color = (200, 240, 200) if dash_cd <= 0 else (255, 235, 200)
+    surf.blit(label_font.render(dash_label, True, dash_color), (label_x, row_y - px(10)))
+    dash_value = "Ready" if dash_cd <= 0 else f"{max(0, dash_cd // FPS)}s"
+    dash_text = value_font.render(dash_value, True, (235, 245, 255))
+    surf.blit(dash_text, (panel_rect.right - dash_text.get_width() - px(24), row_y - px(10)))
+    draw_dash_bar(surf, bar_x, row_y + px(12), bar_w, bar_h, dash_cd, dash_max, label_size=px(16))
+
+
+def draw_metrics_strip(surf, rect, distance, score, speed, layout):
+    px = layout.px
+    draw_glass_panel(surf, rect, base_color=UI_COLORS["panel"], border_color=UI_COLORS["accent"], radius=px(28))
+    label = layout.font(16).render("ENDLESS RUN • STATUS", True, (190, 210, 250))
+    surf.blit(label, (rect.x + px(22), rect.y + px(10)))
+    text = f"Distance {int(distance):,}    •    Score {score}    •    Speed {speed:.1f}"
+    info = layout.font(22).render(text, True, (240, 245, 255))
+    surf.blit(info, (rect.x + px(22), rect.y + px(32)))
+
+
+def draw_controls_pill(surf, text, rect, layout):
+    draw_glass_panel(surf, rect, base_color=(26, 36, 64), border_color=UI_COLORS["accent"], radius=layout.px(26))
+    txt = layout.font(20).render(text, True, (225, 232, 242))
+    surf.blit(txt, txt.get_rect(center=rect.center))
+
+
+def draw_score_pill(surf, score, rect, layout):
+    px = layout.px
+    draw_glass_panel(surf, rect, base_color=UI_COLORS["panel"], border_color=UI_COLORS["accent"], radius=px(22))
+    label = layout.font(16).render("SCORE", True, (190, 208, 250))
+    value = layout.font(34).render(f"{score}", True, (255, 255, 255))
+    surf.blit(label, (rect.x + px(20), rect.y + px(16)))
+    pygame.draw.line(surf, (180, 200, 255), (rect.x + px(20), rect.y + px(30)), (rect.right - px(20), rect.y + px(30)), px(1))
+    surf.blit(value, (rect.x + px(20), rect.y + px(34)))
+
+
+def draw_goal_progress_pill(surf, rect, collected, goal, layout):
+    px = layout.px
+    draw_glass_panel(surf, rect, base_color=UI_COLORS["panel"], border_color=UI_COLORS["accent"], radius=px(24))
+    ratio = 0 if goal <= 0 else max(0.0, min(1.0, collected / goal))
+
+    header = layout.font(16).render("LEVEL 1 GOAL", True, (200, 220, 255))
+    surf.blit(header, (rect.x + px(20), rect.y + px(16)))
+    description = layout.font(18).render("Catch glowing mushrooms to unlock the run", True, (225, 235, 255))
+    surf.blit(description, (rect.x + px(20), rect.y + px(46)))
+    value_text = layout.font(32).render(f"{collected}/{goal}", True, (255, 255, 255))
+    surf.blit(value_text, (rect.right - value_text.get_width() - px(20), rect.y + px(18)))
+
+    bar_rect = pygame.Rect(rect.x + px(20), rect.bottom - px(32), rect.width - px(40), px(16))
+    pygame.draw.rect(surf, (18, 26, 44), bar_rect, border_radius=px(8))
+    fill_w = int(bar_rect.width * ratio)
+    if fill_w > 0:
+        fill = pygame.Surface((fill_w, bar_rect.height), pygame.SRCALPHA)
+        draw_vertical_gradient(fill, (130, 230, 200, 230), (70, 200, 160, 230))
+        surf.blit(fill, (bar_rect.x, bar_rect.y))
+        highlight_h = max(2, bar_rect.height // 2)
+        if fill_w > 4:
+            pygame.draw.rect(
+                surf,
+                (255, 255, 255, 50),
+                (bar_rect.x + 2, bar_rect.y + 2, fill_w - 4, highlight_h),
+                border_radius=px(6),
+            )
+    pygame.draw.rect(surf, (150, 230, 200), bar_rect, px(2), border_radius=px(8))
+
+
+def draw_lives_panel(surf, lives, heart_icon, rect, layout):
+    px = layout.px
+    draw_glass_panel(surf, rect, base_color=UI_COLORS["panel_alt"], border_color=UI_COLORS["danger"], radius=px(24))
+    label = layout.font(16).render("LIVES", True, (255, 205, 220))
+    value = layout.font(32).render(str(lives), True, (255, 240, 245))
+    surf.blit(label, (rect.x + px(20), rect.y + px(16)))
+    surf.blit(value, (rect.right - value.get_width() - px(24), rect.y + px(18)))
+
+    icon_size = px(24)
+    gap = px(12)
+    icons_to_show = min(lives, 6)
+    base_y = rect.bottom - icon_size - px(18)
+    for i in range(icons_to_show):
+        ix = rect.x + px(20) + i * (icon_size + gap)
+        surf.blit(get_glow_sprite(icon_size + gap, (255, 120, 160), 80), (ix - gap // 2, base_y - gap // 2))
+        if heart_icon:
+            surf.blit(scaled_icon(heart_icon, icon_size), (ix, base_y))
+        else:
+            pygame.draw.circle(
+                surf,
+                UI_COLORS["danger"],
+                (ix + icon_size // 2, base_y + icon_size // 2),
+                icon_size // 2,
+            )
+
+
+def draw_lives_hearts(surf, lives, x, y, heart_icon=None):
+    spacing = 34
+    max_icons = min(lives, 8)
+    for i in range(max_icons):
+        px = x + i * spacing
+        py = y
+        icon_rect = pygame.Rect(px, py, 28, 28)
+        if heart_icon:
+            surf.blit(heart_icon, icon_rect)
+        else:
+            pygame.draw.circle(surf, (255,100,150), (px+14, py+14), 14)
+    draw_text_shadow(surf, f"x{lives}", 20, x + max_icons * spacing + 20, y + 14, (255,255,255))
+
+
+def scaled_icon(icon, size):
+    return icon if icon.get_size() == (size, size) else get_icon_sprite(icon, (size, size))
+
+
+# Menu controls pill widths for 3, 4, 5 and 6+ entries
+MENU_PILL_WIDTHS = (760, 920, 1160, 1360)
+MAX_SQUAD = 4
+
+# Widget boxes per HUD, in 1080p design pixels (see ``layout.Box``). Text
+# positions are empty boxes: their center is where the text is centered.
+HUD_LAYOUTS = {
+    "menu": {
+        "title": Box("center", 0, -140),
+        "highscore": Box("center", 0, -70),
+        "start": Box("center", 0, 85, 300, 70),
+        **{f"controls{i}": Box("midbottom", 0, -8, w, 52, max_w=-60) for i, w in enumerate(MENU_PILL_WIDTHS)},
+    },
+    "level1": {
+        "score": Box("topleft", 30, 24, 220, 74),
+        "goal": Box("topright", -24, 24, 0.22, 60, min_w=280, max_w=400),
+        "lives": Box("topleft", 30, 80, 280, 96),
+        "controls": Box("midbottom", 0, -8, 720, 52),
+    },
+    "level2": {
+        "status": Box("topright", -30, 24, 380, 190),
+        "metrics": Box("topleft", 30, 24, 520, 66, min_w=360, max_w=-60),
+        "ghost": Box("midtop", 0, 40),
+        "controls": Box("midbottom", 0, -8, 720, 52, max_w=-120),
+    },
+    "pause": {
+        "panel": Box("center", 0, -30, 480, 220),
+        "title": Box("midtop", 0, 90, parent="panel"),
+        "resume": Box("midtop", 0, 150, parent="panel"),
+        "quit": Box("midtop", 0, 190, parent="panel"),
+    },
+    "end": {
+        "title": Box("center", 0, -100),
+        "score": Box("center", 0, -20),
+        "highscore": Box("center", 0, 20),
+        "prompt": Box("center", 0, 80),
+    },
+    # Laid out per player viewport
+    "player_card": {
+        "card": Box("topleft", 16, 14, 300, 112),
+    },
+    "squad_end": {
+        **{f"highscore{n}": Box("center", 0, 110 + 23 * n) for n in range(2, MAX_SQUAD + 1)},
+        **{f"prompt{n}": Box("center", 0, 150 + 23 * n) for n in range(2, MAX_SQUAD + 1)},
+    },
+    # Laid out on the surface the standings are centred on
+    "standings": {
+        f"panel{n}": Box("center", 0, 0, 520, 120 + 46 * n, max_w=-40) for n in range(2, MAX_SQUAD + 1)
+    },
+}
+
+
+@lru_cache(maxsize=32)
+def get_hud_layout(name, size, scale=1.0):
+    """Cached ``Layout`` of ``HUD_LAYOUTS[name]`` for a surface of ``size`` at UI ``scale``."""
+    return compute_layout(HUD_LAYOUTS[name], size, scale)
+
+
+def hud_layout(name, surf, ui_scale=1.0):
+    size = surf.get_size()
+    return get_hud_layout(name, size, hud_scale(size, ui_scale))
+
+
+def get_menu_layout(width, height, ui_scale=1.0):
+    return get_hud_layout("menu", (width, height), hud_scale((width, height), ui_scale))
+
+
+def draw_menu_hud(surf, session, storm_enabled=False, ui_scale=1.0):
+    layout = hud_layout("menu", surf, ui_scale)
+    draw_text_shadow(surf, "Shroom Hunter", layout.px(72), *layout["title"].center)
+    draw_text(surf, f"High Score: {session.highscore}", layout.px(26), *layout["highscore"].center, (200,255,200))
+    start_rect = layout["start"]
+    hovered = start_rect.collidepoint(pygame.mouse.get_pos())
+    draw_button(surf, start_rect, "Start", hovered, text_size=layout.px(30))
+    controls = ["[ENTER] or click START"]
+    if session.saved_run:
+        controls.append("[R] Resume run")
+    if storm_enabled:
+        controls.append("[S] Storm")
+    if session.best_ghost is not None:
+        controls.append("[G] Ghost race")
+    if storm_enabled:
+        controls.append("[2-4] Local multiplayer")
+    controls.append("[ESC] Quit")
+    pill = layout[f"controls{min(len(MENU_PILL_WIDTHS) - 1, max(0, len(controls) - 3))}"]
+    draw_controls_pill(surf, "   ".join(controls), pill, layout)
+
+
+def draw_level1_hud(surf, session, assets, ui_scale=1.0):
+    layout = hud_layout("level1", surf, ui_scale)
+    draw_score_pill(surf, session.score, layout["score"], layout)
+    goal = layout["goal"]
+    if session.storm_field is not None:
+        draw_text_shadow(surf, f"STORM {session.storm_timer // FPS}s", layout.px(36), *goal.center, (255, 235, 180))
+    else:
+        draw_goal_progress_pill(surf, goal, session.score, session.balance.level1_goal, layout)
+    draw_lives_panel(surf, session.lives, assets.heart_img, layout["lives"], layout)
+    draw_controls_pill(surf, "[LEFT/RIGHT] Move   [ESC] Quit", layout["controls"], layout)
+
+
+def draw_level2_hud(surf, session, assets, ui_scale=1.0):
+    layout = hud_layout("level2", surf, ui_scale)
+    balance = session.balance
+    draw_status_panel(
+        surf, layout["status"],
+        session.lives, balance.lives_start,
+        session.shield_timer, balance.shield_duration_frames,
+        session.dash_cd, balance.dash_cooldown_frames,
+        assets.heart_img, layout,
+    )
+    draw_metrics_strip(surf, layout["metrics"], session.runner_distance, session.score, session.runner_speed, layout)
+    if session.ghost is not None:
+        if session.ghost_pose is not None:
+            ghost_label, ghost_color = f"Racing ghost: {session.ghost.score} pts", (170, 210, 255)
+        else:
+            ghost_label, ghost_color = "Ghost beaten!", (200, 255, 200)
+        draw_text_shadow(surf, ghost_label, layout.px(26), *layout["ghost"].center, ghost_color)
+    draw_controls_pill(surf, "[SPACE] Jump   [P] Pause   [ESC] Quit", layout["controls"], layout)
+
+
+def draw_pause_panel(surf, ui_scale=1.0):
+    layout = hud_layout("pause", surf, ui_scale)
+    draw_glass_panel(surf, layout["panel"], base_color=UI_COLORS["panel"], border_color=UI_COLORS["accent"], radius=layout.px(28))
+    draw_text_shadow(surf, "Paused", layout.px(72), *layout["title"].center, (255, 255, 255))
+    draw_text_shadow(surf, "Press P to resume", layout.px(26), *layout["resume"].center, (220, 230, 255))
+    draw_text_shadow(surf, "Press ESC to quit", layout.px(20), *layout["quit"].center, (200, 210, 230))
+
+
+def draw_end_hud(surf, session, ui_scale=1.0):
+    layout = hud_layout("end", surf, ui_scale)
+    title = "YOU WIN!" if session.state == WIN else "GAME OVER"
+    draw_text(surf, title, layout.px(80), *layout["title"].center, (255,255,255))
+    draw_text(surf, f"Score: {session.score}", layout.px(40), *layout["score"].center, (255,255,200))
+    draw_text(surf, f"High Score: {session.highscore}", layout.px(30), *layout["highscore"].center, (200,255,200))
+    draw_text(surf, "Press ENTER to return to menu", layout.px(25), *layout["prompt"].center, (255,255,255))
+
+
+SQUAD_CONTROLS = ("[SPACE] jump  [L-SHIFT] dash", "[UP] jump  [R-SHIFT] dash", "[W] jump  [Q] dash", "[I] jump  [U] dash")
+
+
+def draw_player_card(surf, session, index, color, heart_icon, layout):
+    """Compact per-viewport status: player label, score, hearts, shield and dash."""
+    px = layout.px
+    squad = session.squad
+    balance = session.balance
+    rect = layout["card"]
+    draw_glass_panel(surf, rect, base_color=UI_COLORS["panel"], border_color=color, radius=px(20))
+    surf.blit(layout.font(22).render(f"P{index + 1}", True, color), (rect.x + px(18), rect.y + px(12)))
+    score = layout.font(22).render(f"{int(squad.score[index]):,}", True, (255, 255, 255))
+    surf.blit(score, (rect.right - score.get_width() - px(18), rect.y + px(12)))
+    lives = int(squad.lives[index])
+    for i in range(min(lives, balance.lives_start)):
+        center = (rect.x + px(80) + i * px(26), rect.y + px(24))
+        if heart_icon:
+            icon = scaled_icon(heart_icon, px(20))
+            surf.blit(icon, icon.get_rect(center=center))
+        else:
+            pygame.draw.circle(surf, UI_COLORS["danger"], center, px(9))
+    bar_w = (rect.width - px(48)) // 2
+    bar_y, bar_h = rect.y + px(48), px(14)
+    draw_shield_bar(surf, rect.x + px(18), bar_y, bar_w, bar_h, int(squad.shield[index]), balance.shield_duration_frames)
+    draw_dash_bar(
+        surf, rect.x + px(30) + bar_w, bar_y, bar_w, bar_h,
+        int(squad.dash_cd[index]), balance.dash_cooldown_frames, label_size=px(16),
+    )
+    surf.blit(layout.font(14, bold=False).render(SQUAD_CONTROLS[index], True, (215, 225, 240)), (rect.x + px(18), rect.y + px(78)))
+
+
+def draw_squad_standings(surf, session, title, scale=1.0):
+    """Players ranked by score, centred on ``surf``."""
+    from .multiplayer import PLAYER_COLORS
+
+    squad = session.squad
+    layout = get_hud_layout("standings", surf.get_size(), scale)
+    px = layout.px
+    order = sorted(range(squad.count), key=lambda i: -int(squad.score[i]))
+    panel = layout[f"panel{squad.count}"]
+    draw_glass_panel(surf, panel, base_color=UI_COLORS["panel"], border_color=UI_COLORS["accent"], radius=px(28))
+    draw_text_shadow(surf, title, px(40), panel.centerx, panel.y + px(44))
+    for rank, i in enumerate(order):
+        y = panel.y + px(104) + rank * px(46)
+        status = "  (out)" if squad.lives[i] <= 0 and session.state == LEVEL2 else ""
+        draw_text(surf, f"{rank + 1}.  P{i + 1}   {int(squad.score[i]):,}{status}", px(28), panel.centerx, y, PLAYER_COLORS[i])
+
+
+def draw_multiplayer_hud(surf, session, assets, ui_scale=1.0):
+    from .multiplayer import PLAYER_COLORS, viewport_rects
+
+    squad = session.squad
+    # Viewports are laid out at the whole screen's scale, not their own size's
+    scale = hud_scale(surf.get_size(), ui_scale)
+    rects = viewport_rects(*surf.get_size(), squad.count)
+    for i, rect in enumerate(rects):
+        view = surf.subsurface(rect)
+        layout = get_hud_layout("player_card", rect.size, scale)
+        draw_player_card(view, session, i, PLAYER_COLORS[i], assets.heart_img, layout)
+        if squad.lives[i] <= 0:
+            draw_text_shadow(view, "OUT", layout.px(72), rect.width // 2, rect.height // 2, (255, 140, 150))
+        pygame.draw.rect(view, PLAYER_COLORS[i], view.get_rect(), layout.px(3))
+    # Three players leave the fourth grid cell free for the standings
+    if squad.count == 3:
+        spare = pygame.Rect(rects[1].x, rects[2].y, rects[1].width, rects[2].height)
+        draw_squad_standings(surf.subsurface(spare), session, f"Distance {int(session.runner_distance):,}", scale)
+
+
+def draw_multiplayer_end_hud(surf, session, ui_scale=1.0):
+    layout = hud_layout("squad_end", surf, ui_scale)
+    squad = session.squad
+    winner = max(range(squad.count), key=lambda i: int(squad.score[i]))
+    draw_squad_standings(surf, session, f"Player {winner + 1} wins!", layout.scale)
+    draw_text(surf, f"High Score: {session.highscore}", layout.px(30), *layout[f"highscore{squad.count}"].center, (200,255,200))
+    draw_text(surf, "Press ENTER to return to menu", layout.px(25), *layout[f"prompt{squad.count}"].center, (255,255,255))
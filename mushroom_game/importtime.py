@@ -0,0 +1,58 @@
+"""Report import cost of the game modules.
+
+Each module is imported in a fresh interpreter under ``python -X importtime``
+so caches from earlier imports don't hide its real cost. Run with::
+
+    python -m mushroom_game.importtime [module ...]
+"""
+import os
+import subprocess
+import sys
+
+MODULES = (
+    "mushroom_game.config",
+    "mushroom_game.sim",
+    "mushroom_game.particles",
+    "mushroom_game.render",
+    "mushroom_game.hud",
+    "mushroom_game.main",
+)
+
+
+def measure(module):
+    """Return (total microseconds, {top-level package: cumulative microseconds}) for importing ``module``."""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, PYGAME_HIDE_SUPPORT_PROMPT="1")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=root, env=env, capture_output=True, text=True, check=True,
+    )
+    total = 0
+    by_package = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if not cumulative.strip().isdigit():
+            continue  # header row
+        us = int(cumulative)
+        # Only top-level entries count towards the total; nested ones are already included
+        if name[1:2] != " ":
+            total += us
+        # A package's outermost import includes everything it pulled in
+        top = name.strip().split(".")[0]
+        by_package[top] = max(by_package.get(top, 0), us)
+    return total, by_package
+
+
+def main(argv=None):
+    modules = (argv if argv is not None else sys.argv[1:]) or MODULES
+    for module in modules:
+        total, by_package = measure(module)
+        heaviest = sorted(by_package.items(), key=lambda kv: kv[1], reverse=True)[:4]
+        detail = ", ".join(f"{name} {us / 1000:.1f}ms" for name, us in heaviest)
+        print(f"{module:<28} {total / 1000:7.1f}ms  ({detail})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""Run one game instance per attached display, sharing a decoded-asset cache.
+
+    python -m mushroom_game.kiosk                      # every display, fullscreen
+    python -m mushroom_game.kiosk --displays 0,2 --windowed
+
+Before starting the instances, the launcher decodes and scales every image
+once for each distinct instance resolution into the asset cache (see
+``assetcache``). The instances then map those pixels instead of decoding
+the JPG/PNG files themselves. Instances that crash are restarted; one that
+exits normally (ESC) stays closed. Ctrl+C stops them all.
+"""
+import argparse
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+DEFAULT_CACHE_DIR = os.path.join(tempfile.gettempdir(), "shroom-asset-cache")
+RESTART_DELAY = 2.0
+
+
+def warm_cache(cache_dir, sizes, packs=""):
+    """Fill ``cache_dir`` with every image at each of ``sizes``; returns (hits, misses).
+
+    ``packs`` is the instances' ``SHROOM_PACKS``, so pack images are warmed too.
+    """
+    import pygame
+
+    from .assetcache import AssetCache
+    from .assets import ASSET_DIR, Assets
+    from .packs import AssetSource, open_packs
+
+    # A hidden window gives the cache the same pixel format the instances will use
+    pygame.display.set_mode((1, 1), pygame.HIDDEN)
+    cache = AssetCache(cache_dir)
+    source = AssetSource(ASSET_DIR, open_packs(packs))
+    for size in sizes:
+        Assets(*size, cache=cache, source=source)
+    return cache.hits, cache.misses
+
+
+def spawn(display, fullscreen, cache_dir):
+    env = dict(
+        os.environ,
+        SHROOM_DISPLAY=str(display),
+        SHROOM_FULLSCREEN="1" if fullscreen else "0",
+        SHROOM_ASSET_CACHE=cache_dir,
+        SHROOM_KIOSK_ID=f"{os.environ.get('SHROOM_KIOSK_ID', socket.gethostname())}-{display}",
+    )
+    return subprocess.Popen([sys.executable, "-m", "mushroom_game"], env=env)
+
+
+def supervise(displays, fullscreen, cache_dir):
+    processes = {display: spawn(display, fullscreen, cache_dir) for display in displays}
+    try:
+        while processes:
+            time.sleep(0.5)
+            for display, process in list(processes.items()):
+                code = process.poll()
+                if code is None:
+                    continue
+                if code == 0:
+                    del processes[display]
+                else:
+                    print(f"Instance on display {display} exited with {code}; restarting", file=sys.stderr)
+                    time.sleep(RESTART_DELAY)
+                    processes[display] = spawn(display, fullscreen, cache_dir)
+    except KeyboardInterrupt:
+        for process in processes.values():
+            process.terminate()
+        for process in processes.values():
+            process.wait()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m mushroom_game.kiosk", description=__doc__.split("\n\n")[0])
+    parser.add_argument("--displays", help="comma-separated display indices (default: all)")
+    parser.add_argument("--windowed", action="store_true", help="run windowed instead of fullscreen")
+    parser.add_argument("--cache", default=DEFAULT_CACHE_DIR, help=f"asset cache directory (default {DEFAULT_CACHE_DIR})")
+    parser.add_argument("--warm-only", action="store_true", help="fill the cache and exit")
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+    import pygame
+
+    from .main import window_size
+
+    pygame.display.init()
+    available = range(len(pygame.display.get_desktop_sizes()))
+    displays = [int(d) for d in args.displays.split(",")] if args.displays else list(available)
+    fullscreen = not args.windowed
+    sizes = sorted({window_size(display, fullscreen) for display in displays})
+
+    started = time.perf_counter()
+    hits, misses = warm_cache(args.cache, sizes, os.environ.get("SHROOM_PACKS", ""))
+    pygame.quit()
+    print(
+        f"Asset cache {args.cache}: {misses} built, {hits} already present "
+        f"for {', '.join(f'{w}x{h}' for w, h in sizes)} in {time.perf_counter() - started:.2f}s",
+        file=sys.stderr,
+    )
+    if not args.warm_only:
+        supervise(displays, fullscreen, args.cache)
+
+
+if __name__ == "__main__":
+    main()
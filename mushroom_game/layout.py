@@ -0,0 +1,101 @@
+"""Declarative HUD layout: widget rects from anchors, offsets and sizes, scaled for the display.
+
+A scene's HUD is a dict of ``Box`` specs in design pixels, the sizes the HUD
+was drawn at for a 1080p screen. ``compute_layout`` turns them into rects
+for one screen size and UI scale; ``hud`` caches the result per scene, size
+and scale, so widgets draw from ready rects and sizes instead of doing
+layout math every frame. ``auto_scale`` grows the HUD with the display past
+1080p (a 4K screen gets twice the design size) and ``SHROOM_UI_SCALE``
+multiplies that for players who want it bigger.
+"""
+from dataclasses import dataclass
+
+import pygame
+
+from .render import get_font
+
+DESIGN_SIZE = (1920, 1080)
+MAX_UI_SCALE = 4.0
+
+
+def auto_scale(size):
+    """HUD scale for a screen of ``size``: 1 up to 1080p, growing with the screen past it."""
+    return max(1.0, min(size[0] / DESIGN_SIZE[0], size[1] / DESIGN_SIZE[1]))
+
+
+def hud_scale(size, setting=1.0):
+    """``auto_scale`` times the player's UI scale ``setting``, kept to a usable range."""
+    return max(0.5, min(MAX_UI_SCALE, auto_scale(size) * setting))
+
+
+@dataclass(frozen=True)
+class Box:
+    """Where one widget goes.
+
+    The box's ``anchor`` point (a ``pygame.Rect`` position name like
+    ``"topright"`` or ``"midbottom"``) sits on the same point of its parent,
+    moved by ``(x, y)``. Lengths are design pixels and scale with the HUD; a
+    float is that fraction of the parent's size instead, and a negative
+    length is measured back from the parent's size (``max_w=-120`` leaves
+    60 pixels each side). ``min_w``/``max_w`` bound the width after that.
+    ``parent`` names a box defined earlier in the same layout; the default
+    is the screen.
+    """
+
+    anchor: str = "topleft"
+    x: float = 0
+    y: float = 0
+    w: float = 0
+    h: float = 0
+    min_w: float = None
+    max_w: float = None
+    parent: str = None
+
+
+def length(value, whole, scale):
+    """``value`` in pixels: design pixels scaled, a fraction of ``whole``, or back from ``whole``."""
+    if isinstance(value, float) and 0 < value <= 1:
+        return int(whole * value)
+    if value < 0:
+        return whole + round(value * scale)
+    return round(value * scale)
+
+
+class Layout:
+    """Rects of one scene's widgets at one screen size and scale.
+
+    ``layout["name"]`` is a widget's rect (shared; copy it before changing
+    it); ``px`` and ``font`` scale the sizes widgets use inside their rects.
+    """
+
+    def __init__(self, size, scale, rects):
+        self.size = size
+        self.scale = scale
+        self.rects = rects
+
+    def __getitem__(self, name):
+        return self.rects[name]
+
+    def px(self, value):
+        return round(value * self.scale)
+
+    def font(self, size, bold=True):
+        return get_font(self.px(size), bold)
+
+
+def compute_layout(boxes, size, scale=1.0):
+    """``Layout`` of ``boxes`` (name -> ``Box``, parents first) on a screen of ``size``."""
+    screen = pygame.Rect((0, 0), size)
+    rects = {}
+    for name, box in boxes.items():
+        parent = rects[box.parent] if box.parent else screen
+        w = length(box.w, parent.width, scale)
+        if box.max_w is not None:
+            w = min(w, length(box.max_w, parent.width, scale))
+        if box.min_w is not None:
+            w = max(w, length(box.min_w, parent.width, scale))
+        rect = pygame.Rect(0, 0, w, length(box.h, parent.height, scale))
+        px, py = getattr(parent, box.anchor)
+        setattr(rect, box.anchor, (px + round(box.x * scale), py + round(box.y * scale)))
+        rects[name] = rect
+    return Layout(size, scale, rects)
@@ -0,0 +1,105 @@
+"""Additive lighting: glows gathered in a quarter-resolution light map, added to the frame once.
+
+Anything that glows (powerups, the player's shield, gold mushrooms, spores)
+adds a light with ``LightMap.add`` while its scene is drawn. A light is a
+pre-baked radial stamp at map resolution, cached per radius, color and
+intensity step, so adding one allocates nothing. ``composite`` then blits
+the whole batch into the map with ``BLEND_RGB_ADD`` in one ``blits`` call,
+then smooth-scales each lit region of the map (overlapping lights merged)
+up once and adds it onto the frame, so the cost follows the lit area, not
+the screen size. The GPU renderer draws the map as one additive texture and
+scales it there.
+
+Overlapping lights add up instead of stacking translucent discs, and each
+light touches 1/16 of the pixels a full-size glow would, so scenes can have
+many more of them than per-object alpha surfaces allowed.
+"""
+from functools import lru_cache
+
+import pygame
+
+from .assets import display_convert
+from .memory import track_surfaces
+
+LIGHT_SCALE = 4  # Screen pixels per light map pixel, on each axis
+INTENSITY_STEPS = 16
+COLOR_STEP = 16  # Stamp colors are rounded down to this, so fading lights share stamps
+
+
+@lru_cache(maxsize=256)
+@track_surfaces
+def get_light_stamp(radius, color, level):
+    """Light of ``radius`` map pixels: ``color`` at ``level / INTENSITY_STEPS`` in the middle, fading out quadratically."""
+    stamp = display_convert(pygame.Surface((radius * 2 + 1, radius * 2 + 1)))
+    stamp.fill((0, 0, 0))
+    scale = level / INTENSITY_STEPS
+    for r in range(radius, 0, -1):
+        falloff = scale * (1 - (r - 1) / radius) ** 2
+        pygame.draw.circle(stamp, tuple(int(c * falloff) for c in color), (radius, radius), r)
+    return stamp
+
+
+class LightMap:
+    """The lights of one frame of ``size``, composited by ``composite``."""
+
+    def __init__(self, size):
+        self.size = size
+        w, h = (-(-n // LIGHT_SCALE) for n in size)
+        self.map = display_convert(pygame.Surface((w, h)))
+        self.scaled = None  # Scratch for the upscaled map, made on first use
+        self.batch = []
+
+    def add(self, x, y, radius, color, intensity=1.0):
+        """Light at screen position ``(x, y)`` reaching ``radius`` screen pixels."""
+        level = min(INTENSITY_STEPS, int(intensity * INTENSITY_STEPS + 0.5))
+        if level <= 0:
+            return
+        r = max(1, int(radius) // LIGHT_SCALE)
+        stamp = get_light_stamp(r, tuple(c - c % COLOR_STEP for c in color), level)
+        self.batch.append((stamp, (int(x) // LIGHT_SCALE - r, int(y) // LIGHT_SCALE - r), None, pygame.BLEND_RGB_ADD))
+
+    def composite(self, screen, renderer=None):
+        """Add this frame's lights onto ``screen`` and start the next frame with none."""
+        if not self.batch:
+            return
+        self.map.fill((0, 0, 0))
+        rects = self.map.blits(self.batch)
+        self.batch.clear()
+        bounds = self.map.get_rect()
+        if renderer is not None and renderer.accelerated:
+            area = rects[0].unionall(rects[1:]).clip(bounds)
+            if area:
+                renderer.add_light_map(self.map, area, scaled_rect(area))
+            return
+        if self.scaled is None:
+            self.scaled = display_convert(pygame.Surface((bounds.w * LIGHT_SCALE, bounds.h * LIGHT_SCALE)))
+        for area in merge_rects(rects):
+            area = area.clip(bounds)
+            if not area:
+                continue
+            dest = scaled_rect(area)
+            lit = self.scaled.subsurface((0, 0, dest.w, dest.h))
+            pygame.transform.smoothscale(self.map.subsurface(area), dest.size, lit)
+            screen.blit(lit, dest, special_flags=pygame.BLEND_RGB_ADD)
+
+
+def scaled_rect(area):
+    return pygame.Rect(area.x * LIGHT_SCALE, area.y * LIGHT_SCALE, area.w * LIGHT_SCALE, area.h * LIGHT_SCALE)
+
+
+def merge_rects(rects):
+    """``rects`` grown by a pixel of black border, with overlapping ones merged until none overlap."""
+    merged = []
+    for rect in rects:
+        rect = rect.inflate(2, 2)
+        i = rect.collidelist(merged)
+        while i >= 0:
+            rect.union_ip(merged.pop(i))
+            i = rect.collidelist(merged)
+        merged.append(rect)
+    return merged
+
+
+@lru_cache(maxsize=2)
+def get_light_map(size):
+    return LightMap(size)
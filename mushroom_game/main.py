@@ -0,0 +1,373 @@
+"""Entry point: window setup, input handling and the frame loop."""
+import os
+import random
+import time
+import warnings
+
+import pygame
+
+from . import hud, render, savestate
+from .assetcache import AssetCache
+from .assets import ASSET_DIR, PACKAGE_DIR, Assets, load_highscore, save_highscore
+from .config import ConfigWatcher, load_config
+from .ghost import GHOST_FILE, load_ghost, save_ghost
+from .lighting import get_light_map
+from .particles import draw_particles
+from .packs import AssetSource, open_packs
+from .pipeline import PacingStats, Pipeline, show
+from .prewarm import Prewarmer
+from .renderer import create_renderer
+from .sim import FPS, GAMEOVER, LEVEL1, LEVEL2, MENU, WIN, Session, step_inputs, storm_available
+
+
+# Game Settings
+WIDTH, HEIGHT = 1920, 1076
+TITLE = "Shroom Hunter"
+# Balance overrides are read from here (or SHROOM_CONFIG) and hot-reloaded
+CONFIG_FILE = os.path.join(PACKAGE_DIR, "balance.toml")
+# Local multiplayer (jump, dash) keys for players 2-4; player 1 keeps Space / left Shift
+SQUAD_KEYS = {
+    "jump2": pygame.K_UP, "dash2": pygame.K_RSHIFT,
+    "jump3": pygame.K_w, "dash3": pygame.K_q,
+    "jump4": pygame.K_i, "dash4": pygame.K_u,
+}
+MEMORY_CHECK_SECONDS = 5
+# Idle frames leave this much of their budget unused, for the frame cap's coarse sleep
+PREWARM_MARGIN = 0.002
+MULTIPLAYER_KEYS = {pygame.K_2: "multi2", pygame.K_3: "multi3", pygame.K_4: "multi4"}
+PAUSE_GRADIENT = ((12, 18, 30, 210), (6, 10, 20, 230))
+
+
+def apply_command(session, command, storm_enabled=False):
+    """Apply a menu/flow command ("start", "storm", "ghost", "multi2".."multi4", "resume", "menu", "pause") if valid now.
+
+    Keyboard, mouse and scripted input all go through here, so a recorded
+    command stream replays exactly what the player triggered. Returns True
+    when the command took effect.
+    """
+    state = session.state
+    if command == "pause":
+        session.paused = not session.paused
+    elif command == "start" and state == MENU:
+        # Start Level 1
+        session.start_level1()
+    elif command == "storm" and state == MENU and storm_enabled:
+        session.start_storm()
+    elif command == "ghost" and state == MENU and session.best_ghost is not None:
+        session.start_ghost_race()
+    elif command in ("multi2", "multi3", "multi4") and state == MENU and storm_enabled:
+        # Squads share the storm mode's NumPy requirement
+        session.start_multiplayer(int(command[-1]))
+    elif command == "resume" and state == MENU and session.saved_run:
+        if not savestate.load(session, session.saved_run):
+            session.saved_run = None
+            return False
+    elif command == "menu" and state in (GAMEOVER, WIN):
+        # Return to menu
+        session.return_to_menu()
+    else:
+        return False
+    if state == MENU and command != "pause":
+        # Whatever runs now takes the place of the saved run
+        session.saved_run = None
+    return True
+
+
+def draw_frame(screen, renderer, session, assets, storm_enabled=False, ui_scale=1.0):
+    """Compose one frame of the active scene, its lights, the HUD and screen flashes.
+
+    ``ui_scale`` is the player's HUD scale on top of the automatic one for the screen size.
+    """
+    state = session.state
+    lights = get_light_map(screen.get_size())
+    if state == MENU:
+        render.draw_menu_scene(screen, session, assets)
+        renderer.begin_hud()
+        hud.draw_menu_hud(screen, session, storm_enabled, ui_scale)
+        draw_particles(screen, session.particles, renderer, lights)
+        lights.composite(screen, renderer)
+    elif state == LEVEL1:
+        render.draw_level1_scene(screen, session, assets, lights)
+        draw_particles(screen, session.particles, renderer, lights)
+        lights.composite(screen, renderer)
+        renderer.begin_hud()
+        hud.draw_level1_hud(screen, session, assets, ui_scale)
+    elif state == LEVEL2 and session.squad is not None:
+        render.draw_multiplayer_scene(screen, session, assets, lights)
+        lights.composite(screen, renderer)
+        renderer.begin_hud()
+        hud.draw_multiplayer_hud(screen, session, assets, ui_scale)
+    elif state == LEVEL2:
+        render.draw_level2_scene(screen, session, assets, lights)
+        draw_particles(screen, session.particles, renderer, lights)
+        lights.composite(screen, renderer)
+        renderer.begin_hud()
+        hud.draw_level2_hud(screen, session, assets, ui_scale)
+    elif state in (GAMEOVER, WIN):
+        render.draw_end_scene(screen, session)
+        renderer.begin_hud()
+        if session.squad is not None:
+            hud.draw_multiplayer_end_hud(screen, session, ui_scale)
+        else:
+            hud.draw_end_hud(screen, session, ui_scale)
+    renderer.end_hud()
+    render.draw_flashes(screen, session)
+
+
+def draw_paused(screen, renderer, ui_scale=1.0):
+    screen.blit(render.get_gradient_overlay(screen.get_size(), *PAUSE_GRADIENT), (0, 0))
+    renderer.begin_hud()
+    hud.draw_pause_panel(screen, ui_scale)
+
+
+def held_inputs(squad=None):
+    """Held gameplay inputs from the keyboard; squads take their players' keys too."""
+    keys = pygame.key.get_pressed()
+    held = {
+        "left": keys[pygame.K_LEFT],
+        "right": keys[pygame.K_RIGHT],
+        "jump": keys[pygame.K_SPACE],
+        "dash": keys[pygame.K_LSHIFT] or keys[pygame.K_RSHIFT],
+    }
+    if squad is not None:
+        # Right Shift belongs to player 2 in a squad
+        held["dash"] = keys[pygame.K_LSHIFT]
+        held.update((name, keys[key]) for name, key in SQUAD_KEYS.items())
+    return held
+
+
+def window_size(display=0, fullscreen=False):
+    """Size for a window on ``display``: its desktop size, or a safe window inside it."""
+    sizes = pygame.display.get_desktop_sizes()
+    desktop_w, desktop_h = sizes[display] if display < len(sizes) else sizes[0]
+    if fullscreen:
+        return desktop_w, desktop_h
+    return min(WIDTH, max(800, desktop_w - 40)), min(HEIGHT, max(450, desktop_h - 80))
+
+
+def main():
+    pygame.init()
+    # SHROOM_DISPLAY/SHROOM_FULLSCREEN place an instance; the kiosk launcher sets them
+    display = int(os.environ.get("SHROOM_DISPLAY", 0))
+    fullscreen = os.environ.get("SHROOM_FULLSCREEN") == "1"
+    width, height = window_size(display, fullscreen)
+    # SHROOM_RENDERER=gpu opts into the texture renderer; it falls back to software if unavailable
+    renderer = create_renderer(
+        (width, height), TITLE, prefer_gpu=os.environ.get("SHROOM_RENDERER") == "gpu", fullscreen=fullscreen, display=display
+    )
+    screen = renderer.surface
+    clock = pygame.time.Clock()
+
+    try:
+        pygame.mixer.init()
+    except:
+        pass
+
+    # SHROOM_ASSET_CACHE=dir maps pre-scaled images shared with other instances
+    cache_dir = os.environ.get("SHROOM_ASSET_CACHE")
+    # SHROOM_PACKS=a.zip:b.zip layers content packs over assets/, later ones on top
+    source = AssetSource(ASSET_DIR, open_packs(os.environ.get("SHROOM_PACKS", "")))
+    assets = Assets(width, height, cache=AssetCache(cache_dir) if cache_dir else None, source=source)
+    config_file = os.environ.get("SHROOM_CONFIG", CONFIG_FILE)
+    # Packs' balance overrides sit under the config file's
+    pack_balance = source.config()
+    # SHROOM_SEED fixes the run; recordings need one so their replay matches
+    seed = os.environ.get("SHROOM_SEED")
+    seed = int(seed) if seed else (random.randrange(2**31) if os.environ.get("SHROOM_RECORD") else None)
+    if seed is not None:
+        random.seed(seed)
+    try:
+        balance = load_config(config_file, pack_balance)
+    except (OSError, ValueError) as exc:
+        # As on a reload: a broken file is reported and play goes on without it
+        warnings.warn(f"Config not loaded, playing without it: {exc}")
+        balance = pack_balance
+    session = Session(width, height, balance=balance, highscore=load_highscore(), seed=seed)
+    saved_highscore = session.highscore
+    # SHROOM_GHOST=path races a saved run instead of the best one
+    session.best_ghost = load_ghost(os.environ.get("SHROOM_GHOST", GHOST_FILE))
+    # SHROOM_SAVE=path keeps the unfinished run somewhere else; ESC saves it, [R] resumes it
+    save_file = os.environ.get("SHROOM_SAVE", savestate.SAVE_FILE)
+    session.saved_run = save_file if os.path.exists(save_file) else None
+    autosaver = savestate.Autosaver(save_file).start()
+    storm_enabled = storm_available()
+    # SHROOM_UI_SCALE=1.5 makes the HUD bigger (it already grows with screens past 1080p)
+    ui_scale = float(os.environ.get("SHROOM_UI_SCALE", 1.0))
+    config_watcher = ConfigWatcher(config_file, base=pack_balance).start()
+    # SHROOM_RECORD=path writes the input stream as a script for capture replays
+    recorder = None
+    if os.environ.get("SHROOM_RECORD"):
+        from .capture import InputRecorder
+        recorder = InputRecorder(os.environ["SHROOM_RECORD"], (width, height), seed)
+    # SHROOM_TELEMETRY=dir writes per-run metrics there (and to SHROOM_TELEMETRY_URL if set)
+    telemetry = None
+    if os.environ.get("SHROOM_TELEMETRY"):
+        from .telemetry import Telemetry
+        telemetry = Telemetry(os.environ["SHROOM_TELEMETRY"], url=os.environ.get("SHROOM_TELEMETRY_URL"))
+        telemetry.start(size=[width, height], renderer=type(renderer).__name__, storm=storm_enabled)
+    # SHROOM_ONLINE=host:port streams the game to spectators and submits runs to the leaderboard
+    online = None
+    if os.environ.get("SHROOM_ONLINE"):
+        from .online import OnlineClient, parse_address
+        online = OnlineClient(*parse_address(os.environ["SHROOM_ONLINE"])).start()
+    # SHROOM_MEMORY_BUDGET=MB sheds caches and detail when the accounted memory goes over it
+    memory_budget = None
+    if os.environ.get("SHROOM_MEMORY_BUDGET"):
+        from .memory import MemoryBudget
+        memory_budget = MemoryBudget(int(float(os.environ["SHROOM_MEMORY_BUDGET"]) * (1 << 20)))
+    # Menu, end-screen and pause frames spend their spare time drawing the next
+    # scenes' sprites ahead of time; SHROOM_PREWARM=0 leaves them to their first frame
+    prewarmer = None
+    if os.environ.get("SHROOM_PREWARM") != "0":
+        prewarmer = Prewarmer(assets, storm_enabled, ui_scale)
+
+    def command(session, name):
+        if apply_command(session, name, storm_enabled) and recorder:
+            recorder.command(name)
+
+    def simulate(session, held):
+        """One frame of everything that changes the session, and what must follow its step."""
+        nonlocal saved_highscore
+        if session.paused and session.state not in (GAMEOVER, WIN):
+            if recorder:
+                recorder.frame()
+            return
+        if recorder:
+            recorder.frame(held)
+        session.step(**step_inputs(held, session.squad))
+        autosaver.frame(session)
+        if session.highscore != saved_highscore:
+            save_highscore(session.highscore)
+            saved_highscore = session.highscore
+        if online:
+            online.publish(session)
+        if session.state == GAMEOVER and session.trace is not None:
+            if online:
+                online.submit_run(session.score, session.runner_distance, session.trace.to_bytes(session.score, session.runner_distance))
+            # Keep the run as the new ghost when it beats the one on file
+            best = session.best_ghost
+            if best is None or session.score > best.score:
+                session.best_ghost = save_ghost(session.trace, session.score, session.runner_distance) or best
+            session.trace = None
+
+    # SHROOM_PIPELINE=1 simulates on a thread of its own; this loop then draws its
+    # published frames into ``view`` and hands every change to the session to it
+    pipeline = view = stats = None
+    if os.environ.get("SHROOM_PIPELINE") == "1":
+        stats = PacingStats()
+        view = Session(width, height, balance=session.balance, highscore=session.highscore)
+        pipeline = Pipeline(session, simulate, stats=stats).start()
+    shown = view or session
+
+    running = True
+    while running:
+        # The pipeline paces itself; here the clock only measures
+        interval_ms = clock.tick() if pipeline else clock.tick(FPS)
+        frame_started = time.perf_counter()
+        if stats:
+            stats.add("interval", interval_ms)
+        if telemetry:
+            # get_rawtime() is the previous frame's work, without the frame-cap sleep
+            telemetry.frame(shown, clock.get_rawtime(), interval_ms)
+
+        reloaded = config_watcher.poll()
+        if reloaded:
+            if pipeline:
+                view.balance = reloaded
+                pipeline.call(setattr, session, "balance", reloaded)
+            else:
+                session.balance = reloaded
+
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+            elif event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_ESCAPE:
+                    running = False
+                # Toggle fullscreen on F11
+                if event.key == pygame.K_F11:
+                    fullscreen = not fullscreen
+                    renderer.set_fullscreen(fullscreen)
+                    screen = renderer.surface
+                name = None
+                if event.key == pygame.K_p:
+                    name = "pause"
+                elif event.key == pygame.K_RETURN:
+                    name = "start" if shown.state == MENU else "menu"
+                elif event.key == pygame.K_s:
+                    name = "storm"
+                elif event.key == pygame.K_g:
+                    name = "ghost"
+                elif event.key == pygame.K_r:
+                    name = "resume"
+                elif event.key in MULTIPLAYER_KEYS:
+                    name = MULTIPLAYER_KEYS[event.key]
+                if name and pipeline:
+                    pipeline.call(command, session, name)
+                elif name:
+                    command(session, name)
+            elif event.type == pygame.VIDEORESIZE:
+                width, height = renderer.resize((event.w, event.h), fullscreen)
+                screen = renderer.surface
+                if pipeline:
+                    view.resize(width, height)
+                    pipeline.call(session.resize, width, height)
+                else:
+                    session.resize(width, height)
+            elif event.type == pygame.MOUSEBUTTONDOWN:
+                # Enable mouse click on Start button in the menu
+                if shown.state == MENU and event.button == 1:
+                    start_rect = hud.get_menu_layout(*screen.get_size(), ui_scale)["start"]
+                    if start_rect.collidepoint(event.pos) and pipeline:
+                        pipeline.call(command, session, "start")
+                    elif start_rect.collidepoint(event.pos):
+                        command(session, "start")
+
+        if pipeline:
+            pipeline.set_inputs(held_inputs(view.squad))
+            frame = pipeline.frames.take(timeout=1 / FPS)
+            if frame is None:
+                continue
+            show(view, frame)
+            sfx = frame.sfx
+        else:
+            simulate(session, held_inputs(session.squad))
+            sfx = session.sfx[:]
+            session.sfx.clear()
+        for name in sfx:
+            assets.play(name)
+        started = time.perf_counter()
+        paused = shown.paused and shown.state not in (GAMEOVER, WIN)
+        if paused:
+            draw_paused(screen, renderer, ui_scale)
+        else:
+            if memory_budget and shown.frame % (FPS * MEMORY_CHECK_SECONDS) == 0:
+                shed = memory_budget.check(assets, shown, renderer)
+                if shed and pipeline and "shrink_particles" in shed:
+                    # The view's particles are replaced every frame; the simulation's must shrink
+                    pipeline.call(memory_budget.shrink_particles, assets, session)
+                if shed and telemetry:
+                    telemetry.record("memory_shed", stages=shed, private_bytes=memory_budget.last_total)
+                if shed:
+                    # Refilling the caches that were just shed would undo it
+                    prewarmer = None
+            draw_frame(screen, renderer, shown, assets, storm_enabled, ui_scale)
+        renderer.present()
+        if stats:
+            stats.add("draw", (time.perf_counter() - started) * 1000)
+        if prewarmer and (paused or shown.state in (MENU, GAMEOVER, WIN)):
+            prewarmer.run(screen, 1 / FPS - PREWARM_MARGIN - (time.perf_counter() - frame_started))
+
+    if pipeline:
+        pipeline.stop()
+        print(stats.report())
+    config_watcher.stop()
+    # Quitting mid-run keeps it for [R] Resume next time
+    autosaver.stop(session)
+    if telemetry:
+        telemetry.close(session)
+    if online:
+        online.close()
+    if recorder:
+        recorder.save()
+    pygame.quit()
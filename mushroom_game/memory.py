@@ -0,0 +1,302 @@
+"""Memory accounting for loaded surfaces, sounds and particles, and a budget to enforce.
+
+``account()`` lists what the game holds: every image on ``Assets``, the
+animation atlases, each cached sprite and light stamp (grouped by the cache
+that built it), the sound buffers and the particle store. Pixels mapped from the
+shared asset cache are reported apart, since they are clean file-backed
+pages the kernel can drop and reload rather than private memory.
+
+``MemoryBudget`` compares the private total with a limit
+(``SHROOM_MEMORY_BUDGET`` in MB) and, when over, frees memory in order of
+least visible loss: clear the sprite caches (only what is drawn gets
+rebuilt), share duplicate images, swap the 300x300 falling-mushroom sway
+clips for their static frame, and halve the particle cap. There is no
+downscaling stage: ``Assets`` already loads every image at the size it is
+drawn (the 300x300 mushroom falls as a 300x300 rect), so a smaller copy
+would have to be scaled back up every frame.
+
+    python -m mushroom_game.memory --size 1280x720 [--budget 40]
+
+renders a few frames of every scene off-screen and prints the report.
+"""
+import sys
+import weakref
+
+import pygame
+
+MIN_CACHE_GROWTH = 1 << 20  # Sprite caches are cleared again once they grow this far past what is drawn
+_TRACKED = {}  # builder function -> WeakSet of surfaces it built
+
+
+def track_surfaces(builder):
+    """Record every surface ``builder`` returns; put it under ``lru_cache`` so hits cost nothing."""
+    built = _TRACKED.setdefault(builder, weakref.WeakSet())
+
+    def track(*args, **kwargs):
+        result = builder(*args, **kwargs)
+        for surf in result if isinstance(result, tuple) else (result,):
+            if isinstance(surf, pygame.Surface):
+                built.add(surf)
+        return result
+
+    track.__wrapped__ = builder
+    track.__name__ = builder.__name__
+    track.__doc__ = builder.__doc__
+    return track
+
+
+def surface_bytes(surf):
+    """Pixel bytes owned by ``surf`` (a subsurface owns none; its parent is counted)."""
+    if surf.get_parent() is not None:
+        return 0
+    return surf.get_width() * surf.get_height() * surf.get_bytesize()
+
+
+def root_surface(surf):
+    while surf.get_parent() is not None:
+        surf = surf.get_parent()
+    return surf
+
+
+def sound_bytes(sound):
+    init = pygame.mixer.get_init()
+    if sound is None or not init:
+        return 0
+    frequency, size, channels = init
+    return round(sound.get_length() * frequency) * channels * abs(size) // 8
+
+
+def particle_bytes(particles):
+    total = sys.getsizeof(particles)
+    for particle in particles:
+        total += sys.getsizeof(particle) + sum(sys.getsizeof(value) for value in particle.values())
+    return total
+
+
+def sprite_caches():
+    """``(name, lru function, tracked surfaces)`` for every surface cache in ``render`` and ``lighting``."""
+    from . import lighting, render
+
+    caches = []
+    for module in (render, lighting):
+        for name, func in vars(module).items():
+            builder = getattr(getattr(func, "__wrapped__", None), "__wrapped__", None)
+            if hasattr(func, "cache_clear") and builder in _TRACKED:
+                caches.append((name, func, _TRACKED[builder]))
+    return caches
+
+
+class Entry:
+    __slots__ = ("category", "name", "bytes", "mapped", "note", "count")
+
+    def __init__(self, category, name, size, mapped=False, note=""):
+        self.category = category
+        self.name = name
+        self.bytes = size
+        self.mapped = mapped
+        self.note = note
+        self.count = 1
+
+
+def account(assets, session=None, renderer=None):
+    """Entries for everything measurable, largest first; surfaces are counted once."""
+    cache = getattr(assets, "cache", None)
+    mapped = cache.mapped if cache is not None else ()
+    screen_area = assets.size[0] * assets.size[1]
+    seen = set()
+    entries = []
+    groups = {}
+
+    def add_surface(category, name, surf):
+        """One entry per surface; surfaces from the same cache or loop share one entry."""
+        root = root_surface(surf)
+        if id(root) in seen:
+            return
+        seen.add(id(root))
+        w, h = root.get_size()
+        entry = groups.get((category, name))
+        if entry is not None:
+            entry.bytes += surface_bytes(root)
+            entry.count += 1
+            entry.note = f"{entry.count} surfaces"
+            return
+        note = f"{w}x{h} {root.get_bitsize()}-bit"
+        if root.get_flags() & pygame.SRCALPHA:
+            note += " alpha"
+        if w * h > screen_area:
+            note += ", larger than the screen"
+        entry = groups[category, name] = Entry(category, name, surface_bytes(root), root in mapped, note)
+        entries.append(entry)
+
+    for name, value in vars(assets).items():
+        if isinstance(value, pygame.Surface):
+            add_surface("image", name, value)
+    anims = getattr(assets, "animations", None)
+    if anims is not None:
+        for name, frames in anims.runner.items():
+            add_surface("animation", f"runner {name}", frames[0])
+        for name in ("monster", "mushroom", "mushroom_gold"):
+            clip = getattr(anims, name)
+            if clip is not None:
+                add_surface("animation", name, clip.frames[0])
+        for ring in anims.shield.sprites.values():
+            add_surface("animation", "shield rings", ring)
+    for name, _, surfaces in sprite_caches():
+        for surf in list(surfaces):
+            add_surface("sprite cache", name, surf)
+    for name, sound in getattr(assets, "sounds", {}).items():
+        if sound is not None:
+            entries.append(Entry("sound", name, sound_bytes(sound)))
+    if session is not None:
+        entries.append(Entry("particles", "particle store", particle_bytes(session.particles), note=f"{len(session.particles)} particles"))
+    textures = getattr(renderer, "_textures", None)
+    if textures is not None:
+        vram = sum(surface_bytes(root_surface(surf)) for surf in list(textures.keys()))
+        entries.append(Entry("gpu", "texture uploads", vram, note=f"{len(textures)} textures (video memory)"))
+    entries.sort(key=lambda entry: -entry.bytes)
+    return entries
+
+
+def cache_bytes(entries):
+    return sum(e.bytes for e in entries if e.category == "sprite cache")
+
+
+def private_bytes(entries):
+    """Bytes in process memory: everything except mapped pixels and video memory."""
+    return sum(e.bytes for e in entries if not e.mapped and e.category != "gpu")
+
+
+def resident_bytes():
+    """Resident set size from /proc (Linux only; None elsewhere)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * 4096
+    except (OSError, IndexError, ValueError):
+        return None
+
+
+def format_report(entries, limit=None):
+    mb = 1 / (1 << 20)
+    lines = [f"{'category':<13} {'name':<28} {'MB':>8}  note"]
+    for e in entries:
+        kind = " (mapped)" if e.mapped else ""
+        lines.append(f"{e.category:<13} {e.name:<28} {e.bytes * mb:8.2f}  {e.note}{kind}")
+    totals = {}
+    for e in entries:
+        totals[e.category] = totals.get(e.category, 0) + e.bytes
+    lines.append("")
+    lines.extend(f"{category:<13} {'total':<28} {size * mb:8.2f}" for category, size in sorted(totals.items(), key=lambda kv: -kv[1]))
+    lines.append(f"{'private':<13} {'':<28} {private_bytes(entries) * mb:8.2f}" + (f"  budget {limit * mb:.0f}" if limit else ""))
+    rss = resident_bytes()
+    if rss:
+        lines.append(f"{'resident':<13} {'(whole process)':<28} {rss * mb:8.2f}")
+    return "\n".join(lines)
+
+
+class MemoryBudget:
+    """Keeps the private total under ``limit`` bytes by shedding memory in stages."""
+
+    STAGES = ("clear_sprite_caches", "share_duplicates", "drop_mushroom_sway", "shrink_particles")
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.applied = set()
+        self.last_total = 0
+        self.drawn_cache = None  # Sprite cache bytes rebuilt by the frames after the last clear
+
+    def check(self, assets, session=None, renderer=None):
+        """Apply stages until under budget; returns the names of the stages applied."""
+        applied = []
+        entries = account(assets, session, renderer)
+        self.last_total = private_bytes(entries)
+        cached = cache_bytes(entries)
+        if self.drawn_cache is None and "clear_sprite_caches" in self.applied:
+            self.drawn_cache = cached
+        for name in self.STAGES:
+            if self.last_total <= self.limit:
+                break
+            # Sprite caches refill with whatever is drawn, so clearing them again only
+            # frees anything once they hold well more than the frames since rebuilt
+            repeatable = name == "clear_sprite_caches" and cached - (self.drawn_cache or cached) >= MIN_CACHE_GROWTH
+            if name in self.applied and not repeatable:
+                continue
+            getattr(self, name)(assets, session)
+            applied.append(name)
+            self.applied.add(name)
+            if name == "clear_sprite_caches":
+                self.drawn_cache = None
+            self.last_total = private_bytes(account(assets, session, renderer))
+        return applied
+
+    def clear_sprite_caches(self, assets, session):
+        for _, func, _ in sprite_caches():
+            func.cache_clear()
+
+    def share_duplicates(self, assets, session):
+        """Point attributes holding identical pixels at one surface."""
+        by_pixels = {}
+        for name, value in list(vars(assets).items()):
+            if isinstance(value, pygame.Surface) and value.get_parent() is None:
+                key = (value.get_size(), value.get_bitsize(), hash(pygame.image.tobytes(value, "RGBA")))
+                setattr(assets, name, by_pixels.setdefault(key, value))
+
+    def drop_mushroom_sway(self, assets, session):
+        anims = assets.animations
+        for name, img in (("mushroom", assets.mushroom_img), ("mushroom_gold", assets.mushroom_gold_img)):
+            clip = getattr(anims, name)
+            if clip is not None and img is not None:
+                clip.frames = [img]
+
+    def shrink_particles(self, assets, session):
+        if session is not None:
+            particles = session.particles
+            particles.cap = max(50, particles.cap // 2)
+            particles.quotas = {category: max(8, quota // 2) for category, quota in particles.quotas.items()}
+
+
+def main(argv=None):
+    import argparse
+    import os
+
+    parser = argparse.ArgumentParser(prog="python -m mushroom_game.memory", description=__doc__.split("\n\n")[0])
+    parser.add_argument("--size", default="1920x1076", help="screen size WxH (default 1920x1076)")
+    parser.add_argument("--budget", type=float, help="apply a budget of this many MB and report again")
+    parser.add_argument("--cache", help="map images from this asset cache directory")
+    args = parser.parse_args(argv)
+    size = tuple(int(n) for n in args.size.lower().split("x"))
+
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    pygame.init()
+    from .assetcache import AssetCache
+    from .assets import Assets
+    from .main import draw_frame
+    from .renderer import OffscreenRenderer
+    from .sim import Session, storm_available
+
+    pygame.display.set_mode((1, 1))
+    renderer = OffscreenRenderer(size)
+    assets = Assets(*size, cache=AssetCache(args.cache) if args.cache else None)
+    session = Session(*size, seed=0)
+    scenes = [lambda: None, session.start_level1, session.start_level2, lambda: session.game_over(auto_return=False)]
+    if storm_available():
+        scenes.insert(3, lambda: session.start_multiplayer(4))
+    for start in scenes:
+        start()
+        for _ in range(30):
+            session.step(jump=True)
+            draw_frame(renderer.surface, renderer, session, assets, storm_available())
+    session.return_to_menu()
+    print(format_report(account(assets, session)))
+    if args.budget:
+        budget = MemoryBudget(int(args.budget * (1 << 20)))
+        applied = budget.check(assets, session)
+        print(f"\nBudget {args.budget:g} MB: applied {', '.join(applied) or 'nothing'}\n")
+        print(format_report(account(assets, session), budget.limit))
+
+
+if __name__ == "__main__":
+    # Run from the package module so the caches register with the same _TRACKED as render's
+    from mushroom_game.memory import main as memory_main
+
+    memory_main()
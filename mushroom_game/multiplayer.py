@@ -0,0 +1,125 @@
+"""Local 2-4 player Level 2: per-player runner state in NumPy arrays.
+
+All players run through one shared world (monsters, powerups, scroll speed)
+that is shown in one viewport per player. Each player's height, velocity,
+dash cooldown, shield, lives and score are one slot of a NumPy array, so
+jumping, gravity, landing and monster collisions for every player resolve
+in a handful of vectorised operations rather than a Python loop per player.
+
+A monster can hit each player once (tracked by a per-monster bitmask) and
+stays in the world for the others; a powerup goes to the first player who
+touches it. Contact is swept over the step, so nothing passes through a
+player at any speed.
+"""
+import numpy as np
+import pygame
+
+from .collision import sweep_many
+from .sim import PLAYER_SIZE
+
+MAX_PLAYERS = 4
+PLAYER_COLORS = ((120, 200, 255), (255, 170, 110), (150, 235, 140), (235, 140, 235))
+
+
+def viewport_rects(width, height, count):
+    """Equal-sized viewports: stacked for two players, a 2x2 grid for three or four."""
+    cols = 1 if count <= 2 else 2
+    rows = 1 if count == 1 else 2
+    w, h = width // cols, height // rows
+    return [pygame.Rect((i % cols) * w, (i // cols) * h, w, h) for i in range(count)]
+
+
+class RunnerSquad:
+    """Per-player Level 2 state, one array slot per player."""
+
+    def __init__(self, count, width, height, balance):
+        self.count = count
+        self.player_x = width // 2 - PLAYER_SIZE[0] // 2
+        # Same drop-in start as the single-player runner: centred, falling to the ground
+        self.bottom = np.full(count, height // 2 + PLAYER_SIZE[1] // 2, np.int32)
+        self.prev_bottom = self.bottom.copy()  # Before this step's move
+        self.vy = np.zeros(count, np.float32)
+        self.on_ground = np.zeros(count, bool)
+        self.dash_cd = np.zeros(count, np.int32)
+        self.shield = np.zeros(count, np.int32)
+        self.lives = np.full(count, balance.lives_start, np.int32)
+        self.score = np.zeros(count, np.int32)
+        self.score_carry = np.zeros(count, np.float32)
+        self.hit_flash = np.zeros(count, np.int32)
+        self._bits = np.left_shift(1, np.arange(count))
+
+    @property
+    def alive(self):
+        return self.lives > 0
+
+    def rect(self, i):
+        return pygame.Rect(self.player_x, int(self.bottom[i]) - PLAYER_SIZE[1], *PLAYER_SIZE)
+
+    def add_distance(self, distance, unit):
+        """Credit distance score to the players still running."""
+        self.score_carry[self.alive] += distance
+        gained = (self.score_carry // unit).astype(np.int32)
+        self.score += gained
+        self.score_carry -= gained * unit
+
+    def move(self, jump, dash, balance, ground_y):
+        """Jump, dash, gravity and landing for every player; returns (jumped, dashed) masks."""
+        self.prev_bottom[:] = self.bottom
+        alive = self.alive
+        jumped = jump & self.on_ground & alive
+        self.vy[jumped] = balance.player_jump_speed
+        self.on_ground[jumped] = False
+        dashed = dash & (self.dash_cd == 0) & alive
+        self.vy[dashed] = balance.player_jump_speed * 1.5
+        self.dash_cd[dashed] = balance.dash_cooldown_frames
+
+        self.vy += balance.gravity
+        self.bottom += np.trunc(self.vy).astype(np.int32)
+        landed = self.bottom >= ground_y
+        self.bottom[landed] = ground_y
+        self.vy[landed] = 0
+        self.on_ground = landed
+        np.subtract(self.dash_cd, 1, out=self.dash_cd, where=self.dash_cd > 0)
+        return jumped, dashed
+
+    def touching(self, boxes, moves):
+        """Boolean (len(boxes), players) matrix: which boxes, swept by ``moves``, touch each living player.
+
+        Players are swept over their own move this step as well.
+        """
+        x = np.full(self.count, self.player_x)
+        players = np.column_stack((x, self.prev_bottom - PLAYER_SIZE[1], x + PLAYER_SIZE[0], self.prev_bottom))
+        player_moves = np.column_stack((np.zeros(self.count), self.bottom - self.prev_bottom))
+        return (sweep_many(boxes, moves, players, player_moves) <= 1) & self.alive
+
+    def hit_by(self, monsters, balance):
+        """Resolve monster contact for all players; returns (absorbed, wounded) masks."""
+        none = np.zeros(self.count, bool)
+        if not monsters:
+            return none, none
+        boxes = np.array([(m["rect"].x, m["rect"].y, m["rect"].right, m["rect"].bottom) for m in monsters], float)
+        dx = np.array([m.get("dx", 0) for m in monsters], float)
+        boxes[:, [0, 2]] -= dx[:, None]  # Back to where they started this step
+        touching = self.touching(boxes, np.column_stack((dx, np.zeros_like(dx))))
+        masks = np.array([m.get("hit", 0) for m in monsters])
+        touching &= (masks[:, None] & self._bits) == 0
+        if not touching.any():
+            return none, none
+        for monster, row in zip(monsters, touching):
+            monster["hit"] = monster.get("hit", 0) | int(self._bits[row].sum())
+        hits = touching.sum(axis=0)
+        absorbed = (hits > 0) & (self.shield > 0)
+        wounded = (hits > 0) & ~absorbed
+        self.shield[absorbed] = np.maximum(0, self.shield[absorbed] - balance.shield_hit_cost_frames * hits[absorbed])
+        self.lives[wounded] -= hits[wounded]
+        self.hit_flash[wounded] = balance.hit_flash_duration
+        return absorbed, wounded
+
+    def first_to_touch(self, start, move):
+        """Index of the lowest-numbered living player touched by box ``start`` swept by ``move``, or -1."""
+        touching = self.touching([start], [move])[0]
+        return int(touching.argmax()) if touching.any() else -1
+
+    def tick(self):
+        np.subtract(self.shield, 1, out=self.shield, where=self.shield > 0)
+        np.subtract(self.hit_flash, 1, out=self.hit_flash, where=self.hit_flash > 0)
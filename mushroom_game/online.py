@@ -0,0 +1,409 @@
+"""Live spectating and an online leaderboard over a small TCP protocol.
+
+A running game publishes one snapshot per frame (state, score, distance,
+player and monster positions) and submits every finished Level 2 run with
+its ghost recording as replay data. The game loop only appends to bounded
+deques; an asyncio loop on a daemon thread batches the snapshots every
+``BATCH_INTERVAL`` seconds, delta-encodes them and sends them, reconnecting
+with backoff when the server goes away. A full queue drops its oldest
+entries, so a slow or missing server never stalls a frame.
+
+Snapshots are flat tuples of ints. Each one is stored as zigzag varint
+deltas against the previous snapshot (one byte for most fields, since little
+changes between frames), with a full keyframe whenever the shape changes and
+every ``KEYFRAME_INTERVAL`` snapshots so spectators can join mid-stream.
+
+Enable with ``SHROOM_ONLINE=host:port``. ``python -m mushroom_game.online
+serve`` runs a local stand-in for both services; ``watch`` follows the live
+games on it and ``top`` prints its leaderboard.
+"""
+import asyncio
+import itertools
+import json
+import os
+import re
+import socket
+import struct
+import threading
+import time
+from collections import deque
+
+from .sim import GAMEOVER, LEVEL1, LEVEL2, LEVEL2_READY, MENU, WIN
+
+DEFAULT_ADDRESS = ("127.0.0.1", 8766)
+BATCH_INTERVAL = 0.1        # Seconds between snapshot batches
+SNAPSHOT_QUEUE = 600        # Ten seconds of frames buffered while disconnected
+RUN_QUEUE = 16
+KEYFRAME_INTERVAL = 64
+RECONNECT_DELAY = (0.5, 10.0)  # First and longest wait between connection attempts
+LEADERBOARD_SIZE = 100
+WATCHER_BACKLOG = 1 << 20   # Bytes queued to a spectator before it misses batches (and gets a keyframe after)
+
+FRAME = struct.Struct("<BI")  # message type, payload length
+MSG_HELLO, MSG_SNAPSHOTS, MSG_RUN, MSG_WATCH, MSG_TOP = 1, 2, 3, 4, 5
+STATES = (MENU, LEVEL1, LEVEL2, LEVEL2_READY, GAMEOVER, WIN)
+KEY, DELTA = 0, 1
+
+
+def snapshot(session):
+    """The session's visible state as a flat tuple of ints.
+
+    ``(frame, state, score, distance, players, *[x, y, lives] * players,
+    monsters, *[x, y] * monsters)``; a squad contributes one entry per player.
+    """
+    squad = getattr(session, "squad", None)
+    if squad is not None:
+        players = [(squad.player_x, int(squad.bottom[i]), int(squad.lives[i])) for i in range(squad.count)]
+    else:
+        players = [(session.player.x, session.player.bottom, session.lives)]
+    monsters = [monster["rect"].topleft for monster in session.monsters]
+    return (
+        session.frame, STATES.index(session.state), session.score, int(session.runner_distance),
+        len(players), *itertools.chain.from_iterable(players),
+        len(monsters), *itertools.chain.from_iterable(monsters),
+    )
+
+
+def describe(values):
+    """Turn a snapshot tuple back into a dict (for spectators and logs)."""
+    frame, state, score, distance, count = values[:5]
+    pos = 5 + 3 * count
+    players = [dict(zip(("x", "y", "lives"), values[i:i + 3])) for i in range(5, pos, 3)]
+    monsters = [values[i:i + 2] for i in range(pos + 1, pos + 1 + 2 * values[pos], 2)]
+    return {"frame": frame, "state": STATES[state], "score": score, "distance": distance, "players": players, "monsters": monsters}
+
+
+def _put_varint(out, value):
+    value = (value << 1) ^ (value >> 63)  # zigzag
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _get_varint(data, pos):
+    value = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return (value >> 1) ^ -(value & 1), pos
+        shift += 7
+
+
+class SnapshotEncoder:
+    """Encodes batches of snapshots as deltas against the previous one sent."""
+
+    def __init__(self):
+        self.previous = None
+        self.since_key = 0
+
+    def encode(self, snapshots):
+        out = bytearray()
+        _put_varint(out, len(snapshots))
+        for values in snapshots:
+            previous = self.previous
+            key = previous is None or len(previous) != len(values) or self.since_key >= KEYFRAME_INTERVAL
+            out.append(KEY if key else DELTA)
+            _put_varint(out, len(values))
+            if key:
+                for value in values:
+                    _put_varint(out, value)
+                self.since_key = 0
+            else:
+                for value, last in zip(values, previous):
+                    _put_varint(out, value - last)
+                self.since_key += 1
+            self.previous = values
+        return bytes(out)
+
+    def reset(self):
+        """Start the next batch with a keyframe (after a reconnect)."""
+        self.previous = None
+
+
+class SnapshotDecoder:
+    def __init__(self):
+        self.previous = None
+
+    def decode(self, data):
+        """Snapshots in ``data``; deltas seen before the first keyframe are skipped."""
+        count, pos = _get_varint(data, 0)
+        snapshots = []
+        for _ in range(count):
+            kind = data[pos]
+            length, pos = _get_varint(data, pos + 1)
+            values = []
+            for _ in range(length):
+                value, pos = _get_varint(data, pos)
+                values.append(value)
+            if kind == DELTA:
+                if self.previous is None:
+                    continue
+                values = [last + delta for last, delta in zip(self.previous, values)]
+            self.previous = tuple(values)
+            snapshots.append(self.previous)
+        return snapshots
+
+
+async def read_message(reader):
+    kind, length = FRAME.unpack(await reader.readexactly(FRAME.size))
+    return kind, await reader.readexactly(length)
+
+
+def write_message(writer, kind, payload=b""):
+    writer.write(FRAME.pack(kind, len(payload)) + payload)
+
+
+def pack_run(info, replay):
+    header = json.dumps(info, separators=(",", ":")).encode()
+    return struct.pack("<I", len(header)) + header + replay
+
+
+def unpack_run(payload):
+    (length,) = struct.unpack_from("<I", payload)
+    info = json.loads(payload[4:4 + length])
+    if not isinstance(info, dict):
+        raise ValueError("run info must be an object")
+    return info, payload[4 + length:]
+
+
+class OnlineClient:
+    """Streams snapshots and submits runs from a background asyncio loop."""
+
+    def __init__(self, host, port, player=None, batch_interval=BATCH_INTERVAL):
+        self.address = (host, port)
+        self.player = player or os.environ.get("SHROOM_KIOSK_ID") or socket.gethostname()
+        self.batch_interval = batch_interval
+        self.snapshots = deque(maxlen=SNAPSHOT_QUEUE)
+        self.runs = deque(maxlen=RUN_QUEUE)
+        self.sent_bytes = 0
+        self.sent_snapshots = 0
+        self.connected = False
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=lambda: asyncio.run(self._run()), name="online-client", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def publish(self, session):
+        """Queue this frame's snapshot; cheap enough to call every frame."""
+        self.snapshots.append(snapshot(session))
+
+    def submit_run(self, score, distance, replay, **info):
+        """Queue a finished run and its replay blob for the leaderboard."""
+        self.runs.append(({"player": self.player, "score": score, "distance": int(distance), "ts": round(time.time()), **info}, replay))
+
+    def close(self, timeout=2.0):
+        """Send what is queued (if connected) and stop the loop."""
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join(timeout)
+
+    async def _run(self):
+        encoder = SnapshotEncoder()
+        delay = RECONNECT_DELAY[0]
+        while not self._stop.is_set():
+            try:
+                _, writer = await asyncio.wait_for(asyncio.open_connection(*self.address), timeout=2.0)
+            except (OSError, asyncio.TimeoutError):
+                await self._sleep(delay)
+                delay = min(delay * 2, RECONNECT_DELAY[1])
+                continue
+            delay = RECONNECT_DELAY[0]
+            encoder.reset()
+            self.connected = True
+            try:
+                write_message(writer, MSG_HELLO, json.dumps({"player": self.player}).encode())
+                while True:
+                    stopping = self._stop.is_set()
+                    await self._send_pending(writer, encoder)
+                    if stopping:
+                        break
+                    await self._sleep(self.batch_interval)
+            except OSError:
+                pass
+            finally:
+                self.connected = False
+                writer.close()
+                try:
+                    await writer.wait_closed()
+                except OSError:
+                    pass
+
+    async def _send_pending(self, writer, encoder):
+        batch = []
+        try:
+            while True:
+                batch.append(self.snapshots.popleft())
+        except IndexError:
+            pass
+        if batch:
+            payload = encoder.encode(batch)
+            write_message(writer, MSG_SNAPSHOTS, payload)
+            self.sent_bytes += FRAME.size + len(payload)
+            self.sent_snapshots += len(batch)
+        while self.runs:
+            info, replay = self.runs.popleft()
+            write_message(writer, MSG_RUN, pack_run(info, replay))
+        await writer.drain()
+
+    async def _sleep(self, seconds):
+        # Wake early on close() so shutdown doesn't wait out a backoff
+        deadline = time.monotonic() + seconds
+        while not self._stop.is_set() and time.monotonic() < deadline:
+            await asyncio.sleep(min(0.05, seconds))
+
+
+class StandInServer:
+    """Local spectator relay and leaderboard, for development without a network.
+
+    Snapshot batches from each game are relayed verbatim to every watcher
+    (prefixed with the game's id) and decoded to keep each game's latest
+    state. A watcher that has missed a game's batches (it joined late or fell
+    behind) would apply the next deltas to a state it never saw, so it gets a
+    keyframe of that game's latest state instead and plain relaying resumes
+    from there. Runs are ranked by score; with ``replay_dir`` their replays
+    are written there as ``<rank id>.ghost`` files.
+    """
+
+    def __init__(self, leaderboard_file=None, replay_dir=None):
+        self.leaderboard_file = leaderboard_file
+        self.replay_dir = replay_dir
+        self.leaderboard = []
+        self.live = {}
+        self.watchers = {}  # writer -> ids of the games it needs a keyframe of
+        self._ids = itertools.count(1)
+        if leaderboard_file and os.path.exists(leaderboard_file):
+            with open(leaderboard_file) as f:
+                self.leaderboard = json.load(f)
+        if replay_dir:
+            os.makedirs(replay_dir, exist_ok=True)
+
+    async def handle(self, reader, writer):
+        game = next(self._ids)
+        decoder = SnapshotDecoder()
+        try:
+            while True:
+                kind, payload = await read_message(reader)
+                if kind == MSG_HELLO:
+                    self.live[game] = {"hello": json.loads(payload), "state": None}
+                elif kind == MSG_SNAPSHOTS:
+                    snapshots = decoder.decode(payload)
+                    if snapshots and game in self.live:
+                        self.live[game]["state"] = snapshots[-1]
+                    self.relay(game, payload, decoder.previous)
+                elif kind == MSG_RUN:
+                    self.add_run(*unpack_run(payload))
+                elif kind == MSG_WATCH:
+                    self.watchers[writer] = set(self.live)
+                elif kind == MSG_TOP:
+                    write_message(writer, MSG_TOP, json.dumps(self.leaderboard[:int(payload or 10)]).encode())
+                    await writer.drain()
+        except (asyncio.IncompleteReadError, OSError, ValueError, TypeError, IndexError, struct.error):
+            pass
+        finally:
+            self.live.pop(game, None)
+            self.watchers.pop(writer, None)
+            writer.close()
+
+    def relay(self, game, payload, latest=None):
+        """Send ``game``'s batch ``payload`` to the watchers; ``latest`` is its newest decoded snapshot."""
+        prefix = struct.pack("<I", game)
+        keyframe = None
+        for watcher, stale in list(self.watchers.items()):
+            if watcher.is_closing():
+                del self.watchers[watcher]
+            elif watcher.transport.get_write_buffer_size() >= WATCHER_BACKLOG:
+                # A watcher that can't keep up misses batches rather than growing the buffer
+                stale.add(game)
+            elif game not in stale:
+                write_message(watcher, MSG_SNAPSHOTS, prefix + payload)
+            elif latest is not None:
+                if keyframe is None:
+                    keyframe = prefix + SnapshotEncoder().encode([latest])
+                write_message(watcher, MSG_SNAPSHOTS, keyframe)
+                stale.discard(game)
+
+    def add_run(self, info, replay):
+        for key in ("score", "distance"):
+            value = info.get(key, 0)
+            if isinstance(value, bool) or not isinstance(value, int):
+                raise ValueError(f"run {key} must be an integer, got {value!r}")
+        # The id names the replay file, so the player name only contributes safe characters
+        player = re.sub(r"[^A-Za-z0-9_-]", "", str(info.get("player", "")))[:32] or "anon"
+        info["id"] = f"{int(time.time())}-{player}-{len(replay)}"
+        info["replay_bytes"] = len(replay)
+        self.leaderboard.append(info)
+        self.leaderboard.sort(key=lambda run: -run.get("score", 0))
+        del self.leaderboard[LEADERBOARD_SIZE:]
+        if self.replay_dir and replay:
+            with open(os.path.join(self.replay_dir, f"{info['id']}.ghost"), "wb") as f:
+                f.write(replay)
+        if self.leaderboard_file:
+            with open(self.leaderboard_file, "w") as f:
+                json.dump(self.leaderboard, f, indent=1)
+
+    async def serve(self, host, port):
+        server = await asyncio.start_server(self.handle, host, port)
+        async with server:
+            await server.serve_forever()
+
+
+async def fetch_leaderboard(host, port, count=10):
+    reader, writer = await asyncio.open_connection(host, port)
+    write_message(writer, MSG_TOP, str(count).encode())
+    await writer.drain()
+    _, payload = await read_message(reader)
+    writer.close()
+    return json.loads(payload)
+
+
+async def watch(host, port):
+    """Print each live game's latest state about once a second."""
+    reader, writer = await asyncio.open_connection(host, port)
+    write_message(writer, MSG_WATCH)
+    await writer.drain()
+    decoders = {}
+    shown = 0.0
+    while True:
+        _, payload = await read_message(reader)
+        (game,) = struct.unpack_from("<I", payload)
+        snapshots = decoders.setdefault(game, SnapshotDecoder()).decode(payload[4:])
+        if snapshots and time.monotonic() - shown >= 1.0:
+            shown = time.monotonic()
+            print(f"game {game}: {json.dumps(describe(snapshots[-1]))}", flush=True)
+
+
+def parse_address(text):
+    host, _, port = (text or "").rpartition(":")
+    return host or DEFAULT_ADDRESS[0], int(port or DEFAULT_ADDRESS[1])
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="python -m mushroom_game.online")
+    parser.add_argument("--address", default="%s:%d" % DEFAULT_ADDRESS, help="host:port of the server")
+    sub = parser.add_subparsers(dest="command", required=True)
+    serve_parser = sub.add_parser("serve", help="run the local stand-in server")
+    serve_parser.add_argument("--leaderboard", default="leaderboard.json")
+    serve_parser.add_argument("--replays", help="directory to keep submitted replays in")
+    sub.add_parser("watch", help="follow live games")
+    top_parser = sub.add_parser("top", help="print the leaderboard")
+    top_parser.add_argument("-n", type=int, default=10)
+    args = parser.parse_args()
+    host, port = parse_address(args.address)
+    try:
+        if args.command == "serve":
+            print(f"Stand-in server listening on {host}:{port}")
+            asyncio.run(StandInServer(args.leaderboard, args.replays).serve(host, port))
+        elif args.command == "watch":
+            asyncio.run(watch(host, port))
+        else:
+            for rank, run in enumerate(asyncio.run(fetch_leaderboard(host, port, args.n)), 1):
+                print(f"{rank:3}. {run['player']:<20} {run['score']:>6}  {run['distance']:>8,}")
+    except KeyboardInterrupt:
+        pass
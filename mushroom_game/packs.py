@@ -0,0 +1,165 @@
+"""Content packs: themes shipped as one indexed archive, layered over ``assets/``.
+
+    python -m mushroom_game.packs winter/ -o winter.zip   # build a pack from a folder
+    SHROOM_PACKS=winter.zip python -m mushroom_game         # play with it
+
+A pack is a zip file laid out like the assets directory (``menu_bg.jpg``,
+``mushroom_legs_run.png``, ``sounds/new_sfx/collect.wav``...) with an
+optional ``balance.toml`` or ``balance.json`` of balance overrides. It only
+needs the files it replaces; everything else still comes from ``assets/``.
+
+Opening a pack maps the archive and reads its central directory, the index
+of every member's name and offset, and nothing else: finding a name is one
+dict lookup, and a member's bytes are read from the mapping (a view with no
+copy for stored members, which is how ``build`` writes them, since images
+and sounds are compressed already) and decoded only when ``Assets`` asks for
+that asset. One file open per pack replaces an open and stat per probed
+name, which is what makes cold loads off slow kiosk storage quicker.
+"""
+import io
+import mmap
+import os
+import struct
+import warnings
+import zipfile
+import zlib
+
+from .config import BalanceConfig, apply_settings, parse_settings
+
+LOCAL_HEADER = struct.Struct("<4s22xHH")  # signature, then the name and extra field lengths
+CONFIG_NAMES = ("balance.toml", "balance.json")
+
+
+class ContentPack:
+    """One mapped pack archive and the index of its members."""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self.zip = zipfile.ZipFile(self.map)
+        except zipfile.BadZipFile:
+            self.map.close()
+            raise
+        self.index = {info.filename: info for info in self.zip.infolist() if not info.is_dir()}
+
+    def __contains__(self, name):
+        return name in self.index
+
+    def read(self, name):
+        """Bytes of member ``name``: a view of the mapping if it is stored, else decompressed bytes."""
+        info = self.index[name]
+        signature, name_len, extra_len = LOCAL_HEADER.unpack_from(self.map, info.header_offset)
+        if signature != b"PK\x03\x04":
+            raise zipfile.BadZipFile(f"{self.path}: bad local header for {name}")
+        start = info.header_offset + LOCAL_HEADER.size + name_len + extra_len
+        data = memoryview(self.map)[start:start + info.compress_size]
+        if info.compress_type == zipfile.ZIP_STORED:
+            return data
+        if info.compress_type == zipfile.ZIP_DEFLATED:
+            return zlib.decompress(data, -zlib.MAX_WBITS)
+        return self.zip.read(info)
+
+    def digest(self, name):
+        """A key for member ``name``'s content, from the index: its CRC and size."""
+        info = self.index[name]
+        return f"{info.CRC:08x}{info.file_size:08x}"
+
+    def close(self):
+        self.zip.close()
+        self.map.close()
+
+
+class Resource:
+    """One asset file found by ``AssetSource``: a loose file or a pack member."""
+
+    def __init__(self, name, path=None, pack=None):
+        self.name = name  # Relative name with extension, e.g. "sounds/new_sfx/hit.wav"
+        self.path = path
+        self.pack = pack
+
+    @property
+    def key(self):
+        """Where it came from, for messages and cache entry names."""
+        return self.path or f"{self.pack.path}/{self.name}"
+
+    @property
+    def digest(self):
+        """Content key for ``AssetCache``; None for loose files, which it hashes itself."""
+        return self.pack.digest(self.name) if self.pack else None
+
+    def file(self):
+        """Something ``pygame.image.load`` and ``pygame.mixer.Sound`` read: the path, or the member's bytes."""
+        return self.path or io.BytesIO(self.pack.read(self.name))
+
+
+class AssetSource:
+    """Looks assets up in the packs, the last one given first, then in ``folder``."""
+
+    def __init__(self, folder, packs=()):
+        self.folder = folder
+        self.packs = list(reversed(packs))
+
+    def find(self, name, extensions=("",)):
+        """The first ``Resource`` for ``name`` with one of ``extensions``, or None."""
+        for pack in self.packs:
+            for ext in extensions:
+                if name + ext in pack:
+                    return Resource(name + ext, pack=pack)
+        for ext in extensions:
+            path = os.path.join(self.folder, name + ext)
+            if os.path.exists(path):
+                return Resource(name + ext, path=path)
+        return None
+
+    def config(self, base=None):
+        """``base`` (the defaults if omitted) with each pack's balance overrides applied, first pack first."""
+        config = base or BalanceConfig()
+        for pack in reversed(self.packs):
+            for name in CONFIG_NAMES:
+                if name in pack:
+                    config = apply_settings(parse_settings(pack.read(name), name), config, f"{pack.path}/{name}")
+        return config
+
+
+def open_packs(paths):
+    """``ContentPack``s for the non-empty entries of an ``os.pathsep``-separated list of paths.
+
+    A pack that can't be opened is skipped with a warning; the game runs on without it.
+    """
+    packs = []
+    for path in filter(None, paths.split(os.pathsep)):
+        try:
+            packs.append(ContentPack(path))
+        except (OSError, ValueError, zipfile.BadZipFile) as exc:
+            warnings.warn(f"Content pack {path} skipped: {exc}")
+    return packs
+
+
+def build(folder, out):
+    """Write every file under ``folder`` into pack ``out``, stored so members map uncompressed."""
+    count = 0
+    with zipfile.ZipFile(out, "w", zipfile.ZIP_STORED) as archive:
+        for root, dirs, files in os.walk(folder):
+            dirs.sort()
+            for filename in sorted(files):
+                path = os.path.join(root, filename)
+                archive.write(path, os.path.relpath(path, folder).replace(os.sep, "/"))
+                count += 1
+    return count
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="python -m mushroom_game.packs", description=__doc__.split("\n\n")[0])
+    parser.add_argument("folder", help="folder laid out like assets/, holding the files the pack replaces")
+    parser.add_argument("-o", "--out", required=True, help="pack file to write")
+    args = parser.parse_args(argv)
+    count = build(args.folder, args.out)
+    print(f"{args.out}: {count} files")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,565 @@
+"""Particle effects: creation, per-frame update, drawing and the game's emitters.
+
+Particles are plain dicts in a list owned by the session. Emitters append the
+bursts used by gameplay feedback and ambient spores; they use the module
+``random`` so cosmetic effects never disturb a seeded simulation.
+
+When that list is a ``ParticleBudget``, every emitter first asks it how many
+particles it may add. The budget enforces a global cap and per-category
+quotas (``particle_*`` settings of the balance config, so they hot-reload), evicts the least important particles to make room for gameplay
+feedback, and scales bursts down (and drops spore glows) once it is nearly
+full, so chaotic moments cost a bounded amount of update and draw time.
+Plain lists still work and are never limited.
+"""
+import math
+import random
+
+import pygame
+
+from .config import BalanceConfig
+from .events import Dashed, HeartPickup, MushroomCaught, MushroomMissed, PlayerHit, ShieldAbsorb, ShieldPickup
+
+# Emission categories, most important last. Feedback marks something the player
+# did or suffered, movement follows the player, aura and ambient are decoration.
+AMBIENT, AURA, MOVEMENT, FEEDBACK = "ambient", "aura", "movement", "feedback"
+PRIORITY = {AMBIENT: 0, AURA: 1, MOVEMENT: 2, FEEDBACK: 3}
+LOD_THRESHOLD = 0.75  # Fraction of the cap where level of detail starts dropping
+MIN_BURST_SCALE = 0.25  # Feedback bursts shrink to this fraction at the cap
+
+
+def create_particle(
+    x,
+    y,
+    color,
+    velocity=(0, 0),
+    life=30,
+    size_range=(2, 6),
+    gravity=0.2,
+    fade=True,
+    shrink=True,
+    friction=0.96,
+    kind="spark",
+    color_end=None,
+    category=FEEDBACK,
+):
+    """Create a particle effect with configurable behaviour."""
+    size_min, size_max = size_range if isinstance(size_range, (tuple, list)) else (size_range, size_range)
+    size = random.randint(int(size_min), int(size_max))
+    vx, vy = velocity
+    return {
+        "x": x,
+        "y": y,
+        "vx": vx + random.uniform(-1.5, 1.5),
+        "vy": vy + random.uniform(-1.2, 1.2),
+        "color": color,
+        "color_end": color_end,
+        "life": life,
+        "max_life": life,
+        "size": size,
+        "gravity": gravity,
+        "fade": fade,
+        "shrink": shrink,
+        "friction": friction,
+        "kind": kind,
+        "category": category,
+    }
+
+def update_particles(particles):
+    """Advance all particle effects one frame and drop the expired ones"""
+    for particle in particles:
+        particle["x"] += particle["vx"]
+        particle["y"] += particle["vy"]
+        particle["vx"] *= particle.get("friction", 1.0)
+        particle["vy"] += particle.get("gravity", 0)
+
+        if particle["kind"] == "spore":
+            particle["vx"] += math.sin(particle["life"] * 0.08) * 0.05
+            particle["vy"] += math.cos(particle["life"] * 0.05) * 0.02
+        elif particle["kind"] == "ember":
+            particle["vx"] += random.uniform(-0.05, 0.05)
+            particle["vy"] -= 0.02
+        elif particle["kind"] == "dust":
+            particle["vx"] *= 0.94
+
+        particle["life"] -= 1
+    particles[:] = [p for p in particles if p["life"] > 0]
+    if isinstance(particles, ParticleBudget):
+        particles.recount()
+
+
+class ParticleBudget(list):
+    """Particle list that bounds how many particles emitters may add.
+
+    ``grant(category, count)`` is asked before each burst and returns how
+    many particles to create, after applying, in order:
+
+    - level of detail: past ``LOD_THRESHOLD`` of the cap, ambient and aura
+      emission stops and other bursts shrink towards ``MIN_BURST_SCALE``;
+    - the category quota: the oldest particles of the same category make
+      way for movement and feedback, lower categories are just clipped;
+    - the global cap: particles of lower priority (or the same category)
+      are evicted, least visible first, before the burst is clipped.
+    """
+
+    def __init__(self, cap=None, quotas=None):
+        super().__init__()
+        self.dropped = 0  # Particles requested but never created
+        self.evicted = 0
+        default_cap, default_quotas = budget_limits(BalanceConfig())
+        self.resize(cap or default_cap, quotas or default_quotas)
+
+    def resize(self, cap, quotas):
+        """Apply a new cap and quotas; particles already over them are left to expire."""
+        self.cap = cap
+        self.quotas = dict(quotas)
+        self.recount()
+
+    @property
+    def lod(self):
+        """True while the budget is nearly full; drawing skips spore glows."""
+        return len(self) >= self.cap * LOD_THRESHOLD
+
+    def recount(self):
+        counts = dict.fromkeys(self.quotas, 0)
+        for particle in self:
+            counts[particle["category"]] += 1
+        self.counts = counts
+
+    def grant(self, category, count):
+        requested = count
+        priority = PRIORITY[category]
+        load = len(self) / self.cap
+        if load >= LOD_THRESHOLD:
+            if priority < PRIORITY[MOVEMENT]:
+                count = 0
+            else:
+                depth = min(1.0, (load - LOD_THRESHOLD) / (1 - LOD_THRESHOLD))
+                count = max(1, round(count * (1 - depth * (1 - MIN_BURST_SCALE))))
+
+        over_quota = self.counts[category] + count - self.quotas[category]
+        if over_quota > 0:
+            if priority >= PRIORITY[MOVEMENT]:
+                over_quota -= self._evict(over_quota, lambda p: p["category"] == category)
+            count = max(0, count - over_quota)
+
+        over_cap = len(self) + count - self.cap
+        if over_cap > 0:
+            over_cap -= self._evict(
+                over_cap, lambda p: PRIORITY[p["category"]] < priority or p["category"] == category
+            )
+            count = max(0, count - over_cap)
+
+        self.counts[category] += count
+        self.dropped += requested - count
+        return count
+
+    def _evict(self, count, eligible):
+        """Remove up to ``count`` eligible particles, lowest priority and faintest first."""
+        candidates = [p for p in self if eligible(p)]
+        if not candidates:
+            return 0
+        candidates.sort(key=lambda p: (PRIORITY[p["category"]], p["life"] / p["max_life"]))
+        victims = {id(p) for p in candidates[:count]}
+        self[:] = [p for p in self if id(p) not in victims]
+        self.recount()
+        self.evicted += len(victims)
+        return len(victims)
+
+
+class SilentBudget(ParticleBudget):
+    """A budget that grants nothing, for headless runs where no one sees the effects."""
+
+    def grant(self, category, count):
+        return 0
+
+
+def budget_limits(balance):
+    """``(cap, quotas)`` for a ``ParticleBudget`` from a ``BalanceConfig``."""
+    quotas = {
+        AMBIENT: balance.particle_quota_ambient,
+        AURA: balance.particle_quota_aura,
+        MOVEMENT: balance.particle_quota_movement,
+        FEEDBACK: balance.particle_quota_feedback,
+    }
+    return balance.particle_cap, quotas
+
+
+def grant(particles, category, count):
+    """How many of ``count`` particles an emitter may add to ``particles``."""
+    if isinstance(particles, ParticleBudget):
+        return particles.grant(category, count)
+    return count
+
+def particle_style(particle):
+    """Resolve a particle's current ``(color, alpha, size)``, or None when it's invisible."""
+    life_ratio = particle["life"] / particle["max_life"] if particle["max_life"] else 0
+    base_color = particle["color"]
+    if particle.get("color_end"):
+        end_color = particle["color_end"]
+        blend = 1 - life_ratio
+        color = tuple(
+            int(base_color[i] + (end_color[i] - base_color[i]) * blend) for i in range(3)
+        )
+    else:
+        color = base_color
+
+    alpha = int(255 * life_ratio) if particle.get("fade", True) else 255
+    size = particle["size"]
+    if particle.get("shrink", True):
+        size = max(1, int(size * life_ratio))
+
+    if size <= 0 or alpha <= 0:
+        return None
+    return color, alpha, size
+
+def draw_particles(screen, particles, renderer=None, lights=None):
+    """Draw all particle effects; spores glow through ``lights`` (a ``lighting.LightMap``) when given."""
+    if renderer is not None and renderer.accelerated:
+        renderer.draw_particles(particles)
+        return
+    glows = lights is not None and not getattr(particles, "lod", False)
+    for particle in particles:
+        style = particle_style(particle)
+        if style is None:
+            continue
+        color, alpha, size = style
+
+        if particle["kind"] in ("dust", "dash"):
+            surf = pygame.Surface((size * 3, size * 2), pygame.SRCALPHA)
+            rect = surf.get_rect()
+            pygame.draw.ellipse(
+                surf,
+                (*color, alpha),
+                (rect.width // 6, rect.height // 4, rect.width * 2 // 3, rect.height // 2),
+            )
+            screen.blit(surf, (particle["x"] - rect.width // 2, particle["y"] - rect.height // 2))
+        else:
+            surf = pygame.Surface((size * 2, size * 2), pygame.SRCALPHA)
+            pygame.draw.circle(surf, (*color, alpha), (size, size), size)
+            if particle["kind"] == "spore" and glows:
+                lights.add(particle["x"], particle["y"], size * 3, color, alpha / 400)
+            screen.blit(surf, (particle["x"] - size, particle["y"] - size))
+
+
+def emit_ambient_spore(particles, scene, width, height, runner_speed=0):
+    """Spawn one drifting background spore; returns frames until the next one.
+
+    Spores are the first thing a busy budget skips; the delay is still returned.
+    """
+    if not grant(particles, AMBIENT, 1):
+        return {"menu": 10, "level1": 6}.get(scene, 5)
+    if scene == "menu":
+        particles.append(
+            create_particle(
+                random.uniform(60, width - 60),
+                random.uniform(height * 0.2, height * 0.75),
+                (190, 220, 255),
+                velocity=(random.uniform(-0.25, 0.25), random.uniform(-0.1, 0.1)),
+                life=random.randint(110, 160),
+                size_range=(3, 6),
+                gravity=-0.004,
+                fade=True,
+                shrink=False,
+                friction=0.99,
+                kind="spore",
+                color_end=(140, 180, 255),
+                category=AMBIENT,
+            )
+        )
+        return random.randint(10, 24)
+    if scene == "level1":
+        particles.append(
+            create_particle(
+                random.uniform(40, width - 40),
+                random.uniform(height * 0.12, height * 0.55),
+                (200, 240, 255),
+                velocity=(random.uniform(-0.4, 0.4), random.uniform(-0.2, 0.2)),
+                life=random.randint(90, 140),
+                size_range=(3, 6),
+                gravity=-0.006,
+                fade=True,
+                shrink=False,
+                friction=0.985,
+                kind="spore",
+                color_end=(160, 200, 255),
+                category=AMBIENT,
+            )
+        )
+        return random.randint(6, 16)
+    particles.append(
+        create_particle(
+            random.uniform(0, width),
+            random.uniform(height * 0.05, height * 0.45),
+            (150, 210, 255),
+            velocity=(random.uniform(-0.6, 0.6) - runner_speed * 0.03, random.uniform(-0.15, 0.15)),
+            life=random.randint(110, 160),
+            size_range=(3, 6),
+            gravity=-0.004,
+            fade=True,
+            shrink=False,
+            friction=0.988,
+            kind="spore",
+            color_end=(120, 180, 255),
+            category=AMBIENT,
+        )
+    )
+    return random.randint(5, 12)
+
+
+def emit_catch_burst(particles, x, y):
+    for _ in range(grant(particles, FEEDBACK, 18)):
+        particles.append(
+            create_particle(
+                x,
+                y,
+                (255, 220, 120),
+                velocity=(random.uniform(-1.5, 1.5), random.uniform(-3.5, 0.5)),
+                life=random.randint(28, 40),
+                size_range=(3, 6),
+                gravity=0.18,
+                kind="spark",
+                color_end=(255, 160, 40),
+                category=FEEDBACK,
+            )
+        )
+    ring = grant(particles, FEEDBACK, 8)
+    for i in range(ring):
+        radians = math.tau * i / ring
+        particles.append(
+            create_particle(
+                x + math.cos(radians) * 30,
+                y + math.sin(radians) * 30,
+                (255, 240, 180),
+                velocity=(math.cos(radians) * 1.5, math.sin(radians) * 1.5),
+                life=36,
+                size_range=(2, 4),
+                gravity=-0.05,
+                fade=True,
+                shrink=False,
+                friction=0.92,
+                kind="spore",
+                color_end=(180, 220, 255),
+                category=FEEDBACK,
+            )
+        )
+
+
+def emit_storm_catch(particles, x, y):
+    for _ in range(grant(particles, FEEDBACK, 6)):
+        particles.append(
+            create_particle(
+                x,
+                y,
+                (255, 220, 120),
+                velocity=(random.uniform(-1.5, 1.5), random.uniform(-3.5, 0.5)),
+                life=random.randint(20, 30),
+                size_range=(2, 5),
+                gravity=0.18,
+                kind="spark",
+                color_end=(255, 160, 40),
+                category=FEEDBACK,
+            )
+        )
+
+
+def emit_miss_dust(particles, x, ground_y):
+    for _ in range(grant(particles, FEEDBACK, 12)):
+        particles.append(
+            create_particle(
+                x,
+                ground_y,
+                (255, 120, 120),
+                velocity=(random.uniform(-1.2, 1.2), random.uniform(-2.5, -0.5)),
+                life=30,
+                size_range=(3, 5),
+                gravity=0.25,
+                kind="dust",
+                color_end=(200, 60, 60),
+                category=FEEDBACK,
+            )
+        )
+
+
+def emit_dash(particles, x, y):
+    for _ in range(grant(particles, MOVEMENT, 24)):
+        particles.append(
+            create_particle(
+                x,
+                y,
+                (140, 220, 255),
+                velocity=(random.uniform(-3, 3), random.uniform(-4, -1)),
+                life=random.randint(24, 36),
+                size_range=(3, 6),
+                gravity=0.22,
+                fade=True,
+                shrink=False,
+                friction=0.9,
+                kind="dash",
+                color_end=(30, 140, 255),
+                category=MOVEMENT,
+            )
+        )
+
+
+def emit_landing_dust(particles, x, ground_y, runner_speed):
+    for offset in (-18, 18)[:grant(particles, MOVEMENT, 2)]:
+        particles.append(
+            create_particle(
+                x + offset,
+                ground_y,
+                (220, 210, 180),
+                velocity=(offset * 0.08 - runner_speed * 0.35, random.uniform(-3.2, -1.2)),
+                life=34,
+                size_range=(4, 7),
+                gravity=0.36,
+                fade=True,
+                shrink=True,
+                friction=0.92,
+                kind="dust",
+                color_end=(150, 120, 90),
+                category=MOVEMENT,
+            )
+        )
+
+
+def emit_trail_dust(particles, x, y, runner_speed):
+    if not grant(particles, MOVEMENT, 1):
+        return
+    particles.append(
+        create_particle(
+            x,
+            y,
+            (210, 200, 160),
+            velocity=(-runner_speed * 0.45 - 0.5, random.uniform(-2.0, -0.8)),
+            life=26,
+            size_range=(3, 5),
+            gravity=0.3,
+            fade=True,
+            shrink=True,
+            friction=0.9,
+            kind="dust",
+            color_end=(140, 120, 90),
+            category=MOVEMENT,
+        )
+    )
+
+
+def emit_shield_sparkle(particles, cx, cy):
+    """Occasional orbiting sparkle while the shield is up (30% chance per frame)."""
+    if random.random() >= 0.3 or not grant(particles, AURA, 1):
+        return
+    angle = random.uniform(0, math.tau)
+    radius = random.uniform(20, 34)
+    particles.append(
+        create_particle(
+            cx + math.cos(angle) * radius,
+            cy + math.sin(angle) * radius,
+            (130, 200, 255),
+            velocity=(math.cos(angle) * 0.6, math.sin(angle) * 0.6),
+            life=28,
+            size_range=(2, 4),
+            gravity=0,
+            fade=True,
+            shrink=False,
+            friction=0.92,
+            kind="spore",
+            color_end=(60, 160, 255),
+            category=AURA,
+        )
+    )
+
+
+def emit_shield_absorb(particles, x, y):
+    for _ in range(grant(particles, FEEDBACK, 10)):
+        particles.append(
+            create_particle(
+                x,
+                y,
+                (160, 220, 255),
+                velocity=(random.uniform(-2.0, 2.0), random.uniform(-2.5, 0.5)),
+                life=26,
+                size_range=(2, 4),
+                gravity=0.1,
+                fade=True,
+                shrink=False,
+                friction=0.9,
+                kind="spore",
+                color_end=(80, 160, 255),
+                category=FEEDBACK,
+            )
+        )
+
+
+def emit_hit_burst(particles, x, y):
+    for _ in range(grant(particles, FEEDBACK, 16)):
+        particles.append(
+            create_particle(
+                x,
+                y,
+                (255, 120, 120),
+                velocity=(random.uniform(-2.5, 2.5), random.uniform(-3.5, 1.0)),
+                life=32,
+                size_range=(3, 5),
+                gravity=0.25,
+                fade=True,
+                shrink=True,
+                friction=0.9,
+                kind="spark",
+                color_end=(255, 60, 60),
+                category=FEEDBACK,
+            )
+        )
+
+
+def emit_heart_pickup(particles, x, y):
+    for _ in range(grant(particles, FEEDBACK, 14)):
+        particles.append(
+            create_particle(
+                x,
+                y,
+                (255, 150, 180),
+                velocity=(random.uniform(-2.0, 2.0), random.uniform(-2.5, 0.5)),
+                life=30,
+                size_range=(3, 6),
+                gravity=0.15,
+                fade=True,
+                shrink=False,
+                friction=0.9,
+                kind="spark",
+                color_end=(255, 200, 200),
+                category=FEEDBACK,
+            )
+        )
+
+
+def emit_shield_pickup(particles, x, y):
+    for _ in range(grant(particles, FEEDBACK, 16)):
+        particles.append(
+            create_particle(
+                x,
+                y,
+                (120, 200, 255),
+                velocity=(random.uniform(-1.5, 1.5), random.uniform(-2.0, 1.0)),
+                life=32,
+                size_range=(3, 5),
+                gravity=0.1,
+                fade=True,
+                shrink=False,
+                friction=0.92,
+                kind="spore",
+                color_end=(60, 150, 255),
+                category=FEEDBACK,
+            )
+        )
+
+
+# Burst emitted at an event's position, per gameplay event type (see ``events``)
+EVENT_BURSTS = {
+    MushroomCaught: emit_catch_burst,
+    MushroomMissed: emit_miss_dust,
+    Dashed: emit_dash,
+    PlayerHit: emit_hit_burst,
+    ShieldAbsorb: emit_shield_absorb,
+    HeartPickup: emit_heart_pickup,
+    ShieldPickup: emit_shield_pickup,
+}
@@ -0,0 +1,321 @@
+"""Optional two-stage frame pipeline: simulation on its own thread, drawing on the main one.
+
+By default one thread handles events, steps the simulation and particles,
+composes the frame and flips it, each waiting on the last. With
+``SHROOM_PIPELINE=1`` a simulation thread steps the ``Session`` at ``FPS``
+and publishes every frame into a ``FrameBuffer`` as an immutable snapshot:
+``savestate.dump`` bytes plus the frame's sounds and the front-end fields
+the HUD shows. The main thread handles events, takes the newest snapshot,
+restores it into a view session of its own and draws and flips that, while
+the next frame is already being simulated. Blits, smooth scaling, the flip
+and the NumPy storm and squad math release the GIL, so on a multi-core
+kiosk the two stages overlap instead of adding up.
+
+The session is only ever touched by the simulation thread: commands,
+resizes and balance reloads from the main thread go through
+``Pipeline.call`` and run between steps. ``PacingStats`` keeps per-stage
+frame times (simulate, snapshot, restore, draw, the frame interval) so the
+game can report them on exit.
+
+    python -m mushroom_game.pipeline --script "3:start,200:+right" --frames 600 --size 1920x1080
+
+renders the same scripted run sequentially and pipelined, reports both
+frame rates, and checks that both ended in the same simulation state.
+"""
+import queue
+import threading
+import time
+from collections import deque
+
+from . import savestate
+from .sim import FPS
+
+PACING_SAMPLES = FPS * 60  # Frame times kept per stage
+
+
+class Frame:
+    """One simulated frame as published for drawing."""
+
+    __slots__ = ("number", "state", "sfx", "front")
+
+    def __init__(self, number, state, sfx, front):
+        self.number = number
+        self.state = state  # savestate snapshot bytes
+        self.sfx = sfx
+        self.front = front  # Session fields set by the front end, see FRONT_FIELDS
+
+
+# Shown by the HUD but not part of a snapshot
+FRONT_FIELDS = ("highscore", "best_ghost", "ghost", "ghost_pose", "saved_run")
+
+
+def snapshot(session):
+    """The session's current frame; its sounds move into the frame."""
+    sfx = session.sfx[:]
+    session.sfx.clear()
+    front = tuple(getattr(session, name) for name in FRONT_FIELDS)
+    return Frame(session.frame, savestate.dump(session, particles=True), sfx, front)
+
+
+def show(view, frame):
+    """Restore ``frame`` into ``view``, the session the main thread draws."""
+    # Without a best ghost, restore leaves the simulation's ghost cursor alone
+    view.best_ghost = None
+    savestate.restore(view, frame.state)
+    for name, value in zip(FRONT_FIELDS, frame.front):
+        setattr(view, name, value)
+
+
+class FrameBuffer:
+    """Double buffer of frames between one producing thread and one consumer.
+
+    ``publish`` fills the back slot and ``take`` swaps it to the front. In
+    ``lockstep`` the producer waits until the consumer took the last frame,
+    so every frame is drawn. Otherwise a frame not taken in time is replaced
+    by the newer one, its sounds carried over, and counted in ``dropped``.
+    """
+
+    def __init__(self, lockstep=False):
+        self.lockstep = lockstep
+        self.front = None
+        self.dropped = 0
+        self._back = None
+        self._closed = False
+        self._changed = threading.Condition()
+
+    def publish(self, frame):
+        with self._changed:
+            while self.lockstep and self._back is not None and not self._closed:
+                self._changed.wait()
+            if self._back is not None:
+                self.dropped += 1
+                frame.sfx = self._back.sfx + frame.sfx
+            self._back = frame
+            self._changed.notify_all()
+
+    def take(self, timeout=None):
+        """The newest frame, waiting up to ``timeout`` seconds for one; None if none came."""
+        with self._changed:
+            self._changed.wait_for(lambda: self._back is not None or self._closed, timeout)
+            frame, self._back = self._back, None
+            if frame is not None:
+                self.front = frame
+                self._changed.notify_all()
+            return frame
+
+    def close(self):
+        with self._changed:
+            self._closed = True
+            self._changed.notify_all()
+
+
+class PacingStats:
+    """Recent frame times per stage, in milliseconds."""
+
+    def __init__(self, samples=PACING_SAMPLES):
+        self.samples = samples
+        self.stages = {}
+        self._lock = threading.Lock()
+
+    def add(self, stage, ms):
+        with self._lock:
+            times = self.stages.get(stage)
+            if times is None:
+                times = self.stages[stage] = deque(maxlen=self.samples)
+            times.append(ms)
+
+    def summary(self):
+        """``{stage: (frames, mean ms, p95 ms)}``."""
+        with self._lock:
+            stages = {stage: sorted(times) for stage, times in self.stages.items()}
+        return {
+            stage: (len(times), sum(times) / len(times), times[min(len(times) - 1, int(len(times) * 0.95))])
+            for stage, times in stages.items() if times
+        }
+
+    def report(self):
+        lines = [f"{'stage':<10} {'frames':>7} {'mean ms':>8} {'p95 ms':>7}"]
+        for stage, (count, mean, p95) in self.summary().items():
+            lines.append(f"{stage:<10} {count:7d} {mean:8.2f} {p95:7.2f}")
+        return "\n".join(lines)
+
+
+class Pipeline:
+    """Steps ``session`` on a simulation thread and publishes a ``Frame`` after every step.
+
+    ``step(session, held)`` is one frame of simulation work (the step and
+    whatever must follow it, like saving the high score); ``held`` is the
+    input set last given to ``set_inputs``. ``fps`` paces the thread, or
+    None runs it flat out, as the benchmark does in ``lockstep``.
+    """
+
+    def __init__(self, session, step, fps=FPS, lockstep=False, stats=None):
+        self.session = session
+        self.frames = FrameBuffer(lockstep)
+        self.stats = stats or PacingStats()
+        self.interval = 1 / fps if fps else 0
+        self._step = step
+        self._held = {}
+        self._calls = queue.SimpleQueue()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="simulation", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def set_inputs(self, held):
+        self._held = held
+
+    def call(self, func, *args):
+        """Run ``func(*args)`` on the simulation thread before its next step."""
+        self._calls.put((func, args))
+
+    def _run_calls(self):
+        while True:
+            try:
+                func, args = self._calls.get_nowait()
+            except queue.Empty:
+                return
+            func(*args)
+
+    def _run(self):
+        due = time.perf_counter()
+        while not self._stop.is_set():
+            self._run_calls()
+            started = time.perf_counter()
+            self._step(self.session, self._held)
+            stepped = time.perf_counter()
+            frame = snapshot(self.session)
+            self.stats.add("simulate", (stepped - started) * 1000)
+            self.stats.add("snapshot", (time.perf_counter() - stepped) * 1000)
+            self.frames.publish(frame)
+            if self.interval:
+                # Keep to the frame grid; after a long stall start a fresh one rather than catch up
+                due = max(due + self.interval, time.perf_counter() - self.interval)
+                delay = due - time.perf_counter()
+                if delay > 0:
+                    self._stop.wait(delay)
+
+    def stop(self):
+        """Stop the thread; calls queued after its last step run here, so none are lost."""
+        self._stop.set()
+        self.frames.close()
+        self._thread.join()
+        self._run_calls()
+
+
+def timed_run(commands, frames, size, seed, pipelined, stats=None):
+    """Play the scripted run through; returns (seconds, last frame's snapshot bytes)."""
+    started = time.perf_counter()
+    state = None
+    for _, _, state in _scripted(commands, frames, size, seed, pipelined, stats):
+        pass
+    return time.perf_counter() - started, state
+
+
+def _scripted(commands, frames, size, seed, pipelined, stats=None):
+    """Yield ``(frame, surface, snapshot bytes)`` for the scripted run, like ``capture.play``."""
+    import random
+
+    import pygame
+
+    from .assets import Assets
+    from .capture import HELD_INPUTS
+    from .main import apply_command, draw_frame, draw_paused
+    from .renderer import OffscreenRenderer
+    from .sim import GAMEOVER, WIN, Session, step_inputs, storm_available
+
+    # One hidden display for both runs: recreating it disturbs surfaces converted for the last one
+    if pygame.display.get_surface() is None:
+        pygame.display.set_mode((1, 1))
+    renderer = OffscreenRenderer(size)
+    screen = renderer.surface
+    assets = Assets(*size)
+    storm_enabled = storm_available()
+    session = Session(*size, seed=seed)
+    random.seed(seed)
+    script = {"index": 0, "held": dict.fromkeys(HELD_INPUTS, False)}
+
+    def step(session, held):
+        # Scripted input is applied where the game applies it: on the simulation side
+        held = script["held"]
+        for command in commands.get(script["index"], ()):
+            if command[:1] in "+-" and command[1:] in held:
+                held[command[1:]] = command[0] == "+"
+            else:
+                apply_command(session, command, storm_enabled)
+        script["index"] += 1
+        if not (session.paused and session.state not in (GAMEOVER, WIN)):
+            session.step(**step_inputs(held, session.squad))
+
+    if not pipelined:
+        for index in range(frames):
+            step(session, None)
+            state = snapshot(session).state
+            if session.paused and session.state not in (GAMEOVER, WIN):
+                draw_paused(screen, renderer)
+            else:
+                draw_frame(screen, renderer, session, assets, storm_enabled)
+            yield index, screen, state
+        return
+
+    view = Session(*size)
+    pipeline = Pipeline(session, step, fps=None, lockstep=True, stats=stats).start()
+    try:
+        for index in range(frames):
+            frame = pipeline.frames.take()
+            started = time.perf_counter()
+            show(view, frame)
+            restored = time.perf_counter()
+            if view.paused and view.state not in (GAMEOVER, WIN):
+                draw_paused(screen, renderer)
+            else:
+                draw_frame(screen, renderer, view, assets, storm_enabled)
+            stats.add("restore", (restored - started) * 1000)
+            stats.add("draw", (time.perf_counter() - restored) * 1000)
+            yield index, screen, frame.state
+    finally:
+        pipeline.stop()
+
+
+def main(argv=None):
+    import argparse
+    import os
+    import sys
+
+    from .capture import DEFAULT_SIZE, parse_inline
+
+    parser = argparse.ArgumentParser(prog="python -m mushroom_game.pipeline", description=__doc__.split("\n\n")[0])
+    parser.add_argument("--script", default="3:start,60:+right,120:-right", help='inline capture script (see capture)')
+    parser.add_argument("--frames", type=int, default=600, help="frames to run (default 600)")
+    parser.add_argument("--size", help="frame size WxH (default 1280x720)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    _, commands = parse_inline(args.script)
+    size = tuple(int(v) for v in args.size.lower().split("x")) if args.size else DEFAULT_SIZE
+
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    import pygame
+
+    pygame.init()
+    stats = PacingStats(samples=args.frames)
+    sequential, expected = timed_run(commands, args.frames, size, args.seed, pipelined=False)
+    pipelined, state = timed_run(commands, args.frames, size, args.seed, pipelined=True, stats=stats)
+    pygame.quit()
+
+    print(f"{args.frames} frames at {size[0]}x{size[1]} on {os.cpu_count()} CPUs")
+    print(f"sequential {args.frames / sequential:6.1f} fps")
+    print(f"pipelined  {args.frames / pipelined:6.1f} fps ({sequential / pipelined:.2f}x)")
+    print(stats.report())
+    if state != expected:
+        print("the two runs ended in different states", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    import sys
+
+    sys.exit(main())
@@ -0,0 +1,127 @@
+"""Idle-time prewarming of the caches the next scenes draw from.
+
+The first frame of a level builds its HUD panels, fonts and text, ground
+strip, gradient overlays, shadows, glows and light stamps, which costs
+several frames' worth of time right as play starts. ``Prewarmer`` does that
+work in advance: it draws each scene a piece at a time into a scratch
+surface that is never shown, from a throwaway session, and the sprite caches
+keep what it made. ``main`` runs it in the time left over in menu, end-screen
+and pause frames.
+
+Pieces are small (one big cache entry, or one scene's sprites, or one HUD)
+and a piece only starts when the slowest piece so far would still fit in
+what is left of the frame, so idle frames keep their rate. Pieces grow with
+the screen; where they outgrow an idle frame, the estimate eases off a frame
+at a time until one runs.
+
+Sounds need no warming; ``Assets`` decodes them all at load.
+"""
+import time
+
+import pygame
+
+from . import hud, render
+from .hud import MAX_SQUAD
+from .lighting import LightMap
+from .sim import Session
+
+# Each frame with no room for the slowest piece yet expects a little less of it
+SLOWEST_DECAY = 0.9
+
+
+class Prewarmer:
+    """Draws the play scenes ahead of time for the screen's size, a few pieces per call to ``run``."""
+
+    def __init__(self, assets, storm_enabled=False, ui_scale=1.0):
+        self.assets = assets
+        self.storm_enabled = storm_enabled
+        self.ui_scale = ui_scale
+        self.size = None
+        self.steps = None
+        self.slowest = 0.0  # Seconds a piece is expected to take at most
+
+    def run(self, screen, seconds):
+        """Warm pieces for ``screen``'s size within ``seconds``; starts over when the size changes."""
+        now = time.perf_counter()
+        deadline = now + seconds
+        size = screen.get_size()
+        if size != self.size:
+            self.size = size
+            self.steps = self.warm(pygame.Surface(size, 0, screen))
+        if self.steps is not None and now + self.slowest >= deadline:
+            # One unusually slow piece mustn't stop warming for good
+            self.slowest *= SLOWEST_DECAY
+        while self.steps is not None and now + self.slowest < deadline:
+            if next(self.steps, None) is None:
+                self.steps = None
+            started, now = now, time.perf_counter()
+            self.slowest = max(self.slowest, now - started)
+
+    def warm(self, scratch):
+        """Generator drawing one piece per step onto ``scratch``; each step yields True."""
+        from .main import PAUSE_GRADIENT, draw_paused
+        from .renderer import OffscreenRenderer
+
+        size = scratch.get_size()
+        assets, ui_scale = self.assets, self.ui_scale
+        # Lights only need adding to make their stamps; this map is never composited
+        lights = LightMap(size)
+        session = Session(*size, seed=0, effects=False)
+
+        session.start_level1()
+        render.draw_level1_scene(scratch, session, assets, lights)
+        yield True
+        hud.draw_level1_hud(scratch, session, assets, ui_scale)
+        yield True
+        if self.storm_enabled:
+            session.start_storm()
+            render.draw_level1_scene(scratch, session, assets, lights)
+            yield True
+            hud.draw_level1_hud(scratch, session, assets, ui_scale)
+            yield True
+
+        session.start_level2()
+        if assets.level2_bg is None:
+            render.get_gradient_overlay(size, *render.SKY_GRADIENT)
+            yield True
+        render.get_gradient_overlay(size, *render.DIM_GRADIENT)
+        yield True
+        render.draw_runner_backdrop(scratch, session, assets)
+        render.draw_runner_objects(scratch, session, assets, lights)
+        yield True
+        hud.draw_level2_hud(scratch, session, assets, ui_scale)
+        lights.batch.clear()
+        yield True
+
+        render.get_gradient_overlay(size, *PAUSE_GRADIENT)
+        yield True
+        # draw_paused only tells its renderer where the HUD starts
+        draw_paused(scratch, OffscreenRenderer((1, 1)), ui_scale)
+        session.game_over(auto_return=False)
+        render.draw_end_scene(scratch, session)
+        hud.draw_end_hud(scratch, session, ui_scale)
+        yield True
+
+        if self.storm_enabled:
+            from .multiplayer import viewport_rects
+
+            # Squad HUDs first: the viewport backdrops are the biggest pieces, and
+            # once one has been too slow for an idle frame nothing else gets to run
+            views = {viewport_rects(*size, count)[0].size for count in range(2, MAX_SQUAD + 1)}
+            for count in range(2, MAX_SQUAD + 1):
+                session.start_multiplayer(count)
+                hud.draw_multiplayer_hud(scratch, session, assets, ui_scale)
+                yield True
+            for view in sorted(views):
+                if assets.level2_bg is None:
+                    render.get_gradient_overlay(view, *render.SKY_GRADIENT)
+                    yield True
+                render.get_gradient_overlay(view, *render.DIM_GRADIENT)
+                yield True
+                render.get_viewport_backdrop(assets.level2_bg, view)
+                yield True
+            for count in range(2, MAX_SQUAD + 1):
+                session.start_multiplayer(count)
+                render.draw_multiplayer_scene(scratch, session, assets, lights)
+                lights.batch.clear()
+                yield True
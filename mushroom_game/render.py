@@ -0,0 +1,413 @@
+"""Drawing primitives, cached sprites and the per-scene world rendering.
+
+Everything here draws onto whatever surface it is given; HUD widgets built
+from these primitives live in ``hud``.
+"""
+import math
+from functools import lru_cache
+
+import pygame
+
+from .animation import PAD
+from .assets import blit_background, display_convert
+from .memory import track_surfaces
+from .sim import STORM_MUSHROOM_SIZE, WIN
+
+
+GLOW_COLORKEY = (255, 0, 255)
+GHOST_TINT = (150, 200, 255, 110)  # Multiplied into the player sprite
+GLOW_TICKS = 24  # Powerup lights breathe over this many ticks
+HEART_LIGHT = (255, 100, 150)
+SHIELD_LIGHT = (90, 160, 255)
+GOLD_LIGHT = (255, 200, 80)
+
+
+def adjust_color(color, amount):
+    return tuple(max(0, min(255, c + amount)) for c in color)
+
+
+def draw_vertical_gradient(surface, top_color, bottom_color):
+    width, height = surface.get_size()
+    if height <= 0:
+        return
+    top = (*top_color, 255) if len(top_color) == 3 else top_color
+    bottom = (*bottom_color, 255) if len(bottom_color) == 3 else bottom_color
+    channels = len(top)
+    # Filled rows rather than drawn lines: same pixels, a fraction of the time,
+    # so even a full-screen gradient fits inside a frame
+    for y in range(height):
+        ratio = y / (height - 1) if height > 1 else 0
+        color = tuple(int(top[i] + (bottom[i] - top[i]) * ratio) for i in range(channels))
+        surface.fill(color, (0, y, width, 1))
+
+
+@lru_cache(maxsize=64)
+def get_font(size, bold=True):
+    return pygame.font.SysFont("arial", size, bold=bold)
+
+
+@lru_cache(maxsize=64)
+@track_surfaces
+def get_glass_panel_layers(size, base_color, border_color, radius, alpha, shadow):
+    """Pre-rendered (shadow, panel) surfaces for a glass panel style and size.
+
+    The two layers are kept apart and blitted in order so the result matches
+    drawing the panel from scratch pixel for pixel.
+    """
+    width, height = size
+    shadow_surface = None
+    if shadow:
+        shadow_surface = pygame.Surface((width, height), pygame.SRCALPHA)
+        pygame.draw.rect(shadow_surface, (0, 0, 0, 110), shadow_surface.get_rect(), border_radius=radius)
+
+    panel = pygame.Surface((width, height), pygame.SRCALPHA)
+    top = (*adjust_color(base_color, 45), alpha)
+    bottom = (*adjust_color(base_color, -30), alpha)
+    draw_vertical_gradient(panel, top, bottom)
+
+    if width > 24 and height > 24:
+        highlight = pygame.Surface((width - 24, 10), pygame.SRCALPHA)
+        draw_vertical_gradient(highlight, (255, 255, 255, 90), (255, 255, 255, 0))
+        panel.blit(highlight, (12, 12))
+        lowlight = pygame.Surface((width - 24, 12), pygame.SRCALPHA)
+        draw_vertical_gradient(lowlight, (0, 0, 0, 0), (0, 0, 0, 90))
+        panel.blit(lowlight, (12, height - 18))
+
+    border = border_color if border_color else adjust_color(base_color, 80)
+    pygame.draw.rect(panel, (*border, 210), panel.get_rect(), width=2, border_radius=radius)
+
+    inner_rect = panel.get_rect().inflate(-12, -12)
+    if inner_rect.width > 0 and inner_rect.height > 0:
+        pygame.draw.rect(panel, (255, 255, 255, 40), inner_rect, width=1, border_radius=max(4, radius - 6))
+    return shadow_surface, panel
+
+
+def draw_glass_panel(surface, rect, base_color=(34, 52, 96), border_color=None, radius=20, alpha=200, shadow=True):
+    rect = pygame.Rect(rect)
+    border_color = tuple(border_color) if border_color else None
+    shadow_surface, panel = get_glass_panel_layers(rect.size, tuple(base_color), border_color, radius, alpha, shadow)
+    if shadow_surface:
+        surface.blit(shadow_surface, rect.move(0, 6).topleft)
+    surface.blit(panel, rect.topleft)
+
+
+def draw_text(surf, text, size, x, y, color=(255,255,255)):
+    font = get_font(size, bold=True)
+    txt = font.render(text, True, color)
+    rect = txt.get_rect(center=(x, y))
+    surf.blit(txt, rect)
+    return rect
+
+
+def draw_text_shadow(surf, text, size, x, y, color=(255,255,255), shadow_offset=(2,2), shadow_color=(0,0,0)):
+    font = get_font(size, bold=True)
+    txt_shadow = font.render(text, True, shadow_color)
+    rect_shadow = txt_shadow.get_rect(center=(x + shadow_offset[0], y + shadow_offset[1]))
+    surf.blit(txt_shadow, rect_shadow)
+    txt = font.render(text, True, color)
+    rect = txt.get_rect(center=(x, y))
+    surf.blit(txt, rect)
+    return rect
+
+
+def draw_button(surf, rect, label, hovered=False, text_size=30):
+    rect = pygame.Rect(rect)
+    base = (70, 130, 220)
+    hover = (90, 170, 255)
+    color = hover if hovered else base
+    draw_glass_panel(
+        surf,
+        rect,
+        base_color=color,
+        border_color=adjust_color(color, 60),
+        radius=rect.height // 2,
+        alpha=220,
+    )
+    draw_text_shadow(surf, label, text_size, rect.centerx, rect.centery, (255, 255, 255))
+
+
+GROUND_COLOR = (80, 160, 80)
+GROUND_STRIPE_COLOR = (60, 140, 60)
+GROUND_STRIPE_SPACING = 50
+
+
+@lru_cache(maxsize=4)
+@track_surfaces
+def get_ground_strip(width, height):
+    """Ground texture with stripes, two screens wide so any scroll offset is one blit."""
+    strip = display_convert(pygame.Surface((width * 2, height)))
+    strip.fill(GROUND_COLOR)
+    for copy_x in (0, width):
+        for x in range(0, width, GROUND_STRIPE_SPACING):
+            pygame.draw.line(strip, GROUND_STRIPE_COLOR, (copy_x + x, 0), (copy_x + x, height), 2)
+    return strip
+
+
+def draw_ground(surf, scroll_x, ground_y):
+    width, height = surf.get_size()
+    strip_h = height - ground_y
+    if strip_h <= 0:
+        return
+    strip = get_ground_strip(width, strip_h)
+    offset = int(-scroll_x) % width
+    surf.blit(strip, (0, ground_y), area=pygame.Rect(offset, 0, width, strip_h))
+
+
+@lru_cache(maxsize=8)
+@track_surfaces
+def get_shadow_sprite(size, alpha=100):
+    shadow = pygame.Surface(size, pygame.SRCALPHA)
+    pygame.draw.ellipse(shadow, (0, 0, 0, alpha), shadow.get_rect())
+    return shadow
+
+
+@lru_cache(maxsize=4)
+@track_surfaces
+def get_ghost_sprite(img, size):
+    """Translucent blue-tinted copy of the player sprite (or a plain block) for ghost runs."""
+    ghost = pygame.Surface(size, pygame.SRCALPHA)
+    if img is not None:
+        ghost.blit(img, (0, 0))
+    else:
+        ghost.fill((230, 200, 160))
+    ghost.fill(GHOST_TINT, special_flags=pygame.BLEND_RGBA_MULT)
+    return display_convert(ghost, alpha=True)
+
+
+@lru_cache(maxsize=8)
+@track_surfaces
+def get_icon_sprite(img, size):
+    """``img`` smooth-scaled to a HUD icon ``size``, so the HUD doesn't rescale it every frame."""
+    return pygame.transform.smoothscale(img, size)
+
+
+@lru_cache(maxsize=4)
+@track_surfaces
+def get_bolt_icon(size):
+    """The dash lightning bolt, drawn for a ``size`` x ``size`` icon."""
+    bolt = pygame.Surface((size, size), pygame.SRCALPHA)
+    points = [(12, 0), (20, 0), (14, 12), (24, 12), (8, 26), (14, 14)]
+    pygame.draw.polygon(bolt, (255, 210, 150), [(round(x * size / 26), round(y * size / 26)) for x, y in points])
+    return bolt
+
+
+@lru_cache(maxsize=32)
+@track_surfaces
+def get_glow_sprite(diameter, color, alpha):
+    """Flat circular glow as a colorkeyed display-format surface with surface alpha.
+
+    A single color at a single alpha doesn't need per-pixel alpha, and RLE
+    makes skipping the keyed corners nearly free.
+    """
+    glow = display_convert(pygame.Surface((diameter, diameter)))
+    glow.fill(GLOW_COLORKEY)
+    pygame.draw.circle(glow, color, (diameter // 2, diameter // 2), diameter // 2)
+    glow.set_colorkey(GLOW_COLORKEY, pygame.RLEACCEL)
+    glow.set_alpha(alpha, pygame.RLEACCEL)
+    return glow
+
+
+# (top, bottom) colours of the level 2 sky without a background image, and of the
+# dimming laid over the sky either way
+SKY_GRADIENT = ((26, 48, 86), (8, 14, 32))
+DIM_GRADIENT = ((10, 18, 32, 100), (4, 6, 16, 160))
+
+
+@lru_cache(maxsize=8)
+@track_surfaces
+def get_gradient_overlay(size, top_color, bottom_color):
+    # Every row is one colour, so a converted column stretched to width is the
+    # whole overlay; a full-screen one is then quick enough to build mid-frame
+    column = pygame.Surface((1, size[1]), pygame.SRCALPHA)
+    draw_vertical_gradient(column, top_color, bottom_color)
+    return pygame.transform.scale(display_convert(column, alpha=True), size)
+
+
+@lru_cache(maxsize=4)
+@track_surfaces
+def get_flash_overlay(size, color):
+    """Opaque full-screen fill; callers fade it with ``set_alpha`` each frame."""
+    overlay = display_convert(pygame.Surface(size))
+    overlay.fill(color)
+    return overlay
+
+
+def blit_flash(surf, color, alpha):
+    overlay = get_flash_overlay(surf.get_size(), color)
+    overlay.set_alpha(alpha)
+    surf.blit(overlay, (0, 0))
+
+
+def draw_menu_scene(screen, session, assets):
+    blit_background(screen, assets.menu_bg, label="menu_bg") if assets.menu_bg else screen.fill((30, 40, 60))
+
+
+def draw_level1_scene(screen, session, assets, lights=None):
+    blit_background(screen, assets.level1_bg, label="level1_bg") if assets.level1_bg else screen.fill((120, 160, 200))
+    anims = assets.animations
+    for m in session.mushrooms:
+        rect = m["rect"]
+        clip = anims.mushroom_gold if m["kind"] == "gold" else anims.mushroom
+        # Offset by x so neighbouring mushrooms don't sway in lockstep
+        screen.blit(clip.frame(session.frame + rect.x // 8), rect) if clip else pygame.draw.rect(screen, (220, 180, 100), rect)
+        if lights is not None and m["kind"] == "gold":
+            lights.add(rect.centerx, rect.centery, rect.width * 0.6, GOLD_LIGHT, 0.4)
+    field = session.storm_field
+    if field is not None and assets.storm_mushroom_img:
+        from .falling import KIND_GOLD
+
+        gold = field.kind[:len(field)] == KIND_GOLD
+        positions = field.positions().tolist()
+        screen.blits(
+            [(assets.storm_gold_img if g else assets.storm_mushroom_img, tuple(pos)) for pos, g in zip(positions, gold)],
+            doreturn=False,
+        )
+        if lights is not None:
+            half = STORM_MUSHROOM_SIZE[0] // 2
+            for (x, y), g in zip(positions, gold):
+                if g:
+                    lights.add(x + half, y + half, STORM_MUSHROOM_SIZE[0], GOLD_LIGHT, 0.4)
+    screen.blit(assets.basket_img, session.basket) if assets.basket_img else pygame.draw.rect(screen, (160, 110, 60), session.basket)
+
+
+def draw_level2_scene(screen, session, assets, lights=None):
+    draw_runner_backdrop(screen, session, assets)
+
+    # Ghost runs behind the player
+    player = session.player
+    if session.ghost_pose is not None:
+        ghost_height = session.ghost_pose[0]
+        screen.blit(get_ghost_sprite(assets.mushroom_player_img, player.size), (player.x, session.ground_y - ghost_height - player.height))
+
+    # Player
+    anims = assets.animations
+    frame = anims.runner_frame(
+        "player", session.frame, session.on_ground, session.player_vy,
+        session.dash_cd, session.balance.dash_cooldown_frames, session.hit_flash_timer > 0,
+    )
+    screen.blit(frame, (player.x - PAD, player.y - PAD)) if frame else pygame.draw.rect(screen, (230, 200, 160), player)
+    if session.shield_timer > 0:
+        anims.shield.draw(screen, player.center, session.frame)
+        if lights is not None:
+            lights.add(player.centerx, player.centery, 72, SHIELD_LIGHT, 0.35)
+
+    draw_runner_objects(screen, session, assets, lights)
+
+
+def draw_runner_backdrop(screen, session, assets):
+    width, height = screen.get_size()
+    if assets.level2_bg:
+        blit_background(screen, assets.level2_bg, (session.bg_scroll_x, 0), label="level2_bg")
+        screen.blit(assets.level2_bg, (session.bg_scroll_x + width, 0))
+    else:
+        screen.blit(get_gradient_overlay((width, height), *SKY_GRADIENT), (0, 0))
+    screen.blit(get_gradient_overlay((width, height), *DIM_GRADIENT), (0, 0))
+    draw_ground(screen, session.bg_scroll_x, session.ground_y)
+
+
+def breathing(tick, phase=0.0):
+    """Powerup light intensity factor, between 0.6 and 1.4 over ``GLOW_TICKS``."""
+    return 1 + 0.4 * math.sin(2 * math.pi * (tick / GLOW_TICKS + phase))
+
+
+def draw_runner_objects(screen, session, assets, lights=None):
+    """Powerups and monsters of the Level 2 world, drawn over the runners."""
+    ground_y = session.ground_y
+    anims = assets.animations
+    tick = session.frame
+    # Powerups; lights are placed on the whole frame, so views add their offset
+    ox, oy = screen.get_abs_offset()
+    for heart in session.hearts:
+        screen.blit(assets.heart_img, heart) if assets.heart_img else pygame.draw.circle(screen, HEART_LIGHT, heart.center, 14)
+        if lights is not None:
+            lights.add(heart.centerx + ox, heart.centery + oy, 48, HEART_LIGHT, 0.45 * breathing(tick))
+    for shield in session.shields:
+        pygame.draw.circle(screen, SHIELD_LIGHT, shield.center, 12)
+        if lights is not None:
+            lights.add(shield.centerx + ox, shield.centery + oy, 44, SHIELD_LIGHT, 0.5 * breathing(tick, 0.5))
+
+    # Monsters
+    for monster in session.monsters:
+        rect = monster["rect"]
+        screen.blit(get_shadow_sprite(rect.size), (rect.x, ground_y - 10))
+        # Monster types differ in width, which also staggers their walk cycles
+        screen.blit(anims.monster.frame(tick + rect.width), rect) if anims.monster else pygame.draw.rect(screen, (200, 50, 50), rect)
+
+
+@lru_cache(maxsize=4)
+@track_surfaces
+def get_viewport_backdrop(img, size):
+    """Background scaled to one viewport with the dimming overlay baked in, two viewports wide.
+
+    Every viewport then needs a single opaque blit for its sky instead of two
+    background blits and a full-size alpha blend.
+    """
+    width, height = size
+    tile = pygame.Surface(size)
+    if img is not None:
+        tile.blit(img if img.get_size() == size else pygame.transform.smoothscale(img, size), (0, 0))
+    else:
+        tile.blit(get_gradient_overlay(size, *SKY_GRADIENT), (0, 0))
+    tile.blit(get_gradient_overlay(size, *DIM_GRADIENT), (0, 0))
+    strip = display_convert(pygame.Surface((width * 2, height)))
+    strip.blit(tile, (0, 0))
+    strip.blit(tile, (width, 0))
+    return strip
+
+
+@lru_cache(maxsize=4)
+@track_surfaces
+def get_player_marker(color, width):
+    marker = pygame.Surface((width + 16, 14), pygame.SRCALPHA)
+    pygame.draw.ellipse(marker, (*color, 170), marker.get_rect())
+    return display_convert(marker, alpha=True)
+
+
+def draw_multiplayer_scene(screen, session, assets, lights=None):
+    """One view of the shared world per squad member, each centred on its own runner."""
+    from .multiplayer import PLAYER_COLORS, viewport_rects
+
+    squad = session.squad
+    balance = session.balance
+    anims = assets.animations
+    ghost_img = get_ghost_sprite(assets.mushroom_player_img, squad.rect(0).size)
+    screen.fill((0, 0, 0))
+    for i, rect in enumerate(viewport_rects(*screen.get_size(), squad.count)):
+        view = screen.subsurface(rect)
+        width = rect.width
+        view.blit(get_viewport_backdrop(assets.level2_bg, rect.size), (0, 0), area=pygame.Rect(int(-session.bg_scroll_x) % width, 0, width, rect.height))
+        draw_ground(view, session.bg_scroll_x, session.ground_y)
+
+        # Teammates run in the same lane, shown as ghosts behind this view's runner
+        for j in range(squad.count):
+            if j != i and squad.lives[j] > 0:
+                view.blit(ghost_img, squad.rect(j))
+        player = squad.rect(i)
+        view.blit(get_player_marker(PLAYER_COLORS[i], player.width), (player.x - 8, session.ground_y - 7))
+        frame = anims.runner_frame(
+            ("squad", i), session.frame, squad.on_ground[i], squad.vy[i],
+            squad.dash_cd[i], balance.dash_cooldown_frames, squad.hit_flash[i] > 0,
+        )
+        view.blit(frame, (player.x - PAD, player.y - PAD)) if frame else pygame.draw.rect(view, PLAYER_COLORS[i], player)
+        if squad.shield[i] > 0:
+            anims.shield.draw(view, player.center, session.frame)
+            if lights is not None:
+                lights.add(rect.x + player.centerx, rect.y + player.centery, 72, SHIELD_LIGHT, 0.35)
+
+        draw_runner_objects(view, session, assets, lights)
+        if squad.hit_flash[i] > 0 and balance.hit_flash_duration:
+            blit_flash(view, (255, 60, 60), int(140 * squad.hit_flash[i] / balance.hit_flash_duration))
+
+
+def draw_end_scene(screen, session):
+    screen.fill((100, 200, 150) if session.state == WIN else (200, 100, 100))
+
+
+def draw_flashes(screen, session):
+    balance = session.balance
+    if session.collect_flash_timer > 0:
+        ratio = session.collect_flash_timer / balance.collect_flash_duration if balance.collect_flash_duration else 0
+        blit_flash(screen, (255, 220, 120), int(90 * ratio))
+    if session.hit_flash_timer > 0:
+        ratio = session.hit_flash_timer / balance.hit_flash_duration if balance.hit_flash_duration else 0
+        blit_flash(screen, (255, 60, 60), int(140 * ratio))
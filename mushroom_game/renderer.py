@@ -0,0 +1,298 @@
+"""Rendering backends: the default software path and an optional SDL GPU renderer.
+
+The game draws onto ``renderer.surface`` exactly as it always has. With the
+software renderer that is the display surface. With ``GpuRenderer`` it is a
+``Canvas`` that turns image blits into cached texture draws, while HUD
+drawing between ``begin_hud()`` and ``end_hud()`` is composed in software and
+uploaded once per frame. Set ``SDL_RENDER_DRIVER=software`` together with
+``SDL_VIDEODRIVER=dummy`` to exercise the GPU path on a headless machine.
+"""
+import weakref
+
+import pygame
+
+from .particles import particle_style
+
+try:
+    from pygame._sdl2 import video as sdl_video
+except ImportError:
+    sdl_video = None
+
+
+BLENDMODE_BLEND = 1
+BLENDMODE_ADD = 2
+WINDOWPOS_CENTERED_DISPLAY = 0x2FFF0000  # SDL_WINDOWPOS_CENTERED_DISPLAY(n) is this | n
+ADDITIVE_PARTICLES = ("spark", "spore")
+
+
+class SoftwareRenderer:
+    """Draws straight onto the ``pygame.display`` surface."""
+
+    accelerated = False
+
+    def __init__(self, size, title, fullscreen=False, display=0):
+        pygame.display.set_caption(title)
+        self.display = display
+        self.surface = pygame.display.set_mode(size, self._flags(fullscreen), display=display)
+
+    @staticmethod
+    def _flags(fullscreen):
+        return pygame.FULLSCREEN if fullscreen else pygame.RESIZABLE
+
+    def resize(self, size, fullscreen=False):
+        """Recreate the display at ``size``; returns the new logical size."""
+        self.surface = pygame.display.set_mode(size, self._flags(fullscreen), display=self.display)
+        return self.surface.get_size()
+
+    def set_fullscreen(self, fullscreen):
+        self.surface = pygame.display.set_mode(self.surface.get_size(), self._flags(fullscreen), display=self.display)
+
+    def begin_hud(self):
+        pass
+
+    def end_hud(self):
+        pass
+
+    def present(self):
+        pygame.display.flip()
+
+
+class OffscreenRenderer:
+    """Draws into a plain surface that is never shown; used for captures.
+
+    ``present()`` does nothing, so the caller reads ``surface`` after each
+    frame. A display mode must already exist for surface conversion.
+    """
+
+    accelerated = False
+
+    def __init__(self, size):
+        self.surface = pygame.Surface(size).convert()
+
+    def resize(self, size, fullscreen=False):
+        self.surface = pygame.Surface(size).convert()
+        return self.surface.get_size()
+
+    def set_fullscreen(self, fullscreen):
+        pass
+
+    def begin_hud(self):
+        pass
+
+    def end_hud(self):
+        pass
+
+    def present(self):
+        pass
+
+
+class Canvas(pygame.Surface):
+    """Stand-in for the display surface under ``GpuRenderer``.
+
+    Outside the HUD phase, blits and fills become renderer draw calls. Inside
+    it, and for any ``pygame.draw`` primitive, the canvas behaves as a plain
+    SRCALPHA surface that is uploaded on top of the scene.
+    """
+
+    _viewport = None  # Set on subsurfaces: their rect on the canvas
+
+    def __init__(self, size, renderer):
+        super().__init__(size, pygame.SRCALPHA)
+        self._renderer = renderer
+
+    def subsurface(self, *rect):
+        """A view whose draw calls go to that region of the screen, clipped to it."""
+        view = super().subsurface(*rect)
+        view._renderer = self._renderer
+        offset = self._viewport.topleft if self._viewport else (0, 0)
+        view._viewport = pygame.Rect(*rect).move(offset)
+        return view
+
+    def blit(self, source, dest, area=None, special_flags=0):
+        if self._renderer.in_hud:
+            return super().blit(source, dest, area, special_flags)
+        return self._renderer.draw_surface(source, dest, area, self._viewport)
+
+    def blits(self, blit_sequence, doreturn=True):
+        rects = [self.blit(*item) for item in blit_sequence]
+        return rects if doreturn else None
+
+    def fill(self, color, rect=None, special_flags=0):
+        if self._renderer.in_hud:
+            return super().fill(color, rect, special_flags)
+        if rect is None and self._viewport is not None:
+            rect = self.get_rect()
+        return self._renderer.fill(color, rect, self._viewport)
+
+
+class GpuRenderer:
+    """Texture-based renderer on ``pygame._sdl2.video``.
+
+    Surfaces are uploaded once and kept in a weak texture cache, so cached
+    sprites, panels and backgrounds cost a single draw call each. The game
+    renders at a fixed logical size and the GPU scales it to the window.
+    """
+
+    accelerated = True
+
+    def __init__(self, size, title, fullscreen=False, display=0):
+        if sdl_video is None:
+            raise pygame.error("pygame._sdl2.video is not available")
+        position = (WINDOWPOS_CENTERED_DISPLAY | display,) * 2
+        self.window = sdl_video.Window(title, size=size, position=position, resizable=True)
+        self.renderer = sdl_video.Renderer(self.window)
+        self.renderer.logical_size = size
+        self.surface = Canvas(size, self)
+        self.in_hud = False
+        self._hud_flushed = False
+        self._textures = weakref.WeakKeyDictionary()
+        self._hud_texture = sdl_video.Texture(self.renderer, size, streaming=True)
+        self._hud_texture.blend_mode = BLENDMODE_BLEND
+        self._sprites = {}
+        self._light_texture = None
+        self._viewport = None
+        if fullscreen:
+            self.set_fullscreen(True)
+
+    def resize(self, size, fullscreen=False):
+        # The window scales the fixed logical frame, so game layout never changes
+        return self.surface.get_size()
+
+    def set_fullscreen(self, fullscreen):
+        if fullscreen:
+            self.window.set_fullscreen(desktop=True)
+        else:
+            self.window.set_windowed()
+
+    def texture_for(self, surf):
+        tex = self._textures.get(surf)
+        if tex is None:
+            tex = sdl_video.Texture.from_surface(self.renderer, surf)
+            self._textures[surf] = tex
+        return tex
+
+    def set_viewport(self, rect):
+        """Offset and clip later draw calls to ``rect`` (None for the whole frame)."""
+        if rect != self._viewport:
+            self.renderer.set_viewport(rect)
+            self._viewport = rect
+
+    def draw_surface(self, surf, dest, area=None, viewport=None):
+        self.set_viewport(viewport)
+        tex = self.texture_for(surf)
+        alpha = surf.get_alpha()
+        tex.alpha = 255 if alpha is None else alpha
+        x, y = int(dest[0]), int(dest[1])
+        if area is not None:
+            area = pygame.Rect(area)
+            dst = pygame.Rect(x, y, area.width, area.height)
+            tex.draw(srcrect=area, dstrect=dst)
+        else:
+            dst = pygame.Rect(x, y, *surf.get_size())
+            tex.draw(dstrect=dst)
+        return dst
+
+    def fill(self, color, rect=None, viewport=None):
+        self.set_viewport(viewport)
+        rgba = tuple(color) if len(color) == 4 else (*color, 255)
+        self.renderer.draw_color = rgba
+        if rect is None:
+            self.renderer.clear()
+            return pygame.Rect((0, 0), self.surface.get_size())
+        rect = pygame.Rect(rect)
+        self.renderer.fill_rect(rect)
+        return rect
+
+    def _sprite(self, shape, size, additive):
+        key = (shape, size, additive)
+        tex = self._sprites.get(key)
+        if tex is None:
+            if shape == "ellipse":
+                surf = pygame.Surface((size * 3, size * 2), pygame.SRCALPHA)
+                rect = surf.get_rect()
+                pygame.draw.ellipse(
+                    surf,
+                    (255, 255, 255),
+                    (rect.width // 6, rect.height // 4, rect.width * 2 // 3, rect.height // 2),
+                )
+            else:
+                surf = pygame.Surface((size * 2, size * 2), pygame.SRCALPHA)
+                pygame.draw.circle(surf, (255, 255, 255), (size, size), size)
+            tex = sdl_video.Texture.from_surface(self.renderer, surf)
+            tex.blend_mode = BLENDMODE_ADD if additive else BLENDMODE_BLEND
+            self._sprites[key] = tex
+        return tex
+
+    def draw_particles(self, particles):
+        """Draw particles from white sprite textures tinted per particle.
+
+        Sparks and spores blend additively so overlapping bursts bloom
+        instead of stacking opaque discs.
+        """
+        glows = not getattr(particles, "lod", False)
+        self.set_viewport(None)
+        for particle in particles:
+            style = particle_style(particle)
+            if style is None:
+                continue
+            color, alpha, size = style
+            x, y = particle["x"], particle["y"]
+            kind = particle["kind"]
+            if kind in ("dust", "dash"):
+                tex = self._sprite("ellipse", size, False)
+                w, h = size * 3, size * 2
+                tex.color = color
+                tex.alpha = alpha
+                tex.draw(dstrect=(int(x - w // 2), int(y - h // 2), w, h))
+                continue
+            additive = kind in ADDITIVE_PARTICLES
+            if kind == "spore" and glows:
+                glow = self._sprite("circle", size * 2, True)
+                glow.color = color
+                glow.alpha = max(10, alpha // 4)
+                glow.draw(dstrect=(int(x - size * 2), int(y - size * 2), size * 4, size * 4))
+            tex = self._sprite("circle", size, additive)
+            tex.color = color
+            tex.alpha = alpha
+            tex.draw(dstrect=(int(x - size), int(y - size), size * 2, size * 2))
+
+    def add_light_map(self, surf, area, dest):
+        """Stretch ``area`` of the light map ``surf`` over ``dest`` and add it onto the frame."""
+        tex = self._light_texture
+        if tex is None or (tex.width, tex.height) != surf.get_size():
+            tex = self._light_texture = sdl_video.Texture(self.renderer, surf.get_size(), streaming=True)
+            tex.blend_mode = BLENDMODE_ADD
+        tex.update(surf)
+        self.set_viewport(None)
+        tex.draw(srcrect=area, dstrect=dest)
+
+    def begin_hud(self):
+        self.in_hud = True
+
+    def end_hud(self):
+        # Primitives drawn outside the HUD phase also land on the canvas, so flush once per frame
+        if self._hud_flushed:
+            return
+        self._hud_flushed = True
+        self._hud_texture.update(self.surface)
+        self.set_viewport(None)
+        self._hud_texture.draw()
+        pygame.Surface.fill(self.surface, (0, 0, 0, 0))
+        self.in_hud = False
+
+    def present(self):
+        self.end_hud()
+        self.renderer.present()
+        self.renderer.draw_color = (0, 0, 0, 255)
+        self.renderer.clear()
+        self._hud_flushed = False
+
+
+def create_renderer(size, title, prefer_gpu=False, fullscreen=False, display=0):
+    """Build the GPU renderer when asked and available, else the software one."""
+    if prefer_gpu:
+        try:
+            return GpuRenderer(size, title, fullscreen, display)
+        except pygame.error:
+            pass
+    return SoftwareRenderer(size, title, fullscreen, display)
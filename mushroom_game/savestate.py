@@ -0,0 +1,426 @@
+"""Save and resume a run: the whole session as a compact versioned binary snapshot.
+
+``dump()`` writes everything the simulation needs to carry on exactly where it
+left off: the state machine, score, lives and timers, the Level 1 mushrooms
+or storm field, the runner world (monsters, powerups, distance, speed), a
+local multiplayer squad, the ghost trace being recorded and the race cursor,
+the RNG state and, optionally, the particles. ``restore()`` loads it back
+into a live ``Session``, so a resumed run continues frame for frame as if it
+had never stopped. The balance config, high score and best ghost are not part
+of a snapshot; they stay as they are in the session being restored into.
+
+The format is a magic and version header followed by fixed ``struct``
+records and length-prefixed ``array`` blocks (no pickle), so a dump of a
+busy Level 2 run is a few KB and both directions take well under a
+millisecond. Besides quit-and-resume this makes snapshots a cheap way to
+reset benchmarks and simulated games to any point.
+
+``Autosaver`` writes snapshots from a daemon thread: the game loop only
+serialises (on its own thread, so the state is consistent) and hands the
+bytes over every ``AUTOSAVE_SECONDS``.
+"""
+import os
+import struct
+import threading
+import time
+from array import array
+
+import pygame
+
+from .sim import GAMEOVER, LEVEL1, LEVEL2, LEVEL2_READY, MENU, MUSHROOM_SIZE, WIN
+from .userdata import data_path, make_parent
+
+SAVE_FILE = data_path("saved_run.shs")
+MAGIC = b"SHSV"
+VERSION = 1
+AUTOSAVE_SECONDS = 10
+STATES = (MENU, LEVEL1, LEVEL2, LEVEL2_READY, GAMEOVER, WIN)
+KINDS = ("normal", "gold")
+HAS_STORM, HAS_SQUAD, HAS_TRACE, HAS_GHOST, HAS_PARTICLES = 1, 2, 4, 8, 16
+
+HEADER = struct.Struct("<4sHBBHHHH")  # magic, version, state, flags, world size, screen size
+# Session attributes stored as-is, in this order
+SCALARS = (
+    ("score", "i"), ("lives", "i"), ("paused", "?"), ("frame", "q"),
+    ("gameover_timer", "i"), ("ambient_spore_timer", "i"), ("trail_emit_timer", "i"),
+    ("collect_flash_timer", "i"), ("hit_flash_timer", "i"), ("next_mushroom_spawn_timer", "i"),
+    ("storm_timer", "i"), ("runner_distance", "d"), ("runner_speed", "d"), ("bg_scroll_x", "d"),
+    ("distance_score_carry", "d"), ("next_monster_spawn", "d"), ("next_powerup_spawn", "d"),
+    ("player_vx", "d"), ("player_vy", "d"), ("on_ground", "?"), ("dash_cd", "i"), ("shield_timer", "i"),
+)
+SESSION = struct.Struct("<" + "".join(code for _, code in SCALARS) + "iiii")  # + player x/y, basket x/y
+RNG = struct.Struct("<?d")  # has a cached gauss value, the value
+MONSTER = struct.Struct("<iiiidii")  # x, y, w, h, vx, hit mask, last move
+STORM = struct.Struct("<Id")  # count, last fall
+TRACE = struct.Struct("<Ii")  # frames, last height
+SQUAD = struct.Struct("<Bi")  # players, player x
+SQUAD_ARRAYS = ("bottom", "prev_bottom", "vy", "on_ground", "dash_cd", "shield", "lives", "score", "score_carry", "hit_flash")
+GHOST = struct.Struct("<I?ii")  # frame, has pose, pose height, pose events
+PARTICLE = struct.Struct("<ddddiiidd??BBBBBBBBB")
+
+
+class _Writer:
+    def __init__(self):
+        self.out = bytearray()
+
+    def pack(self, record, *values):
+        self.out += record.pack(*values)
+
+    def array(self, typecode, values):
+        values = values if isinstance(values, array) else array(typecode, values)
+        self.out += struct.pack("<I", len(values))
+        self.out += values.tobytes()
+
+    def strings(self, values):
+        self.array("B", "\0".join(values).encode())
+
+
+class _Reader:
+    def __init__(self, data):
+        self.data = memoryview(data)
+        self.pos = 0
+
+    def unpack(self, record):
+        values = record.unpack_from(self.data, self.pos)
+        self.pos += record.size
+        return values
+
+    def array(self, typecode):
+        (count,) = struct.unpack_from("<I", self.data, self.pos)
+        values = array(typecode)
+        start = self.pos + 4
+        self.pos = start + count * values.itemsize
+        if self.pos > len(self.data):
+            raise struct.error(f"block of {count} items runs past the end of the data")
+        values.frombytes(self.data[start:self.pos])
+        return values
+
+    def strings(self):
+        text = self.array("B").tobytes().decode()
+        return text.split("\0") if text else []
+
+
+def dump(session, particles=False):
+    """The session as snapshot bytes; particles are left out unless asked for."""
+    s = session
+    flags = (
+        (HAS_STORM if s.storm_field is not None else 0)
+        | (HAS_SQUAD if s.squad is not None else 0)
+        | (HAS_TRACE if s.trace is not None else 0)
+        | (HAS_GHOST if s.ghost is not None else 0)
+        | (HAS_PARTICLES if particles else 0)
+    )
+    w = _Writer()
+    w.pack(HEADER, MAGIC, VERSION, STATES.index(s.state), flags, s.width, s.height, *s.screen_size)
+    w.pack(SESSION, *(getattr(s, name) for name, _ in SCALARS), *s.player.topleft, *s.basket.topleft)
+    version, key, gauss = s.rng.getstate()
+    w.array("I", key)
+    w.pack(RNG, gauss is not None, gauss or 0.0)
+    w.strings(s.stats.keys())
+    w.array("q", s.stats.values())
+
+    w.array("i", [v for m in s.mushrooms for v in (*m["rect"].topleft, KINDS.index(m["kind"]))])
+    w.array("B", b"".join(
+        MONSTER.pack(*m["rect"], m["vx"], m.get("hit", 0), m.get("dx", 0)) for m in s.monsters
+    ))
+    w.array("i", [v for rect in s.hearts for v in rect])
+    w.array("i", [v for rect in s.shields for v in rect])
+
+    if flags & HAS_STORM:
+        field = s.storm_field
+        n = field.count
+        w.pack(STORM, n, field.last_fall)
+        for values in (field.x[:n], field.y[:n], field.kind[:n], field.slotted[:n]):
+            w.array("B", values.tobytes())
+    if flags & HAS_SQUAD:
+        squad = s.squad
+        w.pack(SQUAD, squad.count, squad.player_x)
+        for name in SQUAD_ARRAYS:
+            w.array("B", getattr(squad, name).tobytes())
+    if flags & HAS_TRACE:
+        trace = s.trace
+        w.pack(TRACE, trace.frames, trace._last)
+        w.array("B", trace.data)
+        w.array("I", trace.offsets)
+        w.array("i", trace.heights)
+    if flags & HAS_GHOST:
+        pose = s.ghost_pose
+        w.pack(GHOST, s.ghost.frame, pose is not None, *(pose or (0, 0)))
+    if particles:
+        _dump_particles(w, s.particles)
+    return bytes(w.out)
+
+
+def _dump_particles(w, particles):
+    names = sorted({p["kind"] for p in particles} | {p["category"] for p in particles})
+    index = {name: i for i, name in enumerate(names)}
+    w.strings(names)
+    out = bytearray()
+    for p in particles:
+        end = p["color_end"]
+        out += PARTICLE.pack(
+            p["x"], p["y"], p["vx"], p["vy"], p["life"], p["max_life"], p["size"], p["gravity"], p["friction"],
+            p["fade"], p["shrink"], *p["color"][:3], end is not None, *(end[:3] if end else (0, 0, 0)),
+            index[p["kind"]], index[p["category"]],
+        )
+    w.array("B", out)
+
+
+def restore(session, data):
+    """Load snapshot ``data`` into ``session``; raises ValueError if it isn't a usable snapshot.
+
+    The whole snapshot is read and checked before anything is assigned, so a
+    damaged one leaves the session as it was. A snapshot taken at another
+    window size is fitted to the session's current size the same way a
+    window resize is.
+    """
+    from .ghost import GhostRecorder
+
+    if data[:4] != MAGIC:
+        raise ValueError("not a saved run")
+    r = _Reader(data)
+    try:
+        _, version, state, flags, width, height, screen_w, screen_h = r.unpack(HEADER)
+        if version != VERSION:
+            raise ValueError(f"saved run format {version} is not supported (expected {VERSION})")
+        state = STATES[state]
+        values = r.unpack(SESSION)
+        key = r.array("I")
+        has_gauss, gauss = r.unpack(RNG)
+        stats = dict(zip(r.strings(), r.array("q")))
+        mushrooms = r.array("i")
+        mushrooms = [
+            {"rect": pygame.Rect(mushrooms[i], mushrooms[i + 1], *MUSHROOM_SIZE), "kind": KINDS[mushrooms[i + 2]]}
+            for i in range(0, len(mushrooms) - 2, 3)
+        ]
+        monsters = list(MONSTER.iter_unpack(r.array("B").tobytes()))
+        hearts, shields = r.array("i"), r.array("i")
+        storm = _read_storm(r, session.balance.storm_max_concurrent) if flags & HAS_STORM else None
+        squad = _read_squad(r, width, height, session.balance) if flags & HAS_SQUAD else None
+        trace = None
+        if flags & HAS_TRACE:
+            trace = GhostRecorder()
+            trace.frames, trace._last = r.unpack(TRACE)
+            trace.data = bytearray(r.array("B"))
+            trace.offsets, trace.heights = r.array("I"), r.array("i")
+        ghost = r.unpack(GHOST) if flags & HAS_GHOST else None
+        particles = _read_particles(r) if flags & HAS_PARTICLES else []
+    except (struct.error, IndexError, UnicodeDecodeError) as exc:
+        raise ValueError(f"saved run is damaged: {exc}") from None
+
+    current_size = session.screen_size
+    s = session
+    s.leave_multiplayer()
+    s.screen_size = (screen_w, screen_h)
+    s.set_world_size(width, height)
+    s.state = state
+    for (name, _), value in zip(SCALARS, values):
+        setattr(s, name, value)
+    s.player.topleft = values[-4:-2]
+    s.basket.topleft = values[-2:]
+    s.rng.setstate((3, tuple(key), gauss if has_gauss else None))
+    s.stats.clear()
+    s.stats.update(stats)
+
+    s.mushrooms = mushrooms
+    s.monsters = []
+    for x, y, w, h, vx, hit, dx in monsters:
+        monster = {"rect": pygame.Rect(x, y, w, h), "vx": vx, "type": "monster"}
+        if squad is not None:
+            monster["hit"], monster["dx"] = hit, dx
+        s.monsters.append(monster)
+    s.hearts = [pygame.Rect(hearts[i:i + 4]) for i in range(0, len(hearts) - 3, 4)]
+    s.shields = [pygame.Rect(shields[i:i + 4]) for i in range(0, len(shields) - 3, 4)]
+
+    s.storm_field = None
+    if storm is not None:
+        _restore_storm(s, *storm)
+    if squad is not None:
+        s.squad = squad
+    s.trace = trace
+    s.ghost = s.ghost_pose = None
+    if ghost is not None:
+        frame, has_pose, height, events = ghost
+        # Races continue against the best ghost on file, if it is still there
+        if s.best_ghost is not None:
+            s.ghost = s.best_ghost
+            s.ghost.seek(frame)
+            s.ghost_pose = (height, events) if has_pose else None
+    s.particles = s.new_particles()
+    if particles and s.effects:
+        s.particles.extend(particles)
+        s.particles.recount()
+    s.sfx.clear()
+    if current_size != s.screen_size:
+        s.resize(*current_size)
+
+
+# Bytes per mushroom of each storm field column, in snapshot order
+STORM_ITEMSIZES = (("x", 4), ("y", 4), ("kind", 1), ("slotted", 1))
+
+
+def _read_storm(r, capacity):
+    count, last_fall = r.unpack(STORM)
+    if count > capacity:
+        raise ValueError("saved storm has more mushrooms than storm_max_concurrent allows")
+    columns = []
+    for name, itemsize in STORM_ITEMSIZES:
+        column = r.array("B")
+        if len(column) != count * itemsize:
+            raise struct.error(f"storm column {name} has {len(column)} bytes for {count} mushrooms")
+        columns.append(column)
+    return count, last_fall, columns
+
+
+def _restore_storm(session, count, last_fall, columns):
+    import numpy as np
+
+    field = session.storm_field = session.new_storm_field()
+    for (name, _), dtype, column in zip(STORM_ITEMSIZES, (np.float32, np.float32, np.uint8, bool), columns):
+        getattr(field, name)[:count] = np.frombuffer(column, dtype)
+    field.count, field.last_fall = count, last_fall
+    for x in field.x[:count][field.slotted[:count]]:
+        field.gaps.add(int(x))
+
+
+def _read_squad(r, width, height, balance):
+    import numpy as np
+
+    from .multiplayer import RunnerSquad
+
+    count, player_x = r.unpack(SQUAD)
+    squad = RunnerSquad(count, width, height, balance)
+    squad.player_x = player_x
+    for name in SQUAD_ARRAYS:
+        target = getattr(squad, name)
+        column = r.array("B")
+        if len(column) != target.nbytes:
+            raise struct.error(f"squad column {name} has {len(column)} bytes for {count} players")
+        target[:] = np.frombuffer(column, target.dtype)
+    return squad
+
+
+def _read_particles(r):
+    names = r.strings()
+    particles = []
+    for values in PARTICLE.iter_unpack(r.array("B").tobytes()):
+        x, y, vx, vy, life, max_life, size, gravity, friction, fade, shrink = values[:11]
+        has_end = values[14]
+        particles.append({
+            "x": x, "y": y, "vx": vx, "vy": vy, "color": values[11:14],
+            "color_end": values[15:18] if has_end else None, "life": life, "max_life": max_life,
+            "size": size, "gravity": gravity, "fade": fade, "shrink": shrink, "friction": friction,
+            "kind": names[values[18]], "category": names[values[19]],
+        })
+    return particles
+
+
+def resumable(state):
+    """Only runs in progress are worth saving."""
+    return state in (LEVEL1, LEVEL2)
+
+
+def save(session, path=SAVE_FILE, particles=True):
+    """Write a snapshot of ``session`` to ``path``; returns False if it couldn't be written."""
+    return write_file(path, dump(session, particles))
+
+
+def write_file(path, data):
+    # Write beside the target and swap it in, so a crash mid-write never leaves a torn save
+    tmp = path + ".tmp"
+    try:
+        make_parent(path)
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except OSError:
+        return False
+    return True
+
+
+def load(session, path=SAVE_FILE):
+    """Resume the run saved at ``path`` into ``session``; returns False if there is none to resume."""
+    try:
+        with open(path, "rb") as f:
+            restore(session, f.read())
+    except (OSError, ValueError):
+        return False
+    return True
+
+
+def discard(path=SAVE_FILE):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+class Autosaver:
+    """Saves the run in progress every ``interval`` seconds; files are written on a daemon thread.
+
+    The game loop calls ``frame(session)`` once per frame. When a save is due
+    it serialises the session there (well under a millisecond) and the
+    thread writes the bytes out. When a run ends (game over, win) its save is
+    deleted, so only unfinished runs are offered for resuming.
+    """
+
+    def __init__(self, path=SAVE_FILE, interval=AUTOSAVE_SECONDS):
+        self.path = path
+        self.interval = interval
+        self._due = 0.0
+        self._playing = False
+        self._pending = None
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = False
+        self._thread = threading.Thread(target=self._run, name="autosave", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def frame(self, session):
+        playing = resumable(session.state)
+        now = time.monotonic()
+        if playing != self._playing:
+            self._playing = playing
+            self._due = now + self.interval
+            if not playing:
+                self._submit(b"")
+        elif playing and now >= self._due:
+            self._due = now + self.interval
+            self._submit(dump(session, particles=True))
+
+    def _submit(self, data, last=False):
+        """Queue ``data`` for writing; empty bytes delete the save, ``last`` ends the thread after it."""
+        with self._lock:
+            if data is not None:
+                self._pending = data
+            self._stop = self._stop or last
+        self._wake.set()
+
+    def _run(self):
+        while True:
+            self._wake.wait()
+            self._wake.clear()
+            with self._lock:
+                data, self._pending = self._pending, None
+                stopping = self._stop
+            if data:
+                write_file(self.path, data)
+            elif data is not None:
+                discard(self.path)
+            if stopping:
+                return
+
+    def stop(self, session=None):
+        """Stop the thread; a run still in progress is saved one last time first.
+
+        The final save goes through the thread like every other, so it never
+        races a write still in flight for the same file.
+        """
+        final = None
+        if session is not None and resumable(session.state):
+            final = dump(session, particles=True)
+        self._submit(final, last=True)
+        self._thread.join()
@@ -0,0 +1,684 @@
+"""Game state and the per-frame simulation step, independent of any display.
+
+``Session`` owns everything that changes while playing: the state machine,
+score and lives, Level 1 mushrooms, the Level 2 runner world and the particle
+list. Stepping it needs only ``pygame.Rect``, so it can run headless in
+tools and benchmarks. Gameplay emits typed events (see ``events``) that are
+dispatched after each step to queue sounds by name in ``Session.sfx`` for
+the front end to play, count run stats and, when effects are on, set off
+flashes and particles.
+"""
+import importlib.util
+import random
+from collections import Counter
+
+import pygame
+
+from . import particles as fx
+from .collision import box, sweep
+from .config import BalanceConfig
+from .difficulty import difficulty_for
+from .events import (
+    Dashed,
+    EventBus,
+    HeartPickup,
+    Jumped,
+    Landed,
+    MushroomCaught,
+    MushroomMissed,
+    PlayerHit,
+    RunLost,
+    ShieldAbsorb,
+    ShieldPickup,
+    StormCaught,
+)
+from .ghost import EVENT_DASH, EVENT_JUMP, GhostRecorder
+
+
+FPS = 60
+
+MENU, LEVEL1, LEVEL2, LEVEL2_READY, GAMEOVER, WIN = "menu","level1","level2","level2_ready","gameover","win"
+
+BASKET_SIZE = (298, 168)
+MUSHROOM_SIZE = (300, 300)
+PLAYER_SIZE = (64, 64)
+STORM_MUSHROOM_SIZE = (64, 64)
+GROUND_OFFSET = 140
+MONSTER_SPAWN_DISTANCE = 800  # Distance between monster spawns
+POWERUP_SPAWN_DISTANCE = 2400  # Increased from 1200 to reduce overall powerup frequency
+# Monster types: speed on top of the scrolling speed at spawn, and size; the mix comes from the difficulty curve
+MONSTER_TYPES = ((2, (56, 56)), (1, (40, 40)), (3, (72, 72)))  # Fast, medium, big slow
+# Held (jump, dash) input names per local multiplayer player; player 1 shares the solo inputs
+PLAYER_INPUTS = (("jump", "dash"), ("jump2", "dash2"), ("jump3", "dash3"), ("jump4", "dash4"))
+# What each gameplay event sets off: a sound, a run stat counter, a screen flash
+SOUNDS = {
+    MushroomCaught: "collect", StormCaught: "collect", MushroomMissed: "miss", Jumped: "jump",
+    Dashed: "dash", PlayerHit: "hit", HeartPickup: "collect", RunLost: "miss",
+}
+STAT_COUNTERS = {
+    MushroomMissed: "lives_lost_missed", Jumped: "jumps", Dashed: "dashes", PlayerHit: "lives_lost_monster",
+    ShieldAbsorb: "shield_absorbs", HeartPickup: "heart_pickups", ShieldPickup: "shield_pickups",
+}
+FLASHES = {
+    MushroomCaught: "collect", StormCaught: "collect", HeartPickup: "collect", ShieldPickup: "collect",
+    MushroomMissed: "hit", PlayerHit: "hit",
+}
+
+
+def storm_available():
+    """Storm mode runs on the NumPy-backed falling engine."""
+    return importlib.util.find_spec("numpy") is not None
+
+
+def pick_gap(bands, rng=random):
+    """Roll once and draw a gap from the first band whose probability bound exceeds the roll."""
+    r = rng.random()
+    for bound, lo, hi in bands:
+        if r < bound:
+            return rng.randint(lo, hi)
+    return rng.randint(bands[-1][1], bands[-1][2])
+
+
+def step_inputs(held, squad=None):
+    """``Session.step`` arguments from a dict of held inputs.
+
+    A squad gets per-player jump/dash lists, one entry per player.
+    """
+    if squad is None:
+        return {name: bool(held.get(name)) for name in ("left", "right", "jump", "dash")}
+    players = PLAYER_INPUTS[:squad.count]
+    return {
+        "jump": [bool(held.get(jump)) for jump, _ in players],
+        "dash": [bool(held.get(dash)) for _, dash in players],
+    }
+
+
+class Session:
+    """One player's run through the menu, Level 1 and the endless runner."""
+
+    def __init__(self, width, height, balance=None, highscore=0, seed=None, effects=True):
+        self.width = width
+        self.height = height
+        self.ground_y = height - GROUND_OFFSET
+        self.balance = balance or BalanceConfig()
+        self.rng = random.Random(seed)
+        self.state = MENU
+        self.score = 0
+        self.highscore = highscore
+        self.lives = self.balance.lives_start
+        self.paused = False
+        self.frame = 0  # Steps taken; drives cosmetic animation so replays render identically
+        self.gameover_timer = 0  # Auto-return timer for GAME OVER
+        self.sfx = []
+        self.stats = Counter()  # Per-run action/outcome counts, read by telemetry
+
+        # Effects shared by every scene; without effects no flashes or particles are made at all
+        self.effects = effects
+        self.particles = self.new_particles()
+        self.ambient_spore_timer = 0
+        self.trail_emit_timer = 0
+        self.collect_flash_timer = 0
+        self.hit_flash_timer = 0
+        self.events = EventBus()
+        self.subscribe_effects()
+
+        # Level 1
+        self.basket = pygame.Rect((0, 0), BASKET_SIZE)
+        self.basket.midbottom = (width // 2, height - 10)
+        self.mushrooms = []
+        self.next_mushroom_spawn_timer = 0
+        self.storm_field = None  # FallingField while storm mode is active
+        self.storm_timer = 0
+
+        # Level 2 (endless runner)
+        self.runner_distance = 0    # Total distance traveled
+        self.runner_speed = self.difficulty.runner_speed(0)  # Current scrolling speed
+        self.bg_scroll_x = 0        # Background scroll position
+        self.distance_score_carry = 0.0  # Accumulates distance towards score points
+        self.next_monster_spawn = MONSTER_SPAWN_DISTANCE
+        self.next_powerup_spawn = POWERUP_SPAWN_DISTANCE
+        self.player = pygame.Rect((0, 0), PLAYER_SIZE)
+        self.player.center = (width // 2, height // 2)
+        self.player_vx, self.player_vy = 0, 0
+        self.on_ground = False
+        self.dash_cd = 0
+        self.shield_timer = 0
+        self.monsters, self.hearts, self.shields = [], [], []
+
+        # Ghost race: every Level 2 run is traced; a loaded best run can be raced
+        self.trace = None          # GhostRecorder for the current Level 2 run
+        self.best_ghost = None     # GhostTrack offered on the menu, set by the front end
+        self.saved_run = None      # Path of an unfinished run offered on the menu, set by the front end
+        self.ghost = None          # GhostTrack being raced this run
+        self.ghost_pose = None     # (height above ground, events) this frame, None once it ends
+
+        # Local multiplayer: a RunnerSquad shares the Level 2 world, sized to one viewport
+        self.squad = None
+        self.screen_size = (width, height)
+
+    @property
+    def balance(self):
+        return self._balance
+
+    @balance.setter
+    def balance(self, balance):
+        """Setting the balance (e.g. on hot reload) switches to its difficulty tables and particle budget."""
+        self._balance = balance
+        self.difficulty = difficulty_for(balance)
+        if isinstance(getattr(self, "particles", None), fx.ParticleBudget):
+            self.particles.resize(*fx.budget_limits(balance))
+
+    def new_particles(self):
+        """An empty particle store limited by the balance's budget (granting nothing without effects)."""
+        if not self.effects:
+            return fx.SilentBudget()
+        return fx.ParticleBudget(*fx.budget_limits(self.balance))
+
+    # -- state transitions -------------------------------------------------
+
+    def reset_effects(self):
+        # Events of the scene being left still play out, onto the effects about to be reset
+        self.events.dispatch()
+        self.particles = self.new_particles()
+        self.distance_score_carry = 0.0
+        self.ambient_spore_timer = 0
+        self.trail_emit_timer = 0
+        self.collect_flash_timer = 0
+        self.hit_flash_timer = 0
+
+    def start_level1(self):
+        self.leave_multiplayer()
+        self.storm_field = None
+        self.trace = None
+        self.ghost = self.ghost_pose = None
+        self.stats = Counter()
+        self.score = 0
+        self.lives = self.balance.lives_start
+        self.mushrooms = []
+        self.next_mushroom_spawn_timer = 0
+        self.basket.midbottom = (self.width // 2, self.height - 10)
+        self.mushrooms.append(self.spawn_mushroom())
+        self.reset_effects()
+        self.paused = False
+        self.state = LEVEL1
+
+    def start_storm(self):
+        self.start_level1()
+        self.mushrooms.clear()
+        self.storm_field = self.new_storm_field()
+        self.storm_timer = self.balance.storm_duration_frames
+
+    def new_storm_field(self):
+        from .falling import FallingField
+
+        return FallingField(
+            self.balance.storm_max_concurrent,
+            STORM_MUSHROOM_SIZE,
+            (20, self.width - STORM_MUSHROOM_SIZE[0] - 20),
+            self.balance.storm_min_x_gap,
+            slot_release_y=0,
+        )
+
+    def start_level2(self):
+        self.monsters = []
+        # Start with some powerups
+        self.hearts = [pygame.Rect(600, self.ground_y - 60, 28, 28)]
+        self.shields = [pygame.Rect(1000, self.ground_y - 50, 24, 24)]
+        self.runner_distance = 0
+        self.runner_speed = self.difficulty.runner_speed(0)
+        self.bg_scroll_x = 0
+        self.player = pygame.Rect((0, 0), PLAYER_SIZE)
+        self.player.center = (self.width // 2, self.height // 2)
+        self.player_vx, self.player_vy = 0, 0
+        self.on_ground = False
+        self.dash_cd = 0
+        self.shield_timer = 0
+        self.reset_effects()
+        self.trace = GhostRecorder()
+        self.ghost_pose = None
+        if self.ghost is not None:
+            self.ghost.seek(0)
+        self.state = LEVEL2
+
+    def start_ghost_race(self):
+        """Skip Level 1 and run Level 2 against ``best_ghost``."""
+        if self.best_ghost is None:
+            return
+        self.start_level1()
+        self.ghost = self.best_ghost
+        self.start_level2()
+
+    def start_multiplayer(self, count):
+        """Run Level 2 with ``count`` local players, each in its own viewport."""
+        from .multiplayer import MAX_PLAYERS, RunnerSquad, viewport_rects
+
+        count = max(2, min(MAX_PLAYERS, count))
+        self.start_level1()
+        self.start_level2()
+        self.trace = None  # Squad runs are not ghost candidates
+        cell = viewport_rects(*self.screen_size, count)[0]
+        self.set_world_size(cell.width, cell.height)
+        self.player.center = (cell.width // 2, cell.height // 2)
+        self.hearts = [pygame.Rect(min(600, cell.width - 80), self.ground_y - 60, 28, 28)]
+        self.shields = [pygame.Rect(min(1000, cell.width - 40), self.ground_y - 50, 24, 24)]
+        self.squad = RunnerSquad(count, cell.width, cell.height, self.balance)
+
+    def leave_multiplayer(self):
+        if self.squad is not None:
+            self.squad = None
+            self.set_world_size(*self.screen_size)
+
+    def return_to_menu(self):
+        self.leave_multiplayer()
+        self.state = MENU
+
+    def game_over(self, auto_return=True):
+        self.state = GAMEOVER
+        if self.score > self.highscore:
+            self.highscore = self.score
+        if auto_return:
+            self.gameover_timer = FPS * 3
+
+    def resize(self, width, height):
+        self.screen_size = (width, height)
+        if self.squad is not None:
+            from .multiplayer import viewport_rects
+
+            cell = viewport_rects(width, height, self.squad.count)[0]
+            width, height = cell.width, cell.height
+            ground_shift = height - GROUND_OFFSET - self.ground_y
+            self.squad.bottom += ground_shift
+            self.squad.player_x = width // 2 - PLAYER_SIZE[0] // 2
+        self.set_world_size(width, height)
+
+    def set_world_size(self, width, height):
+        self.width, self.height = width, height
+        self.ground_y = height - GROUND_OFFSET
+        # Re-anchor UI elements
+        self.basket.midbottom = (max(0, min(width, self.basket.midbottom[0])), height - 10)
+        self.player.bottom = self.ground_y
+
+    # -- spawning ----------------------------------------------------------
+
+    def spawn_mushroom(self):
+        # Choose an X that maintains a fair horizontal gap from existing mushrooms
+        def choose_x():
+            for _ in range(24):
+                x = self.rng.randint(50, self.width - 350)
+                too_close = any(abs(x - m["rect"].x) < self.balance.level1_min_x_gap for m in self.mushrooms)
+                if not too_close:
+                    return x
+            # Fallback: bias away from basket center to increase challenge unpredictably
+            return 50 if self.basket.centerx > self.width // 2 else self.width - 350
+        x = choose_x()
+        kind = self.rng.choices(["normal", "gold"], weights=[85, 15])[0]
+        return {"rect": pygame.Rect(x, -MUSHROOM_SIZE[1], *MUSHROOM_SIZE), "kind": kind}
+
+    def spawn_monster(self, distance):
+        """Spawn a monster at the given distance from the right edge"""
+        mix = self.difficulty.monster_mix(self.runner_distance)
+        extra_speed, size = self.rng.choices(MONSTER_TYPES, cum_weights=mix)[0]
+        return {
+            "rect": pygame.Rect(self.width + distance, self.ground_y - size[1], *size),
+            "vx": -self.runner_speed - extra_speed,
+            "type": "monster"
+        }
+
+    def spawn_powerup(self, distance, powerup_type):
+        """Spawn a powerup at the given distance from the right edge"""
+        if powerup_type == "heart":
+            return pygame.Rect(self.width + distance, self.ground_y - 60, 28, 28)
+        elif powerup_type == "shield":
+            return pygame.Rect(self.width + distance, self.ground_y - 50, 24, 24)
+
+    # -- per-frame step ----------------------------------------------------
+
+    def step(self, left=False, right=False, jump=False, dash=False):
+        """Advance one frame of whichever scene is active, then dispatch its events and step its effects.
+
+        Flash timers count down at the start of the step, so the frame that
+        triggers a flash still renders it at full strength.
+        """
+        self.frame += 1
+        self.tick_flashes()
+        scene = self.state
+        if scene == LEVEL1:
+            self.step_level1(left, right)
+        elif scene == LEVEL2 and self.squad is not None:
+            self.step_squad(jump, dash)
+        elif scene == LEVEL2:
+            self.step_level2(jump, dash)
+        elif scene == GAMEOVER:
+            self.step_gameover()
+        self.events.dispatch()
+        # A scene that handed over to the next one mid-step left its effects behind
+        if self.effects and self.state in (scene, GAMEOVER):
+            self.step_effects(scene)
+
+    def step_level1(self, left, right):
+        b = self.balance
+
+        # Update basket movement
+        basket_x = self.basket.x
+        if left:
+            self.basket.x -= 10
+        if right:
+            self.basket.x += 10
+        self.basket.x = max(0, min(self.width - self.basket.width, self.basket.x))
+        basket_move = (self.basket.x - basket_x, 0)
+
+        fall_speed = self.difficulty.fall_speed(self.score)
+
+        # Storm mode: hundreds of mushrooms resolved in bulk by the falling engine
+        if self.storm_field is not None:
+            self.step_storm(fall_speed, basket_move)
+
+        # Spawn mushrooms with cap and random delay
+        if self.storm_field is None and len(self.mushrooms) < b.level1_max_concurrent:
+            if self.next_mushroom_spawn_timer <= 0:
+                self.mushrooms.append(self.spawn_mushroom())
+                self.next_mushroom_spawn_timer = pick_gap(self.difficulty.spawn_delays(self.score), self.rng)
+            else:
+                self.next_mushroom_spawn_timer -= 1
+
+        # Update mushrooms fall and collisions, swept over the step so fast falls can't pass through
+        # Reduced hitboxes for fairer collisions
+        basket_hit = box((basket_x, self.basket.y, *BASKET_SIZE), 0.3)
+        for m in self.mushrooms[:]:
+            m_hit = box(m["rect"], 0.4)
+            y = m["rect"].y
+            m["rect"].y += fall_speed
+            if sweep(m_hit, (0, m["rect"].y - y), basket_hit, basket_move) is not None:
+                self.score += 1
+                self.events.emit(MushroomCaught(m["rect"].centerx, m["rect"].centery))
+                self.mushrooms.remove(m)
+            elif m["rect"].top > self.height:
+                self.lives -= 1
+                self.events.emit(MushroomMissed(self.basket.centerx + self.rng.uniform(-80, 80), self.ground_y))
+                self.mushrooms.remove(m)
+
+        # Game Over check for Level 1
+        if self.lives <= 0:
+            self.game_over()
+
+        # Transition to Level 2 when goal reached
+        if self.score >= b.level1_goal and self.storm_field is None:
+            self.start_level2()
+
+    def step_storm(self, fall_speed, basket_move):
+        from .falling import KIND_GOLD
+
+        b = self.balance
+        field = self.storm_field
+        for _ in range(self.rng.randint(0, b.storm_spawns_per_frame)):
+            kind = KIND_GOLD if self.rng.random() < 0.15 else 0
+            field.spawn(self.rng.randint(0, self.width), kind=kind)
+        field.step(fall_speed)
+        caught, _ = field.resolve(self.basket, self.height, rect_move=basket_move)
+        if len(caught):
+            self.score += len(caught)
+            self.events.emit(StormCaught(caught))
+        self.storm_timer -= 1
+        if self.storm_timer <= 0:
+            self.game_over()
+
+    def step_level2(self, jump, dash):
+        b = self.balance
+        self.scroll_runner()
+        self.distance_score_carry += self.runner_speed
+        while self.distance_score_carry >= b.distance_score_unit:
+            self.score += 1
+            self.distance_score_carry -= b.distance_score_unit
+
+        player = self.player
+        events = 0
+        # Player jump
+        was_on_ground = self.on_ground
+        if jump and self.on_ground:
+            self.player_vy = b.player_jump_speed
+            self.on_ground = False
+            self.events.emit(Jumped())
+            events |= EVENT_JUMP
+        # Super jump / dash on Shift with cooldown
+        if dash and self.dash_cd == 0:
+            self.player_vy = b.player_jump_speed * 1.5
+            self.dash_cd = b.dash_cooldown_frames
+            self.events.emit(Dashed(player.centerx, player.centery + 10))
+            events |= EVENT_DASH
+
+        # Gravity & ground collision
+        player_box, player_y = box(player), player.y
+        self.player_vy += b.gravity
+        player.y += int(self.player_vy)
+        if player.bottom >= self.ground_y:
+            player.bottom = self.ground_y
+            self.player_vy = 0
+            self.on_ground = True
+        else:
+            self.on_ground = False
+        player_move = (0, player.y - player_y)
+
+        if not was_on_ground and self.on_ground:
+            self.events.emit(Landed(player.centerx, self.ground_y, self.runner_speed))
+
+        self.trace.record(self.ground_y - player.bottom, events)
+        if self.ghost is not None:
+            self.ghost_pose = self.ghost.next()
+
+        # Dash cooldown tick
+        if self.dash_cd > 0:
+            self.dash_cd -= 1
+
+        self.spawn_runner_monsters()
+
+        # Update monsters; contact is swept over this step's moves of both monster and player
+        for monster in self.monsters[:]:
+            rect = monster["rect"]
+            monster_box, x = box(rect), rect.x
+            rect.x += monster["vx"]
+            if rect.right < 0:
+                self.monsters.remove(monster)
+            elif sweep(monster_box, (rect.x - x, 0), player_box, player_move) is not None:
+                if self.shield_timer > 0:
+                    # Shield absorbs the hit but loses part of its duration
+                    self.shield_timer = max(0, self.shield_timer - b.shield_hit_cost_frames)
+                    self.events.emit(ShieldAbsorb(player.centerx, player.centery))
+                else:
+                    self.lives -= 1
+                    self.events.emit(PlayerHit(player.centerx, player.centery))
+                self.monsters.remove(monster)
+
+        self.spawn_runner_powerups(self.lives < b.lives_start)
+
+        # Move powerups with scroll & collect
+        scroll = int(self.runner_speed)
+        for heart in self.hearts[:]:
+            heart_box = box(heart)
+            heart.x -= scroll
+            if heart.right < 0:
+                self.hearts.remove(heart)
+            elif sweep(heart_box, (-scroll, 0), player_box, player_move) is not None:
+                self.lives = min(self.lives + 1, b.lives_start)
+                self.events.emit(HeartPickup(heart.centerx, heart.centery))
+                self.hearts.remove(heart)
+        for shield in self.shields[:]:
+            shield_box = box(shield)
+            shield.x -= scroll
+            if shield.right < 0:
+                self.shields.remove(shield)
+            elif sweep(shield_box, (-scroll, 0), player_box, player_move) is not None:
+                self.shield_timer = b.shield_duration_frames
+                self.events.emit(ShieldPickup(shield.centerx, shield.centery))
+                self.shields.remove(shield)
+
+        if self.shield_timer > 0:
+            self.shield_timer -= 1
+
+        # Game Over
+        if self.lives <= 0:
+            self.events.emit(RunLost())
+            self.game_over(auto_return=False)
+
+    def scroll_runner(self):
+        """Scroll the background and set the shared Level 2 world's speed for the distance run."""
+        self.bg_scroll_x -= self.runner_speed
+        if self.bg_scroll_x <= -self.width:
+            self.bg_scroll_x += self.width
+        self.runner_speed = self.difficulty.runner_speed(self.runner_distance)
+        self.runner_distance += self.runner_speed
+
+    def spawn_runner_monsters(self):
+        b = self.balance
+        self.next_monster_spawn -= self.runner_speed
+        if self.next_monster_spawn <= 0 and len(self.monsters) < b.monster_max_concurrent:
+            self.monsters.append(self.spawn_monster(0))
+            self.next_monster_spawn = pick_gap(self.difficulty.monster_gaps(self.runner_distance), self.rng)
+
+    def spawn_runner_powerups(self, wants_heart):
+        self.next_powerup_spawn -= self.runner_speed
+        if self.next_powerup_spawn <= 0:
+            heart, shield = self.difficulty.powerup_chances(self.runner_distance)
+            r = self.rng.random()
+            if wants_heart and r < heart:
+                self.hearts.append(self.spawn_powerup(0, "heart"))
+            elif r < shield:
+                self.shields.append(self.spawn_powerup(0, "shield"))
+            # else: skip spawning to keep powerups rare
+            self.next_powerup_spawn = pick_gap(self.difficulty.powerup_gaps(self.runner_distance), self.rng)
+
+    def step_squad(self, jump, dash):
+        """Level 2 for a local multiplayer squad: one shared world, batched players."""
+        import numpy as np
+
+        b = self.balance
+        squad = self.squad
+        self.scroll_runner()
+        squad.add_distance(self.runner_speed, b.distance_score_unit)
+
+        jump = np.broadcast_to(np.asarray(jump, bool), (squad.count,))
+        dash = np.broadcast_to(np.asarray(dash, bool), (squad.count,))
+        jumped, dashed = squad.move(jump, dash, b, self.ground_y)
+        if jumped.any():
+            self.events.emit(Jumped(int(jumped.sum())))
+        if dashed.any():
+            self.events.emit(Dashed(count=int(dashed.sum())))
+
+        self.spawn_runner_monsters()
+        for monster in self.monsters:
+            x = monster["rect"].x
+            monster["rect"].x += monster["vx"]
+            monster["dx"] = monster["rect"].x - x  # This step's move, for swept contact
+        self.monsters = [m for m in self.monsters if m["rect"].right >= 0]
+        absorbed, wounded = squad.hit_by(self.monsters, b)
+        if absorbed.any():
+            self.events.emit(ShieldAbsorb(count=int(absorbed.sum())))
+        if wounded.any():
+            self.events.emit(PlayerHit(count=int(wounded.sum())))
+
+        alive = squad.alive
+        self.spawn_runner_powerups(bool((squad.lives[alive] < b.lives_start).any()))
+        scroll = int(self.runner_speed)
+        for powerups, kind in ((self.hearts, "heart"), (self.shields, "shield")):
+            for rect in powerups[:]:
+                start = box(rect)
+                rect.x -= scroll
+                if rect.right < 0:
+                    powerups.remove(rect)
+                    continue
+                i = squad.first_to_touch(start, (-scroll, 0))
+                if i < 0:
+                    continue
+                if kind == "heart":
+                    squad.lives[i] = min(squad.lives[i] + 1, b.lives_start)
+                    self.events.emit(HeartPickup())
+                else:
+                    squad.shield[i] = b.shield_duration_frames
+                    self.events.emit(ShieldPickup())
+                powerups.remove(rect)
+
+        squad.tick()
+        self.score = int(squad.score.max())
+        self.lives = int(squad.lives.max())
+        if not squad.alive.any():
+            self.events.emit(RunLost())
+            self.game_over(auto_return=False)
+
+    def step_gameover(self):
+        # Auto-return to menu after short delay
+        if self.gameover_timer > 0:
+            self.gameover_timer -= 1
+            if self.gameover_timer <= 0:
+                self.state = MENU
+
+    def tick_flashes(self):
+        self.collect_flash_timer = max(0, self.collect_flash_timer - 1)
+        self.hit_flash_timer = max(0, self.hit_flash_timer - 1)
+
+    # -- effects -----------------------------------------------------------
+
+    def subscribe_effects(self):
+        """Have events queue sounds and count stats, and with effects on, flash the screen and emit particles."""
+        for kind in SOUNDS:
+            self.events.subscribe(kind, self.queue_sound)
+        for kind in STAT_COUNTERS:
+            self.events.subscribe(kind, self.count_stat)
+        if not self.effects:
+            return
+        for kind in FLASHES:
+            self.events.subscribe(kind, self.flash)
+        for kind in (*fx.EVENT_BURSTS, StormCaught, Landed):
+            self.events.subscribe(kind, self.emit_burst)
+
+    def queue_sound(self, event):
+        self.sfx.append(SOUNDS[type(event)])
+
+    def count_stat(self, event):
+        self.stats[STAT_COUNTERS[type(event)]] += getattr(event, "count", 1)
+
+    def flash(self, event):
+        if self.squad is not None:
+            return  # Squad viewports flash from the squad's own timers
+        if FLASHES[type(event)] == "hit":
+            self.hit_flash_timer = self.balance.hit_flash_duration
+        else:
+            self.collect_flash_timer = self.balance.collect_flash_duration
+
+    def emit_burst(self, event):
+        if self.squad is not None:
+            return
+        kind = type(event)
+        if kind is StormCaught:
+            half_w, half_h = STORM_MUSHROOM_SIZE[0] // 2, STORM_MUSHROOM_SIZE[1] // 2
+            # Cap bursts per frame so a full basket doesn't flood the particle list
+            for cx, cy, _ in event.rows[:4].tolist():
+                fx.emit_storm_catch(self.particles, cx + half_w, cy + half_h)
+        elif kind is Landed:
+            fx.emit_landing_dust(self.particles, event.x, event.y, event.speed)
+        else:
+            fx.EVENT_BURSTS[kind](self.particles, event.x, event.y)
+
+    def step_effects(self, scene):
+        """Ambient spores, the runner's dust trail and shield aura for ``scene``, then the particle update."""
+        if scene == LEVEL2 and self.squad is None:
+            self.ambient_spore_timer -= 1
+            if self.ambient_spore_timer <= 0:
+                self.ambient_spore_timer = fx.emit_ambient_spore(
+                    self.particles, "level2", self.width, self.height, self.runner_speed
+                )
+            player = self.player
+            if self.on_ground:
+                self.trail_emit_timer = max(0, self.trail_emit_timer - 1)
+                if self.trail_emit_timer <= 0 and self.runner_speed > self.balance.runner_speed + 0.5:
+                    fx.emit_trail_dust(self.particles, player.centerx - player.width // 3, self.ground_y - 4, self.runner_speed)
+                    self.trail_emit_timer = max(4, int(14 - self.runner_speed))
+            else:
+                self.trail_emit_timer = 0
+            if self.shield_timer > 0:
+                fx.emit_shield_sparkle(self.particles, player.centerx, player.centery)
+        elif scene in (MENU, LEVEL1):
+            self.ambient_spore_timer -= 1
+            if self.ambient_spore_timer <= 0:
+                self.ambient_spore_timer = fx.emit_ambient_spore(self.particles, scene, self.width, self.height)
+        else:
+            return
+        fx.update_particles(self.particles)
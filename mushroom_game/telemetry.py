@@ -0,0 +1,280 @@
+"""Per-run gameplay and performance telemetry.
+
+``Telemetry.frame()`` is called once per loop iteration. It watches the
+session's state to find run boundaries and keeps cheap running aggregates
+(state time, a frame-time histogram, dropped frames, peak particles). When a
+run ends, one ``run_end`` event with the whole summary is recorded.
+
+Events go into a bounded in-memory ring buffer; a daemon thread drains it
+every few seconds into rotating newline-delimited JSON files and, optionally,
+POSTs each batch to an HTTP endpoint. The game loop only ever appends to a
+deque, so slow disks or a dead network never stall a frame; if the writer
+falls behind, the oldest events are dropped and counted.
+
+Enable with ``SHROOM_TELEMETRY=<dir>`` (plus ``SHROOM_TELEMETRY_URL`` for the
+HTTP sink). ``python -m mushroom_game.telemetry serve`` runs a local stand-in
+sink that appends whatever it receives to a file.
+"""
+import json
+import os
+import socket
+import threading
+import time
+import urllib.parse
+import urllib.request
+import warnings
+from array import array
+from collections import deque
+
+from .sim import FPS, GAMEOVER, LEVEL1, LEVEL2, MENU, WIN
+
+BUFFER_EVENTS = 4096
+FLUSH_INTERVAL = 2.0      # Seconds between background flushes
+MAX_FILE_BYTES = 1 << 20  # Rotate the NDJSON file past 1 MiB
+BACKUP_FILES = 5
+HISTOGRAM_MS = 250        # Frame times are bucketed per millisecond up to here
+DROPPED_FRAME_FACTOR = 1.5  # A frame interval this many times the target counts as dropped
+
+
+class RingBuffer:
+    """Fixed-size event queue; appending to a full buffer drops the oldest event."""
+
+    def __init__(self, capacity=BUFFER_EVENTS):
+        self._events = deque(maxlen=capacity)
+        self.dropped = 0
+
+    def append(self, event):
+        if len(self._events) == self._events.maxlen:
+            self.dropped += 1
+        self._events.append(event)
+
+    def drain(self):
+        """Pop everything currently queued (safe against concurrent appends)."""
+        batch = []
+        try:
+            while True:
+                batch.append(self._events.popleft())
+        except IndexError:
+            return batch
+
+    def __len__(self):
+        return len(self._events)
+
+
+class NdjsonSink:
+    """Appends JSON lines to ``<directory>/events.ndjson``, rotating by size."""
+
+    def __init__(self, directory, max_bytes=MAX_FILE_BYTES, backups=BACKUP_FILES):
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, "events.ndjson")
+        self.max_bytes = max_bytes
+        self.backups = backups
+
+    def write(self, lines):
+        if os.path.exists(self.path) and os.path.getsize(self.path) >= self.max_bytes:
+            self._rotate()
+        with open(self.path, "a") as f:
+            f.write("".join(lines))
+
+    def _rotate(self):
+        for n in range(self.backups - 1, 0, -1):
+            src = f"{self.path}.{n}"
+            if os.path.exists(src):
+                os.replace(src, f"{self.path}.{n + 1}")
+        os.replace(self.path, f"{self.path}.1")
+
+
+class HttpSink:
+    """POSTs each batch as an NDJSON body; failures are warned about once.
+
+    Raises ValueError for a URL that could never be posted to (no http(s)
+    scheme or host), so a typo shows up at startup rather than as lost data.
+    """
+
+    def __init__(self, url, timeout=2.0):
+        parts = urllib.parse.urlsplit(url)
+        if parts.scheme not in ("http", "https") or not parts.netloc:
+            raise ValueError(f"telemetry URL {url!r} must look like http://host:port/path")
+        self.url = url
+        self.timeout = timeout
+        self._warned = False
+
+    def write(self, lines):
+        try:
+            request = urllib.request.Request(
+                self.url, data="".join(lines).encode(), headers={"Content-Type": "application/x-ndjson"}
+            )
+            urllib.request.urlopen(request, timeout=self.timeout).close()
+        except (OSError, ValueError) as exc:
+            if not self._warned:
+                warnings.warn(f"Telemetry upload to {self.url} failed: {exc}")
+                self._warned = True
+
+
+class RunMetrics:
+    """Aggregates for one run, from leaving the menu to game over or win."""
+
+    def __init__(self, mode):
+        self.mode = mode
+        self.started = time.time()
+        self.state_frames = {}
+        self.histogram = array("I", bytes(4 * (HISTOGRAM_MS + 1)))
+        self.frames = 0
+        self.dropped_frames = 0
+        self.peak_particles = 0
+
+    def frame(self, state, work_ms, interval_ms, particles):
+        self.frames += 1
+        self.state_frames[state] = self.state_frames.get(state, 0) + 1
+        self.histogram[min(int(work_ms), HISTOGRAM_MS)] += 1
+        if interval_ms > DROPPED_FRAME_FACTOR * 1000 / FPS:
+            self.dropped_frames += 1
+        if particles > self.peak_particles:
+            self.peak_particles = particles
+
+    def percentile(self, q):
+        """Frame work time (ms) at quantile ``q``, to histogram resolution."""
+        target = q * self.frames
+        seen = 0
+        for ms, count in enumerate(self.histogram):
+            seen += count
+            if count and seen >= target:
+                return ms
+        return 0
+
+    def summary(self, session, outcome):
+        stats = session.stats
+        return {
+            "mode": self.mode,
+            "outcome": outcome,
+            "duration_s": round(time.time() - self.started, 2),
+            "score": session.score,
+            "distance": int(session.runner_distance),
+            "lives_lost": {
+                "missed": stats["lives_lost_missed"],
+                "monster": stats["lives_lost_monster"],
+            },
+            "jumps": stats["jumps"],
+            "dashes": stats["dashes"],
+            "shield_pickups": stats["shield_pickups"],
+            "shield_absorbs": stats["shield_absorbs"],
+            "heart_pickups": stats["heart_pickups"],
+            "state_seconds": {state: round(n / FPS, 2) for state, n in self.state_frames.items()},
+            "frame_ms": {
+                "p50": self.percentile(0.50),
+                "p95": self.percentile(0.95),
+                "p99": self.percentile(0.99),
+                "max": self.percentile(1.0),
+            },
+            "frames": self.frames,
+            "dropped_frames": self.dropped_frames,
+            "peak_particles": self.peak_particles,
+        }
+
+
+class Telemetry:
+    """Collects run metrics from the game loop and flushes them in the background."""
+
+    def __init__(self, directory, url=None, interval=FLUSH_INTERVAL, kiosk_id=None):
+        self.buffer = RingBuffer()
+        self.sinks = [NdjsonSink(directory)]
+        if url:
+            try:
+                self.sinks.append(HttpSink(url))
+            except ValueError as exc:
+                # Metrics still go to the local files; a bad upload URL mustn't stop the game
+                warnings.warn(f"Telemetry upload disabled: {exc}")
+        self.interval = interval
+        self.kiosk_id = kiosk_id or os.environ.get("SHROOM_KIOSK_ID") or socket.gethostname()
+        self.run = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="telemetry-flush", daemon=True)
+
+    def start(self, **info):
+        self.record("session_start", **info)
+        self._thread.start()
+        return self
+
+    def record(self, event, **fields):
+        self.buffer.append({"event": event, "ts": round(time.time(), 3), "kiosk": self.kiosk_id, **fields})
+
+    def frame(self, session, work_ms, interval_ms):
+        """Account one loop iteration; ``work_ms`` excludes the frame-cap sleep."""
+        state = session.state
+        if self.run is None:
+            if state in (LEVEL1, LEVEL2):
+                if session.squad is not None:
+                    mode = f"multiplayer{session.squad.count}"
+                else:
+                    mode = "storm" if session.storm_field is not None else "classic"
+                self.run = RunMetrics(mode)
+                self.record("run_start", mode=mode)
+            else:
+                return
+        elif state in (GAMEOVER, WIN, MENU):
+            self.end_run(session, {GAMEOVER: "gameover", WIN: "win", MENU: "abandoned"}[state])
+            return
+        self.run.frame("paused" if session.paused else state, work_ms, interval_ms, len(session.particles))
+
+    def end_run(self, session, outcome):
+        if self.run is not None:
+            self.record("run_end", **self.run.summary(session, outcome))
+            self.run = None
+
+    def close(self, session=None, timeout=2.0):
+        """Finish any open run, flush what is queued and stop the writer."""
+        if session is not None:
+            self.end_run(session, "quit")
+        self.record("session_end", dropped_events=self.buffer.dropped)
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join(timeout)
+        else:
+            self.flush()
+
+    def flush(self):
+        batch = self.buffer.drain()
+        if not batch:
+            return
+        lines = [json.dumps(event, separators=(",", ":")) + "\n" for event in batch]
+        for sink in self.sinks:
+            try:
+                sink.write(lines)
+            except (OSError, ValueError) as exc:
+                warnings.warn(f"Telemetry write failed: {exc}")
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.flush()
+        self.flush()
+
+
+def serve(port=8765, out="telemetry-received.ndjson"):
+    """Minimal local HTTP sink: appends every POSTed body to ``out``."""
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            with open(out, "ab") as f:
+                f.write(body)
+            self.send_response(204)
+            self.end_headers()
+
+        def log_message(self, format, *args):
+            pass
+
+    print(f"Telemetry sink listening on http://127.0.0.1:{port}/, writing {out}")
+    HTTPServer(("127.0.0.1", port), Handler).serve_forever()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="python -m mushroom_game.telemetry")
+    sub = parser.add_subparsers(dest="command", required=True)
+    serve_parser = sub.add_parser("serve", help="run a local HTTP sink")
+    serve_parser.add_argument("--port", type=int, default=8765)
+    serve_parser.add_argument("--out", default="telemetry-received.ndjson")
+    args = parser.parse_args()
+    serve(args.port, args.out)
@@ -0,0 +1,33 @@
+"""Where per-user runtime files are kept: the high score, the saved run and the best ghost.
+
+They go in the platform's per-user data folder (``~/.local/share`` or
+``$XDG_DATA_HOME`` on Linux, Application Support on macOS, ``%APPDATA%`` on
+Windows), under ``shroom-hunter``, rather than next to the source.
+``SHROOM_DATA_DIR`` puts them somewhere else, e.g. one folder per kiosk.
+"""
+import os
+import sys
+
+APP_NAME = "shroom-hunter"
+
+
+def data_dir():
+    override = os.environ.get("SHROOM_DATA_DIR")
+    if override:
+        return override
+    if sys.platform == "win32":
+        base = os.environ.get("APPDATA") or os.path.expanduser("~")
+    elif sys.platform == "darwin":
+        base = os.path.expanduser("~/Library/Application Support")
+    else:
+        base = os.environ.get("XDG_DATA_HOME") or os.path.expanduser("~/.local/share")
+    return os.path.join(base, APP_NAME)
+
+
+def data_path(name):
+    return os.path.join(data_dir(), name)
+
+
+def make_parent(path):
+    """Create the folder ``path`` goes in; raises OSError like the write that follows would."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
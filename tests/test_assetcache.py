@@ -0,0 +1,42 @@
+import os
+
+import pygame
+import pytest
+
+from mushroom_game.assetcache import HEADER, AssetCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+    return AssetCache(str(tmp_path))
+
+
+def image(color=(200, 40, 90)):
+    surf = pygame.Surface((12, 8))
+    surf.fill(color)
+    return surf
+
+
+def test_second_load_maps_the_stored_pixels(cache, tmp_path):
+    source = tmp_path / "img.png"
+    source.write_bytes(b"source bytes")
+    first = cache.load(str(source), (12, 8), image)
+    second = cache.load(str(source), (12, 8), lambda: pytest.fail("should be a hit"))
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert second in cache.mapped
+    assert pygame.image.tobytes(second, "RGB") == pygame.image.tobytes(first, "RGB") == pygame.image.tobytes(image(), "RGB")
+
+
+@pytest.mark.parametrize("damage", [b"", b"SHR1", b"SHR1" + bytes(11), b"XXXX" + bytes(HEADER.size - 4 + 12 * 8 * 4)])
+def test_short_or_corrupt_entry_is_rebuilt(cache, tmp_path, damage):
+    source = tmp_path / "img.png"
+    source.write_bytes(b"source bytes")
+    path = cache.entry_path(str(source), (12, 8), None)
+    with open(path, "wb") as f:
+        f.write(damage)
+    surf = cache.load(str(source), (12, 8), image)
+    assert cache.misses == 1
+    assert pygame.image.tobytes(surf, "RGB") == pygame.image.tobytes(image(), "RGB")
+    assert os.path.getsize(path) == HEADER.size + 12 * 8 * 4
@@ -0,0 +1,29 @@
+import os
+
+import pygame
+import pytest
+
+from mushroom_game.capture import frame_path, parse_inline, parse_script, play
+
+GOLDENS = os.path.join(os.path.dirname(__file__), "golden")
+# Regenerate with: python -m mushroom_game.capture --script "<SCRIPT>" --size 800x450 --seed 3
+#   --frames 61 --every 60 --out tests/golden/level1   (then delete frame_000000.png)
+SCRIPT = "3:start,10:+right,40:-right,41:+jump,45:-jump"
+
+
+def test_scripts_parse():
+    meta, commands = parse_script("size 800 450\nseed 7\n# comment\n3 start\n3 +right\n40 -right\n")
+    assert meta == {"size": (800, 450), "seed": 7}
+    assert commands == {3: ["start", "+right"], 40: ["-right"]}
+    assert parse_inline("3:start,40:+right")[1] == {3: ["start"], 40: ["+right"]}
+    with pytest.raises(ValueError, match="line 1"):
+        parse_script("start now")
+
+
+def test_level1_frame_matches_golden():
+    pygame.init()
+    for index, surface in play(parse_inline(SCRIPT)[1], 61, (800, 450), seed=3):
+        pass
+    golden = pygame.image.load(frame_path(os.path.join(GOLDENS, "level1"), index))
+    assert golden.get_size() == surface.get_size()
+    assert pygame.image.tobytes(golden, "RGB") == pygame.image.tobytes(surface, "RGB")
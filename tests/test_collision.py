@@ -0,0 +1,65 @@
+import random
+
+import pytest
+
+from mushroom_game.collision import box, sweep, sweep_many
+
+BASKET = (100, 400, 200, 440)
+
+
+def test_fast_object_passing_through_hits():
+    mushroom = (140, 300, 160, 320)
+    # Ends far below the basket, so an end-position test would miss it
+    assert sweep(mushroom, (0, 1000), BASKET) == pytest.approx(80 / 1000)
+    assert sweep(mushroom, (0, 50), BASKET) is None
+
+
+def test_end_overlap_and_moving_target():
+    assert sweep((140, 410, 160, 420), (0, 0), BASKET) == 0.0
+    # The basket moves under a falling mushroom that would otherwise fall beside it
+    mushroom = (300, 380, 320, 400)
+    assert sweep(mushroom, (0, 30), BASKET) is None
+    assert sweep(mushroom, (0, 30), BASKET, (150, 0)) is not None
+
+
+def test_touching_edges_do_not_hit():
+    assert sweep((200, 400, 220, 440), (0, 0), BASKET) is None
+    assert sweep((140, 300, 160, 400), (0, 0), BASKET) is None
+    assert sweep((140, 300, 160, 380), (0, 20), BASKET) is None
+
+
+def test_box_shrinks_like_inflate():
+    pygame = pytest.importorskip("pygame")
+    rect = pygame.Rect(10, 20, 33, 47)
+    shrunk = rect.inflate(-int(33 * 0.3), -int(47 * 0.3))
+    assert box(rect, 0.3) == (shrunk.left, shrunk.top, shrunk.right, shrunk.bottom)
+
+
+def test_sweep_many_agrees_with_sweep():
+    pytest.importorskip("numpy")
+    rng = random.Random(9)
+
+    def boxes(count):
+        out = []
+        for _ in range(count):
+            x, y = rng.randrange(0, 400), rng.randrange(0, 400)
+            out.append((x, y, x + rng.randrange(1, 60), y + rng.randrange(1, 60)))
+        return out
+
+    def moves(count):
+        return [(rng.choice((0, rng.randrange(-300, 301))), rng.choice((0, rng.randrange(-300, 301))))
+                for _ in range(count)]
+
+    moving, targets = boxes(40), boxes(30)
+    moving_moves, target_moves = moves(40), moves(30)
+    times = sweep_many(moving, moving_moves, targets, target_moves)
+    hits = 0
+    for i, (a, a_move) in enumerate(zip(moving, moving_moves)):
+        for j, (b, b_move) in enumerate(zip(targets, target_moves)):
+            expected = sweep(a, a_move, b, b_move)
+            if expected is None:
+                assert times[i, j] == float("inf")
+            else:
+                assert times[i, j] == pytest.approx(expected)
+                hits += 1
+    assert hits
@@ -0,0 +1,63 @@
+import json
+import time
+
+import pytest
+
+from mushroom_game.config import BalanceConfig, ConfigWatcher, apply_settings, load_config
+
+
+@pytest.mark.parametrize("key, value", [
+    ("level1_goal", "ten"),
+    ("level1_goal", True),
+    ("level1_goal", 2.5),
+    ("monster_gap_bands", []),
+    ("monster_gap_bands", [1, 2]),
+    ("monster_gap_bands", [[0.5, 300]]),
+    ("monster_gap_bands", [[0.5, "a", 500], [1.0, 900, 1400]]),
+    ("monster_gap_bands", [[0.5, None, 500], [1.0, 900, 1400]]),
+    ("monster_gap_bands", [[1.0, 500, 300]]),
+    ("monster_gap_bands", [[0.5, 300, 500]]),
+    ("runner_speed_curve", 4),
+    ("runner_speed_curve", [[0, 4], [0, 7]]),
+    ("runner_speed_curve", [[0, "fast"]]),
+    ("monster_mix_curve", [[0, 1, 1]]),
+])
+def test_bad_values_are_rejected_with_the_setting_named(key, value):
+    with pytest.raises(ValueError, match=key):
+        apply_settings({key: value}, BalanceConfig(), "test")
+
+
+def test_values_are_coerced_to_their_field_types():
+    config = apply_settings({
+        "level1_goal": 12.0,
+        "monster_gap_bands": [[0.5, 300, 500], [1, 900, 1400]],
+        "runner_speed_curve": [[0, 4], [3000, 7]],
+    }, BalanceConfig(), "test")
+    assert config.level1_goal == 12 and isinstance(config.level1_goal, int)
+    assert config.monster_gap_bands == ((0.5, 300, 500), (1.0, 900, 1400))
+    assert config.runner_speed_curve == ((0.0, 4.0), (3000.0, 7.0))
+
+
+def test_unknown_settings_warn_and_are_ignored():
+    with pytest.warns(UserWarning, match="speling"):
+        assert apply_settings({"speling": 1}, BalanceConfig(), "test") == BalanceConfig()
+
+
+def test_watcher_survives_a_broken_edit(tmp_path):
+    path = tmp_path / "balance.json"
+    path.write_text(json.dumps({"level1_goal": 11}))
+    watcher = ConfigWatcher(str(path), interval=0.01).start()
+    try:
+        with pytest.warns(UserWarning, match="keeping previous values"):
+            path.write_text(json.dumps({"monster_gap_bands": [1, 2]}))
+            time.sleep(0.2)
+        assert watcher.poll() is None
+        path.write_text(json.dumps({"level1_goal": 13, "padding": 0}))
+        with pytest.warns(UserWarning, match="padding"):
+            deadline = time.monotonic() + 2
+            while (config := watcher.poll()) is None and time.monotonic() < deadline:
+                time.sleep(0.01)
+        assert config is not None and config.level1_goal == 13
+    finally:
+        watcher.stop()
+    assert load_config(str(tmp_path / "missing.json")) == BalanceConfig()
@@ -0,0 +1,70 @@
+import pytest
+
+from mushroom_game.config import BalanceConfig, apply_settings
+from mushroom_game.difficulty import DISTANCE_STEP, Difficulty, Table, interpolate, mean_gap, sample
+from mushroom_game.sim import Session
+
+
+def test_interpolation_holds_flat_past_the_ends():
+    points = ((100, 2.0, 10.0), (300, 4.0, 0.0))
+    assert interpolate(points, 0) == (2.0, 10.0)
+    assert interpolate(points, 200) == (3.0, 5.0)
+    assert interpolate(points, 1000) == (4.0, 0.0)
+    assert len(sample(points, 16)) == 300 // 16 + 1
+
+
+def test_table_holds_its_last_value():
+    table = Table([1, 2, 3])
+    assert [table.at(i) for i in range(6)] == [1, 2, 3, 3, 3, 3]
+
+
+def test_tables_follow_the_curves():
+    balance = apply_settings({
+        "runner_speed_curve": [[0, 4], [1600, 8]],
+        "monster_gap_scale_curve": [[0, 1], [1600, 0.5]],
+        "monster_mix_curve": [[0, 1, 0, 0], [1600, 0, 0, 2]],
+    }, BalanceConfig(), "test")
+    d = Difficulty(balance)
+    assert d.runner_speed(0) == 4 and d.runner_speed(800) == 6 and d.runner_speed(99999) == 8
+    assert d.monster_gaps(0) is balance.monster_gap_bands
+    assert d.monster_gaps(1600) == tuple((bound, round(lo / 2), round(hi / 2)) for bound, lo, hi in balance.monster_gap_bands)
+    assert d.monster_mix(0) == (1.0, 1.0, 1.0)
+    assert d.monster_mix(1600) == (0.0, 0.0, 1.0)
+    assert mean_gap(((0.5, 0, 10), (1.0, 10, 20))) == 10
+
+
+def test_empty_speed_curves_keep_the_older_ramps():
+    d = Difficulty(BalanceConfig())
+    assert d.fall_speed(0) == BalanceConfig().mushroom_fall_speed
+    assert d.runner_speed(0) == BalanceConfig().runner_speed
+    assert d.runner_speed(10 ** 9) == BalanceConfig().max_runner_speed
+    assert len(d.speeds) > 1 and d.speeds.at(1) > d.speeds.at(0)
+
+
+@pytest.mark.parametrize("key, value", [
+    ("level1_spawn_delay_scale_curve", []),
+    ("monster_gap_scale_curve", []),
+    ("powerup_gap_scale_curve", []),
+    ("monster_mix_curve", []),
+    ("powerup_odds_curve", []),
+    ("monster_mix_curve", [[0, 0, 0, 0]]),
+    ("monster_mix_curve", [[0, 1, 1, 1], [500, 2, -1, 0]]),
+    ("monster_gap_scale_curve", [[0, 1], [500, -0.5]]),
+])
+def test_curves_the_tables_cant_use_are_rejected(key, value):
+    with pytest.raises(ValueError, match=key):
+        apply_settings({key: value}, BalanceConfig(), "test")
+
+
+def test_accepted_configs_play():
+    balance = apply_settings({
+        "level1_fall_speed_curve": [],
+        "runner_speed_curve": [],
+        "monster_mix_curve": [[0, 0, 0, 1]],
+        "monster_gap_scale_curve": [[0, 0]],
+    }, BalanceConfig(), "test")
+    session = Session(800, 450, balance=balance, seed=1, effects=False)
+    session.start_level2()
+    for _ in range(600):
+        session.step(jump=True)
+    assert session.runner_distance > DISTANCE_STEP
@@ -0,0 +1,61 @@
+from mushroom_game.events import EventBus, Jumped, Landed, MushroomCaught, PlayerHit, RunLost
+from mushroom_game.particles import FEEDBACK
+from mushroom_game.sim import Session
+
+
+def test_events_go_out_in_order_to_each_subscriber_of_their_type():
+    bus, seen = EventBus(), []
+    bus.subscribe(Jumped, lambda e: seen.append(("first", e)))
+    bus.subscribe(Jumped, lambda e: seen.append(("second", e)))
+    bus.subscribe(PlayerHit, lambda e: seen.append(("hit", e)))
+    bus.emit(Jumped(1))
+    bus.emit(PlayerHit(3, 4))
+    bus.emit(Jumped(2))
+    assert seen == []
+    bus.dispatch()
+    assert seen == [
+        ("first", Jumped(1)), ("second", Jumped(1)), ("hit", PlayerHit(3, 4)),
+        ("first", Jumped(2)), ("second", Jumped(2)),
+    ]
+    seen.clear()
+    bus.dispatch()
+    assert seen == []
+
+
+def test_unsubscribed_events_are_never_queued():
+    bus = EventBus()
+    bus.subscribe(Jumped, lambda e: None)
+    bus.emit(RunLost())
+    bus.emit(Landed(1, 2, 3.0))
+    assert bus.queue == []
+
+
+def test_events_emitted_by_handlers_go_out_in_the_same_pass():
+    bus, seen = EventBus(), []
+    bus.subscribe(PlayerHit, lambda e: bus.emit(RunLost()))
+    bus.subscribe(RunLost, seen.append)
+    bus.emit(PlayerHit())
+    bus.dispatch()
+    assert seen == [RunLost()] and bus.queue == []
+
+
+def test_session_turns_events_into_sounds_stats_flashes_and_bursts():
+    session = Session(800, 450, seed=0)
+    session.events.emit(PlayerHit(100, 200))
+    session.events.emit(MushroomCaught(300, 200))
+    session.events.dispatch()
+    assert session.sfx == ["hit", "collect"]
+    assert session.stats["lives_lost_monster"] == 1
+    assert session.hit_flash_timer == session.balance.hit_flash_duration
+    assert session.collect_flash_timer == session.balance.collect_flash_duration
+    assert session.particles.counts[FEEDBACK] > 0
+
+
+def test_headless_session_only_queues_sounds_and_stats():
+    session = Session(800, 450, seed=0, effects=False)
+    session.events.emit(PlayerHit(100, 200))
+    session.events.emit(Jumped(4))
+    session.events.dispatch()
+    assert session.sfx == ["hit", "jump"]
+    assert session.stats["jumps"] == 4
+    assert session.hit_flash_timer == 0 and len(session.particles) == 0
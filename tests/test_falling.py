@@ -0,0 +1,89 @@
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from mushroom_game.falling import KIND_GOLD, KIND_NORMAL, FallingField, GapIndex
+
+
+def nearest_free(occupied, lo, hi, gap, x):
+    """Distance from ``x`` (clamped into the row) to the closest position ``gap`` clear of ``occupied``."""
+    x = min(max(x, lo), hi)
+    free = [p for p in range(lo, hi + 1) if all(abs(p - o) >= gap for o in occupied)]
+    return min((abs(p - x) for p in free), default=None)
+
+
+def test_place_agrees_with_a_full_scan():
+    rng = random.Random(3)
+    lo, hi, gap = 0, 400, 12
+    index, occupied = GapIndex(lo, hi, gap), []
+    for _ in range(400):
+        if occupied and rng.random() < 0.3:
+            x = occupied.pop(rng.randrange(len(occupied)))
+            index.remove(x)
+            continue
+        x = rng.randrange(lo - 50, hi + 50)
+        placed = index.place(x)
+        expected = nearest_free(occupied, lo, hi, gap, x)
+        if expected is None:
+            assert placed is None
+            continue
+        assert lo <= placed <= hi and all(abs(placed - o) >= gap for o in occupied)
+        assert abs(placed - min(max(x, lo), hi)) == expected
+        index.add(placed)
+        occupied.append(placed)
+        assert len(index) == len(occupied)
+
+
+def test_full_row_and_clear():
+    index = GapIndex(0, 100, 50)
+    for x in (0, 50, 100):
+        assert index.place(x) == x
+        index.add(x)
+    assert index.place(30) is None
+    index.remove(50)
+    assert index.place(30) == 50
+    index.remove(999)  # Not placed: ignored
+    index.clear()
+    assert len(index) == 0 and index.place(30) == 30
+
+
+def test_fast_fall_through_the_basket_is_caught():
+    field = FallingField(8, (20, 20), (0, 500), 30)
+    basket = (90, 400, 100, 40)
+    field.spawn(120, y=300)
+    field.spawn(400, y=300)
+    # Far past the basket in one step: only a swept test sees the catch
+    field.step(300)
+    assert field.hits(basket).tolist() == [True, False]
+    field = FallingField(8, (20, 20), (0, 500), 30)
+    field.spawn(120, y=300)
+    field.step(50)
+    assert not field.hits(basket).any()
+
+
+def test_resolve_removes_caught_and_missed_and_frees_their_slots():
+    field = FallingField(8, (20, 20), (0, 500), 30)
+    basket = (90, 400, 100, 40)
+    for x, kind in ((120, KIND_GOLD), (300, KIND_NORMAL), (450, KIND_NORMAL)):
+        field.spawn(x, y=380, kind=kind)
+    field.y[2] = 0  # Still falling
+    field.step(100)
+    caught, missed = field.resolve(basket, floor_y=450)
+    assert caught.tolist() == [[120, 480, KIND_GOLD]]
+    assert missed.tolist() == [[300, 480, KIND_NORMAL]]
+    assert len(field) == 1 and field.x[0] == 450 and field.y[0] == 100
+    # The two removed objects gave their spawn slots back
+    assert field.spawn(120) != -1 and field.spawn(300) != -1
+    assert field.gaps.place(450) != 450
+
+
+def test_slots_release_once_objects_fall_past_the_line():
+    field = FallingField(8, (20, 20), (0, 100), 100, slot_release_y=50)
+    assert field.spawn(50, y=0) == 0
+    assert field.spawn(50, y=0) == -1
+    field.step(60)
+    assert field.spawn(50, y=0) == 1
+    empty_caught, empty_missed = FallingField(4, (20, 20), (0, 100), 10).resolve((0, 0, 10, 10), 100)
+    assert empty_caught.shape == empty_missed.shape == (0, 3)
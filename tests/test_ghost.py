@@ -0,0 +1,101 @@
+import random
+import zlib
+
+import pytest
+
+from mushroom_game.ghost import (
+    EVENT_DASH, EVENT_JUMP, HEADER, KEYFRAME_INTERVAL, MAGIC, GhostRecorder, GhostTrack, load_ghost, save_ghost,
+)
+
+
+def recorded_run(frames=1000):
+    """Ground running with jumps, plus a few deltas big enough to need multi-byte varints."""
+    rng = random.Random(4)
+    run, height = [], 0
+    for frame in range(frames):
+        if frame % 97 == 0:
+            height += rng.choice((-1, 1)) * rng.randrange(100, 100000)
+        elif rng.random() < 0.1:
+            height += rng.randrange(-40, 41)
+        run.append((height, rng.choice((0, 0, 0, EVENT_JUMP, EVENT_DASH, EVENT_JUMP | EVENT_DASH))))
+    return run
+
+
+def record(run):
+    recorder = GhostRecorder()
+    for height, events in run:
+        recorder.record(height, events)
+    return recorder
+
+
+def test_frames_round_trip():
+    run = recorded_run()
+    track = GhostTrack(record(run).to_bytes(score=1234, distance=5678.9))
+    assert (track.frames, track.score, track.distance) == (len(run), 1234, 5678)
+    assert [track.next() for _ in run] == run
+    assert track.next() is None
+
+
+def test_seek_lands_on_any_frame():
+    run = recorded_run()
+    track = GhostTrack(record(run).to_bytes())
+    for frame in (0, 1, KEYFRAME_INTERVAL - 1, KEYFRAME_INTERVAL, 500, len(run) - 1):
+        track.seek(frame)
+        assert track.next() == run[frame]
+    track.seek(len(run))
+    assert track.next() is None
+
+
+def test_standing_still_takes_a_byte_a_frame():
+    recorder = record([(0, 0)] * 600)
+    assert len(recorder.data) == 600
+
+
+def test_save_and_load(tmp_path):
+    run = recorded_run(200)
+    path = tmp_path / "nested" / "best_run.ghost"
+    assert save_ghost(record(run), 10, 20, path=str(path)) is not None
+    track = load_ghost(str(path))
+    assert [track.next() for _ in run] == run
+
+
+def test_damaged_file_loads_as_nothing(tmp_path):
+    blob = record(recorded_run(200)).to_bytes()
+    for damaged in (b"", b"SHG1", blob[:len(blob) // 2], b"XXXX" + blob[4:]):
+        path = tmp_path / "best_run.ghost"
+        path.write_bytes(damaged)
+        assert load_ghost(str(path)) is None
+
+
+def rebuilt(blob, edit):
+    """``blob`` with its decompressed body passed through ``edit`` and compressed again."""
+    body = bytearray(zlib.decompress(blob[4:]))
+    edit(body)
+    return MAGIC + zlib.compress(bytes(body))
+
+
+def set_interval(body, interval):
+    body[4:6] = interval.to_bytes(2, "little")
+
+
+@pytest.mark.parametrize("edit", [
+    lambda body: set_interval(body, 0),
+    lambda body: set_interval(body, 7),
+    lambda body: body.__delitem__(slice(-3, None)),
+    lambda body: body.__delitem__(slice(HEADER.size + 20, None)),
+    lambda body: body.extend(b"\x01"),
+    lambda body: body.__setitem__(len(body) - 1, 0x81),
+    lambda body: body.__setitem__(slice(HEADER.size + 4, HEADER.size + 8), (10 ** 6).to_bytes(4, "little")),
+    lambda body: body.__setitem__(slice(0, 4), (10 ** 6).to_bytes(4, "little")),
+], ids=["no interval", "wrong interval", "cut short", "no data", "extra frame", "open varint", "bad offset", "more frames"])
+def test_damage_that_still_decompresses_is_rejected(tmp_path, edit):
+    path = tmp_path / "best_run.ghost"
+    path.write_bytes(rebuilt(record(recorded_run(300)).to_bytes(), edit))
+    with pytest.raises(ValueError):
+        GhostTrack(path.read_bytes())
+    assert load_ghost(str(path)) is None
+
+
+def test_empty_recording_loads():
+    track = GhostTrack(GhostRecorder().to_bytes())
+    assert track.frames == 0 and track.next() is None
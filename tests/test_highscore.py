@@ -0,0 +1,22 @@
+from mushroom_game import assets
+from mushroom_game.assets import load_highscore, save_highscore
+
+
+def test_high_score_moves_from_the_package_to_the_data_folder(tmp_path, monkeypatch):
+    old = tmp_path / "package" / "highscore.txt"
+    old.parent.mkdir()
+    old.write_text("680")
+    new = tmp_path / "data" / "shroom-hunter" / "highscore.txt"
+    monkeypatch.setattr(assets, "OLD_HIGH_SCORE_FILE", str(old))
+    monkeypatch.setattr(assets, "HIGH_SCORE_FILE", str(new))
+    assert load_highscore() == 680
+    save_highscore(700)
+    assert new.read_text() == "700" and old.read_text() == "680"
+    old.write_text("900")
+    assert load_highscore() == 700
+
+
+def test_missing_high_score_is_zero(tmp_path, monkeypatch):
+    monkeypatch.setattr(assets, "OLD_HIGH_SCORE_FILE", str(tmp_path / "a"))
+    monkeypatch.setattr(assets, "HIGH_SCORE_FILE", str(tmp_path / "b"))
+    assert load_highscore() == 0
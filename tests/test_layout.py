@@ -0,0 +1,51 @@
+import pygame
+import pytest
+
+from mushroom_game.hud import HUD_LAYOUTS, get_hud_layout
+from mushroom_game.layout import MAX_UI_SCALE, Box, auto_scale, compute_layout, hud_scale, length
+
+
+def test_scale_follows_the_screen_past_1080p_and_the_setting():
+    assert auto_scale((1280, 720)) == 1.0
+    assert auto_scale((1920, 1080)) == 1.0
+    assert auto_scale((3840, 2160)) == 2.0
+    # An ultrawide screen scales by its height, so the HUD still fits vertically
+    assert auto_scale((5120, 1440)) == pytest.approx(1440 / 1080)
+    assert hud_scale((3840, 2160), 1.5) == 3.0
+    assert hud_scale((1280, 720), 0.1) == 0.5
+    assert hud_scale((7680, 4320), 3.0) == MAX_UI_SCALE
+
+
+def test_lengths_are_scaled_fractions_or_measured_back():
+    assert length(100, 800, 2.0) == 200
+    assert length(0.5, 800, 2.0) == 400
+    assert length(1.0, 800, 2.0) == 800
+    assert length(-60, 800, 2.0) == 680
+
+
+def test_boxes_anchor_to_their_parent_and_scale():
+    pygame.init()  # For the scaled fonts
+    boxes = {
+        "panel": Box("topright", -10, 10, 200, 0.25),
+        "label": Box("midbottom", 0, -5, 0.5, 20, parent="panel"),
+        "bar": Box("midbottom", 0, -8, 900, 40, max_w=-60, min_w=100),
+    }
+    layout = compute_layout(boxes, (800, 600))
+    assert tuple(layout["panel"]) == (590, 10, 200, 150)
+    assert layout["label"].midbottom == (690, 155) and layout["label"].size == (100, 20)
+    assert layout["bar"].width == 740 and layout["bar"].bottom == 592
+    big = compute_layout(boxes, (1600, 1200), scale=2.0)
+    assert tuple(big["panel"]) == (1180, 20, 400, 300)
+    assert big["bar"].width == 1480 and big["bar"].bottom == 1184
+    assert big.px(13) == 26 and layout.px(13) == 13
+    assert big.font(16).get_height() > layout.font(16).get_height()
+
+
+def test_every_hud_fits_its_screen_at_every_scale():
+    for name, boxes in HUD_LAYOUTS.items():
+        for size in ((800, 450), (1920, 1080), (3840, 2160)):
+            layout = get_hud_layout(name, size, hud_scale(size))
+            assert set(layout.rects) == set(boxes)
+            for rect in layout.rects.values():
+                assert rect.width >= 0 and rect.height >= 0
+    assert get_hud_layout("menu", (1920, 1080)) is get_hud_layout("menu", (1920, 1080))
@@ -0,0 +1,53 @@
+import pygame
+
+from mushroom_game.assets import Assets
+from mushroom_game.main import draw_frame
+from mushroom_game.memory import MemoryBudget, account, cache_bytes, private_bytes
+from mushroom_game.prewarm import Prewarmer
+from mushroom_game.renderer import OffscreenRenderer
+from mushroom_game.sim import Session
+
+SIZE = (1280, 720)
+
+
+def setup():
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+    renderer = OffscreenRenderer(SIZE)
+    assets = Assets(*SIZE)
+    session = Session(*SIZE, seed=0)
+    session.start_level1()
+    return renderer, assets, session
+
+
+def draw(renderer, assets, session, frames=3):
+    for _ in range(frames):
+        session.step()
+        draw_frame(renderer.surface, renderer, session, assets, False)
+
+
+def test_caches_are_cleared_again_only_once_they_outgrow_what_is_drawn():
+    renderer, assets, session = setup()
+    draw(renderer, assets, session)
+    budget = MemoryBudget(1)
+    assert budget.check(assets, session)[0] == "clear_sprite_caches"
+    # The next frames rebuild what they draw; clearing that again would free nothing lasting
+    draw(renderer, assets, session)
+    assert budget.check(assets, session) == []
+    draw(renderer, assets, session)
+    assert budget.check(assets, session) == []
+    # Caches for scenes no longer shown are worth clearing again
+    warmer = Prewarmer(assets, False)
+    warmer.run(renderer.surface, 10.0)
+    assert cache_bytes(account(assets, session)) > budget.drawn_cache
+    assert budget.check(assets, session) == ["clear_sprite_caches"]
+
+
+def test_stages_run_in_order_until_under_budget():
+    renderer, assets, session = setup()
+    draw(renderer, assets, session)
+    total = private_bytes(account(assets, session))
+    budget = MemoryBudget(total - 1)
+    assert budget.check(assets, session) == ["clear_sprite_caches"]
+    assert budget.last_total < total
+    assert MemoryBudget(total + 1).check(assets, session) == []
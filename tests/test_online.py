@@ -0,0 +1,141 @@
+import asyncio
+import json
+import struct
+
+import pytest
+
+from mushroom_game.online import (
+    KEYFRAME_INTERVAL, MSG_HELLO, MSG_RUN, MSG_SNAPSHOTS, MSG_TOP, WATCHER_BACKLOG,
+    SnapshotDecoder, SnapshotEncoder, StandInServer, pack_run, read_message, write_message,
+)
+
+
+def frames(count, start=0):
+    """Snapshots shaped like a game's: mostly small changes, a monster appearing now and then."""
+    out = []
+    for frame in range(start, start + count):
+        monsters = (frame // 10) % 3
+        out.append((frame, 2, frame * 7, frame * 3, 1, 100 + frame % 40, 400 - frame % 5, 3, monsters)
+                   + tuple(v for m in range(monsters) for v in (800 - frame * 2 + m * 50, 420)))
+    return out
+
+
+def test_batches_round_trip_across_keyframes_and_shape_changes():
+    encoder, decoder = SnapshotEncoder(), SnapshotDecoder()
+    sent = frames(3 * KEYFRAME_INTERVAL)
+    received = []
+    for i in range(0, len(sent), 7):
+        received += decoder.decode(encoder.encode(sent[i:i + 7]))
+    assert received == [tuple(values) for values in sent]
+
+
+def test_decoder_joining_mid_stream_starts_at_the_next_keyframe():
+    encoder = SnapshotEncoder()
+    sent = frames(KEYFRAME_INTERVAL + 10)
+    batches = [encoder.encode([values]) for values in sent]
+    decoder = SnapshotDecoder()
+    received = [s for batch in batches[5:] for s in decoder.decode(batch)]
+    assert received and received == [tuple(values) for values in sent[-len(received):]]
+
+
+class SlowWriter:
+    """Stands in for a watcher's StreamWriter; ``backlog`` is what its transport reports as queued."""
+
+    def __init__(self):
+        self.backlog = 0
+        self.data = bytearray()
+        self.transport = self
+
+    def get_write_buffer_size(self):
+        return self.backlog
+
+    def is_closing(self):
+        return False
+
+    def write(self, data):
+        self.data += data
+
+
+def received(writer, game):
+    decoder, out, data, pos = SnapshotDecoder(), [], bytes(writer.data), 0
+    while pos < len(data):
+        kind, length = struct.unpack_from("<BI", data, pos)
+        payload = data[pos + 5:pos + 5 + length]
+        pos += 5 + length
+        assert kind == MSG_SNAPSHOTS and struct.unpack_from("<I", payload)[0] == game
+        out += decoder.decode(payload[4:])
+    return out
+
+
+def test_watcher_that_falls_behind_resyncs_from_a_keyframe():
+    server = StandInServer()
+    watcher = SlowWriter()
+    server.watchers[watcher] = set()
+    encoder, decoder = SnapshotEncoder(), SnapshotDecoder()
+    sent = frames(40)
+    for i, values in enumerate(sent):
+        watcher.backlog = WATCHER_BACKLOG if 10 <= i < 15 else 0
+        payload = encoder.encode([values])
+        decoder.decode(payload)
+        server.relay(7, payload, decoder.previous)
+    got = received(watcher, 7)
+    # Every snapshot it decodes is one the game sent, and it ends on the game's latest
+    assert got[:10] == [tuple(values) for values in sent[:10]]
+    assert got[10:] == [tuple(values) for values in sent[15:]]
+
+
+def test_late_watcher_gets_a_keyframe_first():
+    server = StandInServer()
+    server.live[3] = {"hello": {}, "state": None}
+    encoder, decoder = SnapshotEncoder(), SnapshotDecoder()
+    sent = frames(20)
+    watcher = SlowWriter()
+    for i, values in enumerate(sent):
+        if i == 5:
+            server.watchers[watcher] = set(server.live)
+        payload = encoder.encode([values])
+        decoder.decode(payload)
+        server.relay(3, payload, decoder.previous)
+    assert received(watcher, 3) == [tuple(values) for values in sent[5:]]
+
+
+def test_server_survives_malformed_messages(tmp_path, caplog):
+    async def exchange(server, *messages):
+        reader, writer = await asyncio.open_connection(*server.sockets[0].getsockname()[:2])
+        for kind, payload in messages:
+            write_message(writer, kind, payload)
+        await writer.drain()
+        reply = await read_message(reader) if messages[-1][0] == MSG_TOP else None
+        writer.close()
+        return reply
+
+    async def scenario():
+        stand_in = StandInServer(replay_dir=str(tmp_path))
+        server = await asyncio.start_server(stand_in.handle, "127.0.0.1", 0)
+        async with server:
+            await exchange(server, (MSG_RUN, b"\x01"))
+            await exchange(server, (MSG_RUN, pack_run([1, 2], b"")))
+            await exchange(server, (MSG_RUN, pack_run({"player": "p", "score": "9"}, b"")))
+            await exchange(server, (MSG_HELLO, b"{}"), (MSG_SNAPSHOTS, b"\x05\x00"))
+            await exchange(server, (MSG_RUN, pack_run({"player": "p", "score": 12}, b"ghost")))
+            _, payload = await exchange(server, (MSG_TOP, b"5"))
+            await asyncio.sleep(0.1)  # Let the last handler see its connection close
+            return json.loads(payload)
+
+    top = asyncio.run(scenario())
+    assert [run["score"] for run in top] == [12]
+    # A bad message ends its own connection quietly, without an unhandled error in the handler
+    assert not [record for record in caplog.records if record.levelname == "ERROR"]
+
+
+def test_runs_are_checked_before_they_reach_the_leaderboard(tmp_path):
+    board = tmp_path / "board.json"
+    server = StandInServer(leaderboard_file=str(board), replay_dir=str(tmp_path / "replays"))
+    for bad in ({"score": "9"}, {"score": 5, "distance": 1.5}, {"score": True}):
+        with pytest.raises(ValueError):
+            server.add_run(bad, b"")
+    server.add_run({"player": "../../etc/x", "score": 7, "distance": 300}, b"ghost")
+    server.add_run({"player": "b", "score": 9}, b"")
+    assert [run["score"] for run in json.loads(board.read_text())] == [9, 7]
+    (replay,) = (tmp_path / "replays").iterdir()
+    assert replay.read_bytes() == b"ghost" and "/" not in replay.name and ".." not in replay.name
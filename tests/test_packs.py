@@ -0,0 +1,62 @@
+import json
+import os
+import zipfile
+
+import pygame
+import pytest
+
+from mushroom_game.config import BalanceConfig
+from mushroom_game.packs import AssetSource, ContentPack, build, open_packs
+
+
+@pytest.fixture
+def pack_path(tmp_path):
+    folder = tmp_path / "winter"
+    (folder / "sounds").mkdir(parents=True)
+    surf = pygame.Surface((4, 3))
+    surf.fill((10, 200, 30))
+    pygame.image.save(surf, str(folder / "mushroom.png"))
+    (folder / "sounds" / "hit.wav").write_bytes(b"RIFF....")
+    (folder / "balance.json").write_text(json.dumps({"level1_goal": 9}))
+    path = str(tmp_path / "winter.zip")
+    assert build(str(folder), path) == 3
+    return path
+
+
+def test_stored_members_are_read_without_a_copy(pack_path):
+    pack = ContentPack(pack_path)
+    data = pack.read("sounds/hit.wav")
+    assert isinstance(data, memoryview) and bytes(data) == b"RIFF...."
+    data.release()
+    pack.close()
+
+
+def test_deflated_members_are_read_too(tmp_path):
+    path = str(tmp_path / "deflated.zip")
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("balance.json", json.dumps({"level1_goal": 7}) * 20)
+    assert ContentPack(path).read("balance.json") == json.dumps({"level1_goal": 7}).encode() * 20
+
+
+def test_packs_layer_over_the_folder(pack_path, tmp_path):
+    folder = tmp_path / "assets"
+    folder.mkdir()
+    (folder / "basket.png").write_bytes(b"loose")
+    (folder / "mushroom.png").write_bytes(b"loose")
+    source = AssetSource(str(folder), open_packs(pack_path))
+    mushroom = source.find("mushroom", (".jpg", ".png"))
+    assert mushroom.pack is not None and mushroom.digest
+    assert pygame.image.load(mushroom.file(), "mushroom.png").get_size() == (4, 3)
+    assert source.find("basket", (".png",)).path == os.path.join(str(folder), "basket.png")
+    assert source.find("missing", (".png",)) is None
+    assert source.config().level1_goal == 9
+    assert source.config(BalanceConfig(level1_goal=3)).level1_goal == 9
+
+
+def test_unopenable_packs_are_skipped_with_a_warning(pack_path, tmp_path):
+    not_a_zip = tmp_path / "notes.zip"
+    not_a_zip.write_text("not a zip")
+    paths = os.pathsep.join([str(tmp_path / "missing.zip"), "", pack_path, str(not_a_zip)])
+    with pytest.warns(UserWarning, match="skipped"):
+        packs = open_packs(paths)
+    assert [pack.path for pack in packs] == [pack_path]
@@ -0,0 +1,68 @@
+import random
+
+import pytest
+
+from mushroom_game import particles as fx
+from mushroom_game.config import BalanceConfig, apply_settings
+from mushroom_game.particles import AMBIENT, AURA, FEEDBACK, MOVEMENT, ParticleBudget, create_particle
+from mushroom_game.sim import Session
+
+
+def fill(budget, category, count, life=30):
+    granted = budget.grant(category, count)
+    for _ in range(granted):
+        budget.append(create_particle(0, 0, (255, 255, 255), life=life, category=category))
+    return granted
+
+
+def test_quotas_clip_decoration_and_recycle_feedback():
+    budget = ParticleBudget(cap=1000, quotas={AMBIENT: 10, AURA: 10, MOVEMENT: 10, FEEDBACK: 10})
+    assert fill(budget, AMBIENT, 25) == 10
+    assert fill(budget, AMBIENT, 5) == 0
+    assert fill(budget, FEEDBACK, 8, life=5) == 8
+    # Feedback makes room by evicting its own oldest particles instead of being clipped
+    assert fill(budget, FEEDBACK, 8) == 8
+    assert budget.counts == {AMBIENT: 10, AURA: 0, MOVEMENT: 0, FEEDBACK: 10}
+    assert budget.evicted == 6 and budget.dropped == 20
+
+
+def test_cap_evicts_lower_priorities_for_feedback():
+    budget = ParticleBudget(cap=20, quotas={AMBIENT: 20, AURA: 20, MOVEMENT: 20, FEEDBACK: 20})
+    fill(budget, AMBIENT, 14)
+    assert fill(budget, FEEDBACK, 12) >= 6
+    assert len(budget) <= 20
+    assert budget.counts[AMBIENT] < 14
+
+
+def test_level_of_detail_stops_decoration_and_shrinks_bursts():
+    budget = ParticleBudget(cap=100, quotas={AMBIENT: 100, AURA: 100, MOVEMENT: 100, FEEDBACK: 100})
+    fill(budget, MOVEMENT, 80)
+    assert budget.lod
+    assert fill(budget, AMBIENT, 5) == 0 and fill(budget, AURA, 5) == 0
+    assert 1 <= budget.grant(FEEDBACK, 16) < 16
+
+
+def test_expired_particles_free_their_quota():
+    budget = ParticleBudget(cap=100, quotas={AMBIENT: 5, AURA: 5, MOVEMENT: 5, FEEDBACK: 5})
+    fill(budget, AMBIENT, 5, life=1)
+    fx.update_particles(budget)
+    assert len(budget) == 0 and budget.counts[AMBIENT] == 0
+    assert fill(budget, AMBIENT, 5) == 5
+
+
+def test_budget_comes_from_the_balance_and_follows_reloads():
+    balance = apply_settings({"particle_cap": 50, "particle_quota_feedback": 7}, BalanceConfig(), "test")
+    session = Session(800, 450, balance=balance, seed=0)
+    assert session.particles.cap == 50 and session.particles.quotas[FEEDBACK] == 7
+    random.seed(0)
+    session.start_level1()
+    assert session.particles.cap == 50
+    session.balance = apply_settings({"particle_cap": 80}, balance, "reload")
+    assert session.particles.cap == 80 and session.particles.quotas[FEEDBACK] == 7
+    assert isinstance(Session(800, 450, balance=balance, effects=False).particles, fx.SilentBudget)
+
+
+@pytest.mark.parametrize("key, value", [("particle_cap", 0), ("particle_quota_aura", -1)])
+def test_budget_settings_must_be_usable(key, value):
+    with pytest.raises(ValueError, match=key):
+        apply_settings({key: value}, BalanceConfig(), "test")
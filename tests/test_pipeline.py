@@ -0,0 +1,85 @@
+import random
+import threading
+
+from mushroom_game import savestate
+from mushroom_game.pipeline import Frame, FrameBuffer, Pipeline, show, snapshot
+from mushroom_game.sim import Session
+
+
+def frame(number, sfx=()):
+    return Frame(number, b"", list(sfx), ())
+
+
+def test_take_gets_the_newest_frame_and_keeps_skipped_sounds():
+    frames = FrameBuffer()
+    frames.publish(frame(1, ["jump"]))
+    frames.publish(frame(2, ["hit"]))
+    taken = frames.take(timeout=0)
+    assert taken.number == 2 and taken.sfx == ["jump", "hit"]
+    assert frames.dropped == 1 and frames.front is taken
+    assert frames.take(timeout=0) is None and frames.front is taken
+
+
+def test_lockstep_producer_waits_for_the_consumer():
+    frames = FrameBuffer(lockstep=True)
+    frames.publish(frame(1))
+    published = threading.Event()
+    producer = threading.Thread(target=lambda: (frames.publish(frame(2)), published.set()))
+    producer.start()
+    assert not published.wait(0.1)
+    assert frames.take().number == 1
+    assert published.wait(2)
+    assert frames.take().number == 2 and frames.dropped == 0
+    producer.join()
+
+
+def test_close_wakes_a_waiting_consumer():
+    frames = FrameBuffer()
+    threading.Timer(0.05, frames.close).start()
+    assert frames.take(timeout=2) is None
+
+
+def test_view_shows_the_simulated_frame():
+    session = Session(800, 450, seed=3)
+    session.start_level1()
+    for _ in range(90):
+        session.step(right=True)
+    session.highscore = 42
+    published = snapshot(session)
+    assert session.sfx == []
+    view = Session(800, 450)
+    show(view, published)
+    assert savestate.dump(view, particles=True) == published.state
+    assert view.highscore == 42
+
+
+def test_pipelined_run_matches_a_sequential_one():
+    def play(session, held):
+        if session.frame == 2:
+            session.start_level1()
+        session.step(left=session.frame % 50 < 20)
+
+    # Particles draw from the global generator, so each run starts it the same way
+    random.seed(5)
+    sequential = Session(800, 450, seed=5)
+    states = []
+    for _ in range(120):
+        play(sequential, {})
+        states.append(snapshot(sequential).state)
+    random.seed(5)
+    pipeline = Pipeline(Session(800, 450, seed=5), play, fps=None, lockstep=True).start()
+    try:
+        taken = [pipeline.frames.take(timeout=5).state for _ in range(120)]
+    finally:
+        pipeline.stop()
+    assert taken == states and pipeline.frames.dropped == 0
+
+
+def test_calls_run_on_the_simulation_thread_before_its_next_step():
+    ran = []
+    pipeline = Pipeline(Session(800, 450, seed=0), lambda session, held: ran.append("step"), fps=None)
+    pipeline.call(lambda: ran.append(threading.current_thread().name))
+    pipeline.start()
+    pipeline.frames.take(timeout=5)
+    pipeline.stop()
+    assert ran[:2] == ["simulation", "step"]
@@ -0,0 +1,56 @@
+import random
+
+import pygame
+import pytest
+
+from mushroom_game.assets import Assets
+from mushroom_game.main import draw_frame
+from mushroom_game.memory import sprite_caches
+from mushroom_game.renderer import GpuRenderer, OffscreenRenderer, create_renderer, sdl_video
+from mushroom_game.sim import Session
+
+SIZE = (800, 450)
+
+
+@pytest.fixture
+def display(monkeypatch):
+    # The GPU path runs headless on SDL's software render driver. pygame stays
+    # initialised afterwards: the HUD's cached fonts don't survive a quit
+    monkeypatch.setenv("SDL_RENDER_DRIVER", "software")
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+    yield
+    # Sprites uploaded as textures no longer blit the same in software
+    for _, func, _ in sprite_caches():
+        func.cache_clear()
+
+
+def draw_level1(renderer):
+    assets = Assets(*SIZE)
+    session = Session(*SIZE, seed=3)
+    random.seed(3)
+    session.start_level1()
+    for _ in range(30):
+        session.step(False, True, False, False)
+    draw_frame(renderer.surface, renderer, session, assets, False)
+    renderer.end_hud()
+
+
+@pytest.mark.skipif(sdl_video is None, reason="needs pygame._sdl2.video")
+def test_gpu_frame_looks_like_the_software_frame(display):
+    software = OffscreenRenderer(SIZE)
+    draw_level1(software)
+    gpu = GpuRenderer(SIZE, "test")
+    draw_level1(gpu)
+    expected = pygame.image.tobytes(software.surface, "RGB")
+    actual = pygame.image.tobytes(gpu.renderer.to_surface(), "RGB")
+    # Texture filtering and blending round differently, but the picture is the same
+    assert len(actual) == len(expected)
+    assert sum(abs(a - b) for a, b in zip(actual, expected)) / len(expected) < 4
+
+
+def test_software_renderer_is_the_fallback(display, monkeypatch):
+    monkeypatch.setattr("mushroom_game.renderer.sdl_video", None)
+    renderer = create_renderer(SIZE, "test", prefer_gpu=True)
+    assert not getattr(renderer, "accelerated", False)
+    assert renderer.surface.get_size() == SIZE
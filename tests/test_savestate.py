@@ -0,0 +1,115 @@
+import random
+import threading
+
+import pytest
+
+from mushroom_game import savestate
+from mushroom_game.sim import LEVEL2, Session, storm_available
+
+SIZE = (1280, 720)
+
+
+def played(start, frames=240, seed=7, **held):
+    session = Session(*SIZE, seed=seed)
+    start(session)
+    for _ in range(frames):
+        session.step(**held)
+    return session
+
+
+def level2(session):
+    session.start_level2()
+
+
+def storm(session):
+    session.start_storm()
+
+
+def squad(session):
+    session.start_multiplayer(3)
+
+
+STARTS = [level2] + ([storm, squad] if storm_available() else [])
+
+
+@pytest.mark.parametrize("start", STARTS)
+def test_restored_session_continues_identically(start):
+    original = played(start, jump=True)
+    resumed = Session(*SIZE, seed=99)
+    savestate.restore(resumed, savestate.dump(original, particles=True))
+    assert savestate.dump(resumed, particles=True) == savestate.dump(original, particles=True)
+    # Effects draw from the module RNG, which the game seeds alongside the session's
+    for session in (original, resumed):
+        random.seed(1)
+        for _ in range(120):
+            session.step()
+    assert savestate.dump(resumed, particles=True) == savestate.dump(original, particles=True)
+
+
+@pytest.mark.parametrize("start", STARTS)
+def test_truncated_snapshot_leaves_session_untouched(start):
+    data = savestate.dump(played(start), particles=True)
+    target = played(level2, frames=30, seed=3)
+    before = savestate.dump(target, particles=True)
+    for cut in range(4, len(data), max(1, len(data) // 97)):
+        with pytest.raises(ValueError):
+            savestate.restore(target, data[:cut])
+        assert savestate.dump(target, particles=True) == before
+
+
+def test_out_of_range_state_is_rejected():
+    data = bytearray(savestate.dump(played(level2)))
+    data[savestate.HEADER.size - 10] = 200  # state index
+    target = Session(*SIZE)
+    with pytest.raises(ValueError):
+        savestate.restore(target, bytes(data))
+    assert target.state != LEVEL2
+
+
+def test_load_of_damaged_file_returns_false(tmp_path):
+    path = tmp_path / "run.shs"
+    data = savestate.dump(played(level2), particles=True)
+    path.write_bytes(data[: len(data) // 2])
+    target = Session(*SIZE)
+    assert savestate.load(target, str(path)) is False
+    path.write_bytes(data)
+    assert savestate.load(target, str(path)) is True
+    assert target.state == LEVEL2
+
+
+def test_final_save_waits_for_a_write_in_flight(tmp_path, monkeypatch):
+    path = str(tmp_path / "run.shs")
+    release, writing, written = threading.Event(), [], []
+    real_write = savestate.write_file
+
+    def slow_write(target, data):
+        writing.append(data)
+        assert len(writing) - len(written) == 1, "two writes of the same file at once"
+        if len(writing) == 1:
+            release.wait(5)
+        real_write(target, data)
+        written.append(data)
+
+    monkeypatch.setattr(savestate, "write_file", slow_write)
+    session = played(level2, frames=10)
+    autosaver = savestate.Autosaver(path, interval=0).start()
+    autosaver.frame(session)
+    autosaver.frame(session)  # A save is now due and being written
+    session.step()
+    threading.Timer(0.3, release.set).start()
+    autosaver.stop(session)
+    assert len(written) == 2 and written[-1] == savestate.dump(session, particles=True)
+    with open(path, "rb") as f:
+        assert f.read() == written[-1]
+
+
+def test_stop_after_the_run_ended_deletes_the_save(tmp_path):
+    path = tmp_path / "run.shs"
+    session = played(level2, frames=10)
+    autosaver = savestate.Autosaver(str(path), interval=0).start()
+    autosaver.frame(session)
+    autosaver.frame(session)
+    session.return_to_menu()
+    autosaver.frame(session)
+    autosaver.stop(session)
+    assert not path.exists()
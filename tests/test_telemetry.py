@@ -0,0 +1,21 @@
+import json
+
+import pytest
+
+from mushroom_game.telemetry import HttpSink, Telemetry
+
+
+@pytest.mark.parametrize("url", ["host:8765", "http://", "ftp://example.com/"])
+def test_unusable_upload_url_is_rejected(url):
+    with pytest.raises(ValueError):
+        HttpSink(url)
+
+
+def test_bad_url_disables_upload_but_keeps_local_metrics(tmp_path):
+    with pytest.warns(UserWarning, match="upload disabled"):
+        telemetry = Telemetry(str(tmp_path), url="host:8765")
+    telemetry.start(size=[640, 480])
+    telemetry.record("probe")
+    telemetry.close()
+    events = [json.loads(line) for path in tmp_path.iterdir() for line in path.read_text().splitlines()]
+    assert "probe" in {event.get("event") for event in events}